@@ -1,8 +1,14 @@
+import json
+import time
+
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, AsyncIterator
 
 from app.services import orchestrator
+from app.services.intent_router import intent_router
 
 router = APIRouter()
 
@@ -13,14 +19,25 @@ class ChatResponse(BaseModel):
     response: Any
 
 @router.post("/", response_model=ChatResponse)
-def handle_chat(chat_query: ChatQuery):
+async def handle_chat(chat_query: ChatQuery):
     """
     This endpoint is the main entry point for the conversational AI.
     It takes a user's query and uses the orchestration engine to get an answer.
     """
-    # Step 1 & 2: Let the orchestrator decide which tool(s) to use.
-    tool_calls = orchestrator.decide_on_tool(chat_query.query)
+    started = time.perf_counter()
+    # Step 1 & 2: Let the orchestrator decide which tool(s) to use, locally
+    # for simple queries or via the LLM otherwise.
+    path, tool_calls = await orchestrator.route_query(chat_query.query)
+    try:
+        return await _answer(tool_calls)
+    finally:
+        intent_router.stats.record(path, time.perf_counter() - started)
+
 
+async def _answer(tool_calls) -> ChatResponse:
+    """
+    Executes the chosen tool calls and shapes the chat response.
+    """
     if not tool_calls:
         # The LLM didn't choose a tool, maybe it's a greeting or general question.
         # For now, we'll return a simple response.
@@ -30,13 +47,73 @@ def handle_chat(chat_query: ChatQuery):
         error_detail = tool_calls[0]["error"]
         raise HTTPException(status_code=500, detail=error_detail)
 
-    # For this version, we assume the LLM only calls one tool.
-    # A more advanced version would loop through all tool_calls.
-    tool_call = tool_calls[0]
-
-    # Step 3: Execute the chosen tool.
-    result = orchestrator.execute_tool_call(tool_call)
+    # Step 3: Execute every chosen tool concurrently. Results come back in the
+    # order the model emitted the calls, including per-call errors.
+    results = await orchestrator.execute_tool_calls(tool_calls)
 
-    # Step 4: For now, we just return the raw result from the tool.
+    # Step 4: For now, we just return the raw result from the tool(s).
     # A future "Response Synthesis" step would turn this into natural language.
-    return ChatResponse(response=result)
+    if len(results) == 1:
+        return ChatResponse(response=results[0]["result"])
+    return ChatResponse(response=results)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), default=str)}\n\n"
+
+
+async def _chat_events(query: str) -> AsyncIterator[str]:
+    """
+    The stages of a chat request as Server-Sent Events:
+
+    - "route": the chosen tool calls, as soon as tool selection finishes
+    - "tool_result": each tool's entry (as in the list returned by POST /),
+      in the order the tools finish
+    - "comparison_delta": chunks of comparison text while the LLM writes it
+    - "message" / "error": when no tool was chosen or tool selection failed
+    - "done": always last, with the total elapsed time
+    """
+    started = time.perf_counter()
+    path, tool_calls = await orchestrator.route_query(query)
+    try:
+        if not tool_calls:
+            yield _sse("message", {"response": "I can only fetch financial data."})
+        elif "error" in tool_calls[0]:
+            yield _sse("error", {"detail": tool_calls[0]["error"]})
+        else:
+            yield _sse("route", {
+                "path": path,
+                "tool_calls": [
+                    {"id": call.get("id"), "name": call["function"]["name"], "arguments": call["function"]["arguments"]}
+                    for call in tool_calls
+                ],
+            })
+            async for event in orchestrator.stream_tool_calls(tool_calls):
+                yield _sse(event["event"], event["data"])
+        yield _sse("done", {"elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
+    finally:
+        intent_router.stats.record(path, time.perf_counter() - started)
+
+
+@router.post("/stream")
+async def stream_chat(chat_query: ChatQuery):
+    """
+    Streaming variant of the chat endpoint. Emits each stage as a
+    Server-Sent Event as soon as it completes instead of one response at the
+    end, so the first bytes arrive after tool selection rather than after
+    the whole pipeline.
+    """
+    return StreamingResponse(
+        _chat_events(chat_query.query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+def get_chat_stats():
+    """
+    Request counts, hit rate and latency for each routing path: the local
+    fast path and the LLM tool-selection path.
+    """
+    return intent_router.stats.snapshot()
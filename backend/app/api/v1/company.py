@@ -1,32 +1,292 @@
-from fastapi import APIRouter, HTTPException
-from app.services import scraper
-from app.models.company import CompanyRatiosResponse, CompanyPriceResponse
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Response
+from app.core import config
+from app.services import ratios, risk, scraper
+from app.services.report import build_company_report
+from app.services.executor import run_blocking
+from app.services.symbols import symbol_master
+from app.models.company import (
+    BatchPriceRequest,
+    BatchPriceResponse,
+    CompanyPriceResponse,
+    CompanyRatiosResponse,
+    PeerRatiosRequest,
+    PeerRatiosResponse,
+    PerformanceRequest,
+    PerformanceResponse,
+    RiskMetricsRequest,
+    RiskMetricsResponse,
+)
 
 router = APIRouter()
 
+
+def _resolve(ticker: str) -> str:
+    """
+    Resolves a ticker, symbol, ISIN or company name from the path to a
+    yfinance ticker, or answers 404 without any upstream call.
+    """
+    resolved = symbol_master.resolve(ticker)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ticker symbol '{ticker}'.")
+    return resolved
+
+
+def _check_frequency(frequency: str):
+    if frequency not in ratios.FREQUENCIES:
+        raise HTTPException(status_code=422, detail=f"Invalid frequency '{frequency}'. Must be 'annual' or 'quarterly'.")
+
+
+@router.get("/search")
+def search_companies(q: str, limit: int = 10):
+    """
+    Resolves a partial or misspelt company name, symbol or alias to listed
+    companies: prefix matches first (for autocomplete), then fuzzy matches.
+    """
+    return {
+        "query": q,
+        "results": [
+            {"ticker": entry.ticker, "symbol": entry.symbol, "exchange": entry.exchange,
+             "isin": entry.isin or None, "name": entry.name}
+            for entry in symbol_master.search(q, limit)
+        ],
+    }
+
+
 @router.get("/{ticker}/price", response_model=CompanyPriceResponse)
-def get_company_price(ticker: str):
+async def get_company_price(ticker: str):
     """
     Retrieves key stock price data for a given company ticker using yfinance.
     For Indian stocks, append .NS (e.g., RELIANCE.NS).
     """
-    price_data = scraper.get_stock_price_data(ticker.upper())
-    
+    ticker = _resolve(ticker)
+    try:
+        price_data = await run_blocking(scraper.get_stock_price_data, ticker)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching price data for {ticker}.")
+
     if price_data.get("error"):
         raise HTTPException(status_code=404, detail=price_data.get("error"))
-        
-    return CompanyPriceResponse(ticker=ticker.upper(), data=price_data)
+
+    return CompanyPriceResponse(ticker=ticker, data=price_data)
+
+
+@router.post("/prices", response_model=BatchPriceResponse)
+async def get_batch_prices(request: BatchPriceRequest):
+    """
+    Retrieves quotes for a list of tickers (e.g. a watchlist) in one bulk fetch.
+    Each ticker gets its own status, so one bad symbol does not fail the batch.
+    """
+    if not request.tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(request.tickers) > config.BATCH_QUOTE_MAX_TICKERS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {config.BATCH_QUOTE_MAX_TICKERS} tickers can be requested at once.",
+        )
+
+    try:
+        data = await run_blocking(scraper.get_batch_stock_price_data, request.tickers)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching batch price data.")
+
+    return BatchPriceResponse(count=len(data["symbol"]), data=data)
+
+
+@router.get("/{ticker}/statements/{statement_type}")
+async def get_company_statement(ticker: str, statement_type: str, frequency: str = "annual"):
+    """
+    Retrieves a financial statement ('income', 'balance' or 'cashflow') in
+    columnar form: periods, line items and a values matrix (null for missing).
+    """
+    ticker = _resolve(ticker)
+    try:
+        table = await run_blocking(scraper.get_statement_table, ticker, statement_type, frequency)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching {statement_type} statement for {ticker}.")
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"An error occurred for ticker '{ticker}': {e}")
+
+    # The table serializes itself; this skips FastAPI's per-value encoding.
+    return Response(content=table.to_json(), media_type="application/json")
+
+
+@router.get("/{ticker}/history")
+async def get_company_history(ticker: str, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Retrieves daily OHLCV bars between two dates (inclusive, ISO format) in
+    columnar form: "dates" plus one array per field (null for missing).
+    """
+    ticker = _resolve(ticker)
+    try:
+        series = await run_blocking(scraper.get_price_history, ticker, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching price history for {ticker}.")
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"An error occurred for ticker '{ticker}': {e}")
+
+    if not len(series) and start is None and end is None:
+        raise HTTPException(status_code=404, detail=f"No price history found for ticker '{ticker}'.")
+    return Response(content=series.to_json(), media_type="application/json")
+
+
+@router.get("/{ticker}/news")
+async def get_company_news(ticker: str, limit: int = config.NEWS_DEFAULT_LIMIT):
+    """
+    Retrieves a company's latest news articles, newest first, from the
+    ingested news store (polled upstream at most once per hour per ticker).
+    """
+    ticker = _resolve(ticker)
+    if not 1 <= limit <= config.NEWS_MAX_LIMIT:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {config.NEWS_MAX_LIMIT}.")
+    try:
+        news = await run_blocking(scraper.get_latest_news, ticker, limit)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching news for {ticker}.")
+
+    if news and news[0].get("error"):
+        raise HTTPException(status_code=404, detail=news[0]["error"])
+    return {"ticker": ticker, "articles": [article for article in news if "title" in article]}
+
+
+@router.get("/{ticker}/report")
+async def get_company_report(ticker: str, deadline: Optional[float] = None):
+    """
+    Builds an on-demand company report: price, profile, the income, balance
+    and cash flow statements (annual and quarterly), latest news and ratios,
+    fetched concurrently. Returns within `deadline` seconds (default
+    REPORT_DEADLINE_SECONDS) with every section that finished; the others are
+    listed under "pending" and can be picked up by requesting the report again.
+    """
+    ticker = _resolve(ticker)
+    if deadline is not None and not 0 < deadline <= config.REPORT_MAX_DEADLINE_SECONDS:
+        raise HTTPException(
+            status_code=422, detail=f"deadline must be between 0 and {config.REPORT_MAX_DEADLINE_SECONDS} seconds."
+        )
+
+    report = await build_company_report(ticker, deadline)
+    sections = report["sections"].values()
+    if not report["pending"] and all(section["status"] == "error" for section in sections):
+        raise HTTPException(status_code=404, detail=report["sections"]["price"]["error"])
+    return report
+
+
+@router.post("/ratios/peers", response_model=PeerRatiosResponse)
+async def get_peer_ratios(request: PeerRatiosRequest):
+    """
+    Compares the latest financial ratios of a set of peer companies, computed
+    in one vectorized pass, along with the peer median of each ratio.
+    """
+    if not request.tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(set(request.tickers)) > config.RATIOS_PEER_MAX_TICKERS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {config.RATIOS_PEER_MAX_TICKERS} companies can be compared at once.",
+        )
+    _check_frequency(request.frequency)
+
+    try:
+        comparison = await run_blocking(ratios.compare_with_industry_peers, request.tickers, request.frequency)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out computing peer ratios.")
+
+    if comparison.get("error"):
+        raise HTTPException(status_code=404, detail=comparison.get("error"))
+
+    return PeerRatiosResponse(**comparison)
 
 
 @router.get("/{ticker}/ratios", response_model=CompanyRatiosResponse)
-def get_company_ratios(ticker: str):
+async def get_company_ratios(ticker: str, frequency: str = "annual"):
+    """
+    Retrieves key financial ratios for a given company ticker, computed from
+    its income statement, balance sheet and cash flow statement.
+    """
+    _check_frequency(frequency)
+    ticker = _resolve(ticker)
+    try:
+        result = await run_blocking(ratios.get_financial_ratios, ticker, frequency)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching ratios for {ticker}.")
+
+    if result.get("error"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+
+    return CompanyRatiosResponse(**result)
+
+
+def _check_price_batch(tickers):
+    """Rejects batches the price matrix routes (risk, performance) will not load."""
+    if not tickers:
+        raise HTTPException(status_code=422, detail="At least one ticker is required.")
+    if len(set(tickers)) > config.RISK_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"At most {config.RISK_MAX_TICKERS} tickers can be requested at once.")
+
+
+async def _risk_metrics(tickers, period_years) -> RiskMetricsResponse:
+    try:
+        result = await run_blocking(risk.calculate_risk_metrics, tickers, period_years)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out computing risk metrics.")
+
+    if result.get("error"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+
+    return RiskMetricsResponse(**result)
+
+
+@router.get("/{ticker}/risk", response_model=RiskMetricsResponse)
+async def get_company_risk(ticker: str, period_years: Optional[float] = None):
+    """
+    Retrieves annualized return, volatility, Sharpe ratio, beta against the
+    NIFTY 50 and maximum drawdown over the lookback period.
+    """
+    ticker = _resolve(ticker)
+    return await _risk_metrics([ticker], period_years)
+
+
+@router.post("/risk", response_model=RiskMetricsResponse)
+async def get_batch_risk(request: RiskMetricsRequest):
+    """
+    Computes risk metrics for a list of tickers (up to a whole-market screen)
+    in one vectorized pass over their price matrix.
+    """
+    _check_price_batch(request.tickers)
+    return await _risk_metrics(request.tickers, request.period_years)
+
+
+async def _performance(tickers) -> PerformanceResponse:
+    try:
+        result = await run_blocking(risk.get_historical_performance, tickers)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out computing historical performance.")
+
+    if result.get("error"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+
+    return PerformanceResponse(**result)
+
+
+@router.get("/{ticker}/performance", response_model=PerformanceResponse)
+async def get_company_performance(ticker: str):
+    """
+    Retrieves trailing and rolling 1, 5 and 10-year returns for a company.
+    """
+    ticker = _resolve(ticker)
+    return await _performance([ticker])
+
+
+@router.post("/performance", response_model=PerformanceResponse)
+async def get_batch_performance(request: PerformanceRequest):
     """
-    Retrieves key financial ratios for a given company ticker by scraping.
+    Computes trailing and rolling returns for a list of tickers at once.
     """
-    # Note: The ticker format for scraping might be different from yfinance
-    ratios = scraper.scrape_key_ratios(ticker)
-    
-    if ratios.get("error"):
-        raise HTTPException(status_code=404, detail=ratios.get("error"))
-        
-    return CompanyRatiosResponse(ticker=ticker, ratios=ratios)
+    _check_price_batch(request.tickers)
+    return await _performance(request.tickers)
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from app.core import config
+from app.services.executor import run_blocking
+from app.services.search_index import search_documents
+
+router = APIRouter()
+
+
+@router.get("/")
+async def search(
+    q: str,
+    kind: Optional[str] = None,
+    ticker: Optional[str] = None,
+    limit: int = config.SEARCH_DEFAULT_LIMIT,
+):
+    """
+    Ranked full-text search over company profiles and news articles.
+    Use "quotes" for exact phrases; `kind` ('profile' or 'news') and `ticker`
+    narrow the search.
+    """
+    if not 1 <= limit <= config.SEARCH_MAX_LIMIT:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {config.SEARCH_MAX_LIMIT}.")
+    try:
+        result = await run_blocking(search_documents, q, kind, ticker, limit)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out searching.")
+
+    if result.get("error"):
+        raise HTTPException(status_code=422, detail=result["error"])
+    return result
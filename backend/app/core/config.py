@@ -0,0 +1,238 @@
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# --- Database ---
+# Postgres in deployment (psycopg2), a local SQLite file for development.
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sirius.db")
+
+# --- Cache ---
+# Freshness windows (in seconds) for each class of ticker data, following the
+# PRD's data freshness rules: prices may lag by 15 minutes, statements must be
+# refreshed within 24 hours and news within 1 hour.
+CACHE_TTL_SECONDS = {
+    "price": float(os.getenv("CACHE_TTL_PRICE", 15 * 60)),
+    "statement": float(os.getenv("CACHE_TTL_STATEMENT", 24 * 60 * 60)),
+    "news": float(os.getenv("CACHE_TTL_NEWS", 60 * 60)),
+    # How often a ticker's stored daily history is topped up from yfinance.
+    "history": float(os.getenv("CACHE_TTL_HISTORY", 60 * 60)),
+}
+
+# Upper bound on the number of entries held in memory across all data classes.
+# The least recently used entry is evicted once the bound is reached.
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2048))
+
+# --- Upstream executor ---
+# yfinance is a blocking library, so its calls run on a dedicated thread pool
+# instead of the server's own worker pool. A call that exceeds the timeout is
+# abandoned by the request (the worker thread finishes it in the background).
+UPSTREAM_EXECUTOR_WORKERS = int(os.getenv("UPSTREAM_EXECUTOR_WORKERS", 64))
+UPSTREAM_CALL_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_CALL_TIMEOUT_SECONDS", 15))
+# Workers for fanning out per-ticker loads from a tool that is itself running
+# on the upstream executor (peer comparisons, peer ratios).
+FANOUT_EXECUTOR_WORKERS = int(os.getenv("FANOUT_EXECUTOR_WORKERS", 32))
+
+# Largest number of tickers accepted by the batch quote endpoint in one request.
+BATCH_QUOTE_MAX_TICKERS = int(os.getenv("BATCH_QUOTE_MAX_TICKERS", 500))
+
+# --- Price history ---
+# Directory of the columnar daily OHLCV store (one subdirectory per ticker).
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", "./price_store")
+# How far back the first download of a ticker's history goes (a yfinance period).
+PRICE_HISTORY_INITIAL_PERIOD = os.getenv("PRICE_HISTORY_INITIAL_PERIOD", "max")
+
+# --- Risk and performance ---
+# Market benchmark for beta, and the annual risk-free rate used for Sharpe.
+RISK_BENCHMARK_TICKER = os.getenv("RISK_BENCHMARK_TICKER", "^NSEI")
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", 0.065))
+# Default lookback for volatility, beta, Sharpe and drawdown.
+RISK_LOOKBACK_YEARS = float(os.getenv("RISK_LOOKBACK_YEARS", 3))
+TRADING_DAYS_PER_YEAR = int(os.getenv("TRADING_DAYS_PER_YEAR", 252))
+# Horizons (in years) of the trailing and rolling returns.
+PERFORMANCE_WINDOWS_YEARS = tuple(
+    int(years) for years in os.getenv("PERFORMANCE_WINDOWS_YEARS", "1,5,10").split(",") if years.strip()
+)
+# Maximum number of tickers in one risk or performance request.
+RISK_MAX_TICKERS = int(os.getenv("RISK_MAX_TICKERS", 2500))
+
+# --- Ratios ---
+# Number of most recent periods the ratios engine computes history for.
+RATIOS_MAX_PERIODS = int(os.getenv("RATIOS_MAX_PERIODS", 10))
+# Maximum number of companies in one peer ratio comparison. The engine is
+# vectorized across companies, so this allows sector-wide screens; it is
+# separate from PEER_COMPARISON_MAX_TICKERS, which bounds an LLM prompt.
+RATIOS_PEER_MAX_TICKERS = int(os.getenv("RATIOS_PEER_MAX_TICKERS", 500))
+
+# --- Valuation ---
+# DCF inputs: free cash flow is projected for PROJECTION_YEARS from the mean
+# of the last BASE_YEARS, then a Gordon terminal value. Rates are annual
+# fractions; the defaults suit Indian equities (cost of equity around 12%,
+# long-run nominal growth around 4-5%).
+VALUATION_PROJECTION_YEARS = int(os.getenv("VALUATION_PROJECTION_YEARS", 5))
+VALUATION_BASE_YEARS = int(os.getenv("VALUATION_BASE_YEARS", 3))
+VALUATION_DISCOUNT_RATE = float(os.getenv("VALUATION_DISCOUNT_RATE", 0.12))
+VALUATION_TERMINAL_GROWTH = float(os.getenv("VALUATION_TERMINAL_GROWTH", 0.04))
+# The projection growth defaults to the company's historical free cash flow
+# growth, clipped to this range.
+VALUATION_GROWTH_MIN = float(os.getenv("VALUATION_GROWTH_MIN", -0.05))
+VALUATION_GROWTH_MAX = float(os.getenv("VALUATION_GROWTH_MAX", 0.25))
+# Smallest gap kept between the discount rate and terminal growth, which
+# would otherwise make the terminal value explode.
+VALUATION_MIN_SPREAD = float(os.getenv("VALUATION_MIN_SPREAD", 0.02))
+# The sensitivity grid: every discount rate against every growth rate.
+VALUATION_DISCOUNT_GRID = tuple(
+    float(rate) for rate in os.getenv("VALUATION_DISCOUNT_GRID", "0.10,0.11,0.12,0.13,0.14").split(",") if rate.strip()
+)
+VALUATION_GROWTH_GRID = tuple(
+    float(rate) for rate in os.getenv("VALUATION_GROWTH_GRID", "0,0.05,0.10,0.15,0.20").split(",") if rate.strip()
+)
+# Monte Carlo: scenarios drawn around the assumptions with these standard
+# deviations, from a fixed seed so a ticker's distribution is reproducible.
+VALUATION_SCENARIOS = int(os.getenv("VALUATION_SCENARIOS", 100_000))
+VALUATION_MAX_SCENARIOS = int(os.getenv("VALUATION_MAX_SCENARIOS", 1_000_000))
+VALUATION_DISCOUNT_RATE_STDEV = float(os.getenv("VALUATION_DISCOUNT_RATE_STDEV", 0.015))
+VALUATION_GROWTH_STDEV = float(os.getenv("VALUATION_GROWTH_STDEV", 0.05))
+VALUATION_TERMINAL_GROWTH_STDEV = float(os.getenv("VALUATION_TERMINAL_GROWTH_STDEV", 0.005))
+VALUATION_SEED = int(os.getenv("VALUATION_SEED", 7))
+VALUATION_HISTOGRAM_BINS = int(os.getenv("VALUATION_HISTOGRAM_BINS", 20))
+
+# --- Company report ---
+# The report endpoint returns within this many seconds; sections still
+# loading then are marked pending (and finish in the background, so a retry
+# finds them cached). The PRD's target is a report in under 20 seconds.
+REPORT_DEADLINE_SECONDS = float(os.getenv("REPORT_DEADLINE_SECONDS", 15))
+REPORT_MAX_DEADLINE_SECONDS = float(os.getenv("REPORT_MAX_DEADLINE_SECONDS", 20))
+
+# --- Comparison prompts ---
+# Line items kept when two companies' statements are compared, in priority
+# order (lowest priority is dropped first to meet the token budget). Each list
+# can be overridden with a comma-separated PROMPT_LINE_ITEMS_<TYPE> variable.
+_DEFAULT_PROMPT_LINE_ITEMS = {
+    "income": "Total Revenue,Gross Profit,Operating Income,EBITDA,Net Income,Diluted EPS,Operating Expense,Interest Expense,Tax Provision,Cost Of Revenue",
+    "balance": "Total Assets,Total Debt,Stockholders Equity,Current Assets,Current Liabilities,Cash And Cash Equivalents,Net Debt,Working Capital,Total Liabilities Net Minority Interest,Retained Earnings",
+    "cashflow": "Operating Cash Flow,Free Cash Flow,Capital Expenditure,Investing Cash Flow,Financing Cash Flow,Cash Dividends Paid,Repurchase Of Capital Stock,Issuance Of Debt,Repayment Of Debt,End Cash Position",
+}
+PROMPT_LINE_ITEMS = {
+    statement_type: [item.strip() for item in os.getenv(f"PROMPT_LINE_ITEMS_{statement_type.upper()}", items).split(",") if item.strip()]
+    for statement_type, items in _DEFAULT_PROMPT_LINE_ITEMS.items()
+}
+PROMPT_MAX_PERIODS = int(os.getenv("PROMPT_MAX_PERIODS", 4))
+# Upper bound on the estimated tokens of the data table in a comparison prompt.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 1500))
+# Maximum number of companies in one peer comparison.
+PEER_COMPARISON_MAX_TICKERS = int(os.getenv("PEER_COMPARISON_MAX_TICKERS", 20))
+
+# --- Orchestrator ---
+# Maximum number of tool calls from a single LLM response that run at once.
+TOOL_CALL_MAX_CONCURRENCY = int(os.getenv("TOOL_CALL_MAX_CONCURRENCY", 8))
+
+# --- Upstream rate limit ---
+# A global token bucket shared by every yfinance call, on the request path and
+# in the background prefetcher alike.
+UPSTREAM_RATE_LIMIT_PER_SECOND = float(os.getenv("UPSTREAM_RATE_LIMIT_PER_SECOND", 5))
+UPSTREAM_RATE_LIMIT_BURST = int(os.getenv("UPSTREAM_RATE_LIMIT_BURST", 10))
+# Longest wait for a token; a call still queued after it fails instead of
+# holding its executor thread behind a backlog.
+UPSTREAM_RATE_LIMIT_WAIT_SECONDS = float(os.getenv("UPSTREAM_RATE_LIMIT_WAIT_SECONDS", 10))
+
+# --- HTTP transport ---
+# One pooled, keep-alive transport per upstream client library, shared by the
+# whole process. The limits below apply per host on top of the logical-call
+# rate limit above (one yfinance call may make several HTTP requests).
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 32))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 16))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", 60))
+HTTP_HOST_RATE_LIMIT_PER_SECOND = float(os.getenv("HTTP_HOST_RATE_LIMIT_PER_SECOND", 50))
+HTTP_HOST_RATE_LIMIT_BURST = int(os.getenv("HTTP_HOST_RATE_LIMIT_BURST", 100))
+# Retries for connection errors and 429/502/503/504 responses, with jittered
+# exponential backoff (or the server's Retry-After, when it sends one).
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", 0.5))
+HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", 8))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", 60))
+
+# --- Upstream record/replay ---
+# 'live' calls yfinance and OpenAI; 'record' calls them and saves every
+# response under UPSTREAM_FIXTURES_DIR; 'replay' serves the saved responses
+# with no network access, after the injected latencies below (each varied
+# uniformly by +/- REPLAY_LATENCY_JITTER of itself).
+UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "live").lower()
+UPSTREAM_FIXTURES_DIR = os.getenv("UPSTREAM_FIXTURES_DIR", "./fixtures")
+REPLAY_YFINANCE_LATENCY_MS = float(os.getenv("REPLAY_YFINANCE_LATENCY_MS", 0))
+REPLAY_OPENAI_LATENCY_MS = float(os.getenv("REPLAY_OPENAI_LATENCY_MS", 0))
+REPLAY_LATENCY_JITTER = float(os.getenv("REPLAY_LATENCY_JITTER", 0))
+
+# --- Prefetch scheduler ---
+# Keeps the most requested tickers warm by refreshing their cache entries
+# before they expire.
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", 20))
+PREFETCH_INTERVAL_SECONDS = float(os.getenv("PREFETCH_INTERVAL_SECONDS", 60))
+# Refresh an entry once less than this fraction of its TTL remains.
+PREFETCH_REFRESH_MARGIN = float(os.getenv("PREFETCH_REFRESH_MARGIN", 0.2))
+# Request counts decay with this half-life, so popularity follows recent traffic.
+PREFETCH_POPULARITY_HALF_LIFE_SECONDS = float(os.getenv("PREFETCH_POPULARITY_HALF_LIFE_SECONDS", 60 * 60))
+PREFETCH_MAX_RETRIES = int(os.getenv("PREFETCH_MAX_RETRIES", 3))
+PREFETCH_BACKOFF_BASE_SECONDS = float(os.getenv("PREFETCH_BACKOFF_BASE_SECONDS", 1))
+PREFETCH_BACKOFF_MAX_SECONDS = float(os.getenv("PREFETCH_BACKOFF_MAX_SECONDS", 60))
+# Comma-separated tickers kept warm whatever their traffic (e.g. a watchlist
+# or an index's constituents), polled ahead of the top-N.
+PREFETCH_TRACKED_TICKERS = [
+    ticker.strip().upper() for ticker in os.getenv("PREFETCH_TRACKED_TICKERS", "").split(",") if ticker.strip()
+]
+
+# --- News ---
+# News feeds are ingested into the database, deduplicated and behind a
+# per-ticker cursor, and requests read from there. A ticker's feed is polled
+# at most once per 'news' freshness window, by the prefetch scheduler for
+# tracked and popular tickers or on first request for the rest.
+NEWS_DEFAULT_LIMIT = int(os.getenv("NEWS_DEFAULT_LIMIT", 10))
+NEWS_MAX_LIMIT = int(os.getenv("NEWS_MAX_LIMIT", 100))
+NEWS_WRITE_BATCH_SIZE = int(os.getenv("NEWS_WRITE_BATCH_SIZE", 200))
+
+# --- Full-text search ---
+# Company profiles and news are indexed as they are fetched or ingested, in
+# a SQLite file of their own so FTS5 is available whatever DATABASE_URL is.
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "./search_index.db")
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", 10))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", 100))
+
+# --- Metrics and tracing ---
+# Prometheus metrics (GET /metrics): request and per-stage latency
+# histograms, upstream request counts, cache hit ratios and LLM token usage.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Optionally, one JSON line per request with its spans, for requests taking
+# at least TRACE_LOG_MIN_MS; written to TRACE_LOG_FILE, or stderr if unset.
+TRACE_LOG_ENABLED = os.getenv("TRACE_LOG_ENABLED", "false").lower() == "true"
+TRACE_LOG_MIN_MS = float(os.getenv("TRACE_LOG_MIN_MS", 0))
+TRACE_LOG_FILE = os.getenv("TRACE_LOG_FILE", "")
+
+# --- LLM response cache ---
+# Tool-selection decisions are reused for identical (after normalization) or
+# near-duplicate queries; comparison texts are reused for identical inputs.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 2000))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 24 * 60 * 60))
+# Cosine similarity of character-trigram vectors above which a cached
+# decision is reused for a different query.
+LLM_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("LLM_CACHE_SIMILARITY_THRESHOLD", 0.85))
+
+# --- Fast-path router ---
+# Simple, unambiguous queries ("price of TCS", "PE of INFY") are mapped to a
+# tool call locally instead of asking the LLM. Queries scoring below the
+# confidence threshold fall back to the LLM.
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", 0.75))
+FAST_PATH_MAX_WORDS = int(os.getenv("FAST_PATH_MAX_WORDS", 12))
+
+# Local symbol master used to resolve company names and tickers.
+SYMBOLS_FILE = os.getenv(
+    "SYMBOLS_FILE", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "nse_symbols.csv")
+)
+# With strict mode on, tickers missing from the symbol master are rejected
+# instead of being passed to yfinance. Only enable it with a complete master.
+SYMBOL_STRICT_MODE = os.getenv("SYMBOL_STRICT_MODE", "false").lower() == "true"
+# Minimum trigram similarity for a misspelt company name to resolve.
+SYMBOL_FUZZY_MIN_SCORE = float(os.getenv("SYMBOL_FUZZY_MIN_SCORE", 0.6))
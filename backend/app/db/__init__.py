@@ -0,0 +1 @@
+# This file makes the 'db' directory a Python package.
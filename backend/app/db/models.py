@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class StatementPeriod(Base):
+    """
+    One reporting period of a financial statement. The line items are stored
+    as a JSON object alongside a hash of that JSON, so a refresh can tell
+    whether the period changed without comparing every value.
+    """
+    __tablename__ = "statement_periods"
+    __table_args__ = (
+        UniqueConstraint("ticker", "statement_type", "frequency", "period", name="uq_statement_period"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ticker: Mapped[str] = mapped_column(String(32), index=True)
+    statement_type: Mapped[str] = mapped_column(String(16))
+    frequency: Mapped[str] = mapped_column(String(16))
+    period: Mapped[str] = mapped_column(String(32))
+    line_items: Mapped[str] = mapped_column(Text)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class StatementRefresh(Base):
+    """
+    When a (ticker, statement_type, frequency) statement was last refreshed
+    from upstream.
+    """
+    __tablename__ = "statement_refreshes"
+
+    ticker: Mapped[str] = mapped_column(String(32), primary_key=True)
+    statement_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    frequency: Mapped[str] = mapped_column(String(16), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class NewsArticle(Base):
+    """
+    A news article, stored once however many tickers or sources mention it.
+    `url_hash` identifies it by normalized URL and `content_hash` by
+    normalized title, so the same story syndicated under another URL is
+    also recognised as a duplicate.
+    """
+    __tablename__ = "news_articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    url_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    url: Mapped[str] = mapped_column(Text)
+    title: Mapped[str] = mapped_column(Text)
+    publisher: Mapped[str] = mapped_column(String(128))
+    summary: Mapped[str] = mapped_column(Text)
+    published_at: Mapped[datetime] = mapped_column(DateTime)
+    ingested_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class NewsMention(Base):
+    """
+    Links an article to a ticker whose feed returned it. The publication time
+    is repeated here so a ticker's latest news is read straight off the
+    (ticker, published_at) index.
+    """
+    __tablename__ = "news_mentions"
+    __table_args__ = (
+        Index("ix_news_mentions_ticker_published", "ticker", "published_at"),
+    )
+
+    ticker: Mapped[str] = mapped_column(String(32), primary_key=True)
+    article_id: Mapped[int] = mapped_column(ForeignKey("news_articles.id"), primary_key=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class NewsCursor(Base):
+    """
+    How far a ticker's news feed has been ingested: the newest publication
+    time seen and when the feed was last polled.
+    """
+    __tablename__ = "news_cursors"
+
+    ticker: Mapped[str] = mapped_column(String(32), primary_key=True)
+    latest_published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    polled_at: Mapped[datetime] = mapped_column(DateTime)
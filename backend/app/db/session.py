@@ -0,0 +1,43 @@
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+from app.core import config
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+# SQLite connections are shared with the upstream executor's threads.
+_connect_args = {"check_same_thread": False} if config.DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(config.DATABASE_URL, connect_args=_connect_args, pool_pre_ping=True)
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def utcnow() -> datetime:
+    """The current UTC time as a naive datetime, the form the DateTime columns store."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def init_db():
+    """
+    Creates any missing tables. Safe to call repeatedly; only the first call
+    touches the database.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            # Import the models so they are registered on Base.metadata.
+            from app.db import models  # noqa: F401
+            Base.metadata.create_all(bind=engine)
+            _schema_ready = True
@@ -1,13 +1,109 @@
-from fastapi import FastAPI
-from app.api.v1 import company, chat
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Project Sirius API")
+from fastapi import FastAPI, Response
+from app.api.v1 import company, chat, search
+from app.core import config
+from app.services.cache import ticker_cache
+from app.services.intent_router import intent_router
+from app.services.llm_cache import llm_response_cache
+from app.services.metrics import RequestMetricsMiddleware, labels, registry
+from app.services.orchestrator import decision_stats
+from app.services.scheduler import prefetch_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the most requested tickers warm in the background.
+    if config.PREFETCH_ENABLED:
+        prefetch_scheduler.start()
+    yield
+    await prefetch_scheduler.stop()
+
+
+app = FastAPI(title="Project Sirius API", lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Include the v1 routers
 app.include_router(company.router, prefix="/api/v1/company", tags=["company"])
 app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
 
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Project Sirius API"}
+
+
+@app.get("/cache/stats")
+def read_cache_stats():
+    """
+    Hit/miss counters and current size of the shared ticker data cache, plus
+    the background prefetcher's and the LLM response cache's counters, and
+    how many tool-selection misses reached the LLM or shared another's call.
+    """
+    return {
+        **ticker_cache.stats(),
+        "prefetch": dict(prefetch_scheduler.stats),
+        "llm": llm_response_cache.stats(),
+        "llm_decisions": dict(decision_stats),
+    }
+
+
+# --- Metrics ---
+# State the caches, prefetcher and router already count is read at scrape
+# time rather than duplicated into the registry.
+def _cache_lookups():
+    values = {}
+    for data_class, counts in ticker_cache.stats()["by_class"].items():
+        for result, key in (("hit", "hits"), ("miss", "misses")):
+            values[labels(cache="ticker", data_class=data_class, result=result)] = counts[key]
+    llm = llm_response_cache.stats()
+    for data_class, result, key in (
+        ("decision", "hit", "decision_exact_hits"), ("decision", "similar_hit", "decision_similar_hits"),
+        ("decision", "miss", "decision_misses"), ("response", "hit", "response_hits"),
+        ("response", "miss", "response_misses"),
+    ):
+        values[labels(cache="llm", data_class=data_class, result=result)] = llm[key]
+    return values
+
+
+def _cache_hit_ratio():
+    ticker = ticker_cache.stats()
+    llm = llm_response_cache.stats()
+    decision_hits = llm["decision_exact_hits"] + llm["decision_similar_hits"]
+    decisions = decision_hits + llm["decision_misses"]
+    responses = llm["response_hits"] + llm["response_misses"]
+    return {
+        labels(cache="ticker"): ticker["hit_ratio"],
+        labels(cache="llm_decision"): decision_hits / decisions if decisions else 0.0,
+        labels(cache="llm_response"): llm["response_hits"] / responses if responses else 0.0,
+    }
+
+
+def _cache_entries():
+    llm = llm_response_cache.stats()
+    return {
+        labels(cache="ticker"): ticker_cache.stats()["size"],
+        labels(cache="llm_decision"): llm["decisions"],
+        labels(cache="llm_response"): llm["responses"],
+    }
+
+
+registry.callback("sirius_cache_lookups_total", "Cache lookups by cache, data class and result.", _cache_lookups, "counter")
+registry.callback("sirius_cache_hit_ratio", "Hit ratio of each cache since start.", _cache_hit_ratio)
+registry.callback("sirius_cache_entries", "Entries currently held by each cache.", _cache_entries)
+registry.callback(
+    "sirius_prefetch_total", "Background prefetch runs and per-entry outcomes.",
+    lambda: {labels(outcome=name): value for name, value in prefetch_scheduler.stats.items()}, "counter",
+)
+registry.callback(
+    "sirius_chat_routes_total", "Chat queries by routing path (fast_path or llm).",
+    lambda: {labels(path=path): value["count"] for path, value in intent_router.stats.snapshot()["paths"].items()},
+    "counter",
+)
+
+
+@app.get("/metrics")
+def read_metrics():
+    """Request, stage, upstream, token and cache metrics in the Prometheus text format."""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,21 +1,59 @@
 from pydantic import BaseModel
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 
 class KeyRatios(BaseModel):
     """
-    Represents the key financial ratios for a company.
+    Represents the key financial ratios for a company's latest period.
+    Margins, returns and growth rates are fractions (0.12 means 12%).
     """
-    pe_ratio: Optional[str] = None
-    roe: Optional[str] = None
-    debt_to_equity: Optional[str] = None
-    # Add other ratios as needed
+    roe: Optional[float] = None
+    roa: Optional[float] = None
+    debt_to_equity: Optional[float] = None
+    current_ratio: Optional[float] = None
+    gross_margin: Optional[float] = None
+    operating_margin: Optional[float] = None
+    net_margin: Optional[float] = None
+    fcf_margin: Optional[float] = None
+    interest_coverage: Optional[float] = None
+    book_value_per_share: Optional[float] = None
+    eps: Optional[float] = None
+    revenue_growth: Optional[float] = None
+    eps_growth: Optional[float] = None
+    net_income_growth: Optional[float] = None
+    pe_ratio: Optional[float] = None
+    pb_ratio: Optional[float] = None
+    price_to_sales: Optional[float] = None
+    earnings_yield: Optional[float] = None
 
 class CompanyRatiosResponse(BaseModel):
     """
-    The response model for the company ratios endpoint.
+    The response model for the company ratios endpoint. `history` holds each
+    per-period ratio aligned with `periods` (newest first).
     """
     ticker: str
-    ratios: Dict[str, str]
+    frequency: str
+    periods: List[str]
+    ratios: KeyRatios
+    history: Dict[str, List[Optional[float]]]
+
+class PeerRatiosRequest(BaseModel):
+    """
+    The request body for the peer ratios endpoint.
+    """
+    tickers: List[str]
+    frequency: str = "annual"
+
+class PeerRatiosResponse(BaseModel):
+    """
+    The response model for the peer ratios endpoint. Each ratio maps to a list
+    aligned with `ticker`.
+    """
+    frequency: str
+    ticker: List[str]
+    latest_period: List[Optional[str]]
+    ratios: Dict[str, List[Optional[float]]]
+    peer_median: Dict[str, Optional[float]]
+    errors: Dict[str, str]
 
 class CompanyPriceResponse(BaseModel):
     """
@@ -23,3 +61,53 @@ class CompanyPriceResponse(BaseModel):
     """
     ticker: str
     data: Dict[str, Any]
+
+class BatchPriceRequest(BaseModel):
+    """
+    The request body for the batch quote endpoint.
+    """
+    tickers: List[str]
+
+class BatchPriceResponse(BaseModel):
+    """
+    The response model for the batch quote endpoint. `data` is columnar: every
+    field maps to a list aligned with `data["symbol"]`.
+    """
+    count: int
+    data: Dict[str, List[Any]]
+
+class RiskMetricsRequest(BaseModel):
+    """
+    The request body for the batch risk metrics endpoint.
+    """
+    tickers: List[str]
+    period_years: Optional[float] = None
+
+class RiskMetricsResponse(BaseModel):
+    """
+    The response model for the risk metrics endpoints. Each metric maps to a
+    list aligned with `ticker`; returns and volatility are annualized fractions.
+    """
+    ticker: List[str]
+    benchmark: str
+    start: Optional[str]
+    end: Optional[str]
+    risk_free_rate: float
+    metrics: Dict[str, List[Optional[float]]]
+    errors: Dict[str, str]
+
+class PerformanceRequest(BaseModel):
+    """
+    The request body for the batch historical performance endpoint.
+    """
+    tickers: List[str]
+
+class PerformanceResponse(BaseModel):
+    """
+    The response model for the historical performance endpoints, keyed by
+    horizon ("1y", "5y", ...) and statistic, each a list aligned with `ticker`.
+    """
+    ticker: List[str]
+    end: Optional[str]
+    performance: Dict[str, Dict[str, List[Optional[float]]]]
+    errors: Dict[str, str]
@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core import config
+
+
+class _InFlight:
+    """
+    Tracks a single upstream fetch so that concurrent misses for the same key
+    wait for it instead of starting their own.
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded LRU cache with a separate time-to-live for each
+    data class (e.g. 'price', 'statement', 'news').
+
+    Misses for the same key are coalesced: only the first caller runs the
+    loader, everyone else waits for its result, for at most `wait_timeout`
+    seconds. Loader errors are propagated to all waiters and are never cached.
+    """
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+        wait_timeout: float = config.UPSTREAM_CALL_TIMEOUT_SECONDS,
+    ):
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, Hashable], _InFlight] = {}
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "load_errors": 0, "wait_timeouts": 0}
+        self._class_counters: Dict[str, Dict[str, int]] = {
+            data_class: {"hits": 0, "misses": 0} for data_class in self.ttls
+        }
+
+    def _ttl(self, data_class: str) -> float:
+        if data_class not in self.ttls:
+            raise KeyError(f"Unknown cache data class '{data_class}'.")
+        return self.ttls[data_class]
+
+    def _count(self, data_class: str, counter: str):
+        self._counters[counter] += 1
+        self._class_counters.setdefault(data_class, {"hits": 0, "misses": 0})[counter] += 1
+
+    def _lookup(self, full_key: Tuple[str, Hashable]) -> Tuple[bool, Any]:
+        """Must be called with the lock held."""
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[full_key]
+            return False, None
+        self._entries.move_to_end(full_key)
+        return True, value
+
+    def _store(self, full_key: Tuple[str, Hashable], value: Any):
+        """Must be called with the lock held."""
+        self._entries[full_key] = (self._clock() + self._ttl(full_key[0]), value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def get(self, data_class: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Returns a (found, value) pair without triggering a load.
+        """
+        self._ttl(data_class)
+        with self._lock:
+            return self._lookup((data_class, key))
+
+    def set(self, data_class: str, key: Hashable, value: Any):
+        self._ttl(data_class)
+        with self._lock:
+            self._store((data_class, key), value)
+
+    def get_or_load(self, data_class: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for (data_class, key), calling `loader` to
+        fetch it on a miss. Concurrent misses for the same key share one call;
+        a caller that waits longer than `wait_timeout` for it raises
+        TimeoutError instead of holding its thread on a hung upstream.
+        """
+        self._ttl(data_class)
+        full_key = (data_class, key)
+        with self._lock:
+            found, value = self._lookup(full_key)
+            if found:
+                self._count(data_class, "hits")
+                return value
+            self._count(data_class, "misses")
+            in_flight = self._in_flight.get(full_key)
+            if in_flight is None:
+                in_flight = _InFlight()
+                self._in_flight[full_key] = in_flight
+                is_leader = True
+            else:
+                self._counters["coalesced"] += 1
+                is_leader = False
+
+        if not is_leader:
+            if not in_flight.event.wait(self.wait_timeout):
+                with self._lock:
+                    self._counters["wait_timeouts"] += 1
+                raise TimeoutError(f"Timed out waiting for the in-flight load of {data_class} {key!r}.")
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            value = loader()
+        except BaseException as e:
+            in_flight.error = e
+            with self._lock:
+                self._counters["load_errors"] += 1
+                self._in_flight.pop(full_key, None)
+            in_flight.event.set()
+            raise
+
+        in_flight.value = value
+        with self._lock:
+            self._store(full_key, value)
+            self._in_flight.pop(full_key, None)
+        in_flight.event.set()
+        return value
+
+    def refresh(self, data_class: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Calls `loader` unconditionally and stores its result, resetting the
+        entry's TTL. Used to refresh entries ahead of expiry.
+        """
+        self._ttl(data_class)
+        value = loader()
+        with self._lock:
+            self._store((data_class, key), value)
+        return value
+
+    def ttl_remaining(self, data_class: str, key: Hashable) -> Optional[float]:
+        """
+        Seconds until the entry expires, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get((data_class, key))
+            if entry is None:
+                return None
+            remaining = entry[0] - self._clock()
+            return remaining if remaining > 0 else None
+
+    def invalidate(self, data_class: str, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop((data_class, key), None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters (overall and per data class) and the current size.
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": self._counters["hits"] / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "by_class": {name: dict(counts) for name, counts in self._class_counters.items()},
+            }
+
+
+# The process-wide cache shared by every scraper function.
+ticker_cache = TTLCache(config.CACHE_TTL_SECONDS, config.CACHE_MAX_ENTRIES)
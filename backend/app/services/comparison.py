@@ -0,0 +1,221 @@
+from typing import Any, Dict, List, Tuple
+
+from app.core import config
+from app.services import scraper
+from app.services.executor import map_blocking
+from app.services.llm_cache import llm_response_cache
+from app.services.metrics import record_tokens, span
+from app.services.prompt_builder import build_comparison_table, build_peer_table
+from app.services.ratios import to_list
+from app.services.statement_table import StatementTable
+from app.services.transport import openai_client
+
+COMPARISON_MODEL = "gpt-4o-mini"  # lightweight model for analysis
+COMPARISON_SYSTEM_PROMPT = "You are a financial analyst."
+
+
+# --- Preparing comparisons ---
+# A prepared comparison has everything except the LLM's text: {"prompt",
+# "cache_key", "tickers", "result"}. The blocking tools below complete it with
+# one chat completion; the streaming chat endpoint streams that completion
+# instead. Both finish through `finish_comparison`.
+def _load_tables(ticker_symbols: List[str], statement_type: str, frequency: str) -> Tuple[List[StatementTable], Dict[str, str]]:
+    """Fetches every company's statement at once; companies that fail are reported in the errors dict."""
+    outcomes = map_blocking(
+        lambda ticker_symbol: scraper.get_statement_table(ticker_symbol, statement_type, frequency),
+        ticker_symbols,
+    )
+    tables, errors = [], {}
+    for ticker_symbol, (table, error) in zip(ticker_symbols, outcomes):
+        if error is not None:
+            errors[ticker_symbol] = str(error)
+        elif not table.periods:
+            errors[ticker_symbol] = f"No {statement_type} statement found."
+        else:
+            tables.append(table)
+    return tables, errors
+
+
+def _cache_key(kind: str, tables: List[StatementTable], statement_type: str, frequency: str) -> str:
+    # Identical inputs produce the same analysis, so it is reused while the
+    # underlying statement data is unchanged.
+    return llm_response_cache.response_key(
+        kind, [table.ticker for table in tables], statement_type, frequency,
+        [table.content_hash() for table in tables],
+    )
+
+
+def prepare_peer_comparison(
+    ticker_symbols: List[str],
+    statement_type: str,
+    frequency: str = "annual"
+) -> Dict[str, Any]:
+    """
+    Fetches the statements of every company concurrently, aligns them by
+    period recency, computes the comparison matrix locally and builds a single
+    compact prompt over all of them.
+
+    :return: {"error": ...} on failure, {"cached": result} when an identical
+             comparison was already answered, otherwise a prepared comparison.
+    """
+    ticker_symbols = list(dict.fromkeys(ticker_symbols))
+    if len(ticker_symbols) < 2:
+        return {"error": "At least two ticker symbols are needed for a comparison."}
+    if len(ticker_symbols) > config.PEER_COMPARISON_MAX_TICKERS:
+        return {"error": f"At most {config.PEER_COMPARISON_MAX_TICKERS} companies can be compared at once."}
+
+    # Step 1: Fetch every statement at once
+    tables, errors = _load_tables(ticker_symbols, statement_type, frequency)
+    if len(tables) < 2:
+        return {"error": "Could not load statements for at least two of the requested tickers.", "details": errors}
+
+    cache_key = _cache_key("compare_peer_financial_statements", tables, statement_type, frequency)
+    if config.LLM_CACHE_ENABLED:
+        cached = llm_response_cache.get_response(cache_key)
+        if cached is not None:
+            return {"cached": cached}
+
+    # Step 2: Compute the matrix and build one prompt for all the companies.
+    table_text, _, line_items, matrix = build_peer_table(tables, statement_type)
+    prompt = f"""
+    Compare the following {frequency} {statement_type} statements of {len(tables)} peer companies.
+    Each row is a company's latest period (P0); "yoy" is growth over its prior period.
+    The last row is the peer median.
+
+    {table_text}
+
+    Provide a clear comparison of key metrics, highlight leaders, laggards and
+    outliers relative to the median, and state which companies are stronger
+    financially in this statement.
+    """
+    return {
+        "prompt": prompt,
+        "cache_key": cache_key,
+        "tickers": [table.ticker for table in tables],
+        "result": {
+            "tickers": [table.ticker for table in tables],
+            "statement_type": statement_type,
+            "frequency": frequency,
+            "latest_period": [table.periods[0] for table in tables],
+            "line_items": line_items,
+            "latest": {item: to_list(matrix["latest"][:, i]) for i, item in enumerate(line_items)},
+            "growth": {item: to_list(matrix["growth"][:, i]) for i, item in enumerate(line_items)},
+            "rank": {item: to_list(matrix["rank"][:, i]) for i, item in enumerate(line_items)},
+            "peer_median": dict(zip(line_items, to_list(matrix["median"]))),
+            "errors": errors,
+        },
+    }
+
+
+def prepare_comparison(
+    ticker_symbol_1: str,
+    ticker_symbol_2: str,
+    statement_type: str,
+    frequency: str = "annual"
+) -> Dict[str, Any]:
+    """
+    The two-company case of `prepare_peer_comparison`. With only two
+    companies the prompt can afford several periods side by side and their
+    difference, so it uses the pairwise table instead of the peer table.
+    """
+    tables, errors = _load_tables([ticker_symbol_1, ticker_symbol_2], statement_type, frequency)
+    if errors:
+        ticker_symbol, error = next(iter(errors.items()))
+        return {"error": f"Failed to fetch data for {ticker_symbol}", "details": {"error": error}}
+
+    cache_key = _cache_key("compare_two_companies_financial_statement", tables, statement_type, frequency)
+    if config.LLM_CACHE_ENABLED:
+        cached = llm_response_cache.get_response(cache_key)
+        if cached is not None:
+            return {"cached": cached}
+
+    table_text, _ = build_comparison_table(tables, statement_type)
+    prompt = f"""
+    Compare the following {frequency} {statement_type} statements of two companies.
+    P0 is each company's latest period, P1 the one before. "yoy" is P0 growth over P1.
+
+    {table_text}
+
+    Provide a clear comparison of key metrics, highlight major differences,
+    and state which company is stronger financially in this statement.
+    """
+    return {
+        "prompt": prompt,
+        "cache_key": cache_key,
+        "tickers": [table.ticker for table in tables],
+        "result": {
+            "company_1": ticker_symbol_1,
+            "company_2": ticker_symbol_2,
+            "statement_type": statement_type,
+            "frequency": frequency,
+        },
+    }
+
+
+def comparison_messages(prepared: Dict[str, Any]) -> List[Dict[str, str]]:
+    """The chat messages for a prepared comparison."""
+    return [
+        {"role": "system", "content": COMPARISON_SYSTEM_PROMPT},
+        {"role": "user", "content": prepared["prompt"]},
+    ]
+
+
+def finish_comparison(prepared: Dict[str, Any], comparison_text: str) -> Dict[str, Any]:
+    """Attaches the LLM's comparison text to a prepared comparison and caches it."""
+    result = {**prepared["result"], "comparison": comparison_text}
+    if config.LLM_CACHE_ENABLED:
+        llm_response_cache.put_response(prepared["cache_key"], prepared["tickers"], result)
+    return result
+
+
+def _complete(prepared: Dict[str, Any]) -> Dict[str, Any]:
+    if "error" in prepared:
+        return prepared
+    if "cached" in prepared:
+        return prepared["cached"]
+    try:
+        with span("llm_comparison"):
+            response = openai_client().chat.completions.create(
+                model=COMPARISON_MODEL,
+                messages=comparison_messages(prepared),
+            )
+        record_tokens(COMPARISON_MODEL, "comparison", response.usage)
+        return finish_comparison(prepared, response.choices[0].message.content)
+
+    except Exception as e:
+        return {"error": f"LLM comparison failed: {e}"}
+
+
+# --- Tools ---
+def compare_peer_financial_statements(
+    ticker_symbols: List[str],
+    statement_type: str,
+    frequency: str = "annual"
+) -> Dict[str, Any]:
+    """
+    Compares the financial statements of several companies: the latest value,
+    growth, rank and peer median of each key line item, computed locally,
+    plus an LLM-written analysis from one call over all of them.
+
+    :param ticker_symbols: Company tickers (e.g., ['HDFCBANK.NS', 'ICICIBANK.NS', 'KOTAKBANK.NS']).
+    :param statement_type: One of 'income', 'balance', or 'cashflow'.
+    :param frequency: 'annual' or 'quarterly'. Default: 'annual'.
+    """
+    return _complete(prepare_peer_comparison(ticker_symbols, statement_type, frequency))
+
+
+def compare_two_companies_financial_statement(
+    ticker_symbol_1: str,
+    ticker_symbol_2: str,
+    statement_type: str,
+    frequency: str = "annual"
+) -> Dict[str, Any]:
+    """
+    Compares financial statements of two companies by fetching their data and asking the LLM for analysis.
+
+    :param ticker_symbol_1: First company ticker (e.g., 'RELIANCE.NS').
+    :param ticker_symbol_2: Second company ticker (e.g., 'TCS.NS').
+    :param statement_type: One of 'income', 'balance', or 'cashflow'.
+    :param frequency: 'annual' or 'quarterly'. Default: 'annual'.
+    """
+    return _complete(prepare_comparison(ticker_symbol_1, ticker_symbol_2, statement_type, frequency))
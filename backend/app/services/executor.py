@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from app.core import config
+
+
+# A dedicated pool for blocking upstream calls (yfinance, scraping). Keeping it
+# separate from the server's threadpool means a slow upstream only degrades the
+# requests that depend on it instead of starving every other endpoint.
+upstream_executor = ThreadPoolExecutor(
+    max_workers=config.UPSTREAM_EXECUTOR_WORKERS,
+    thread_name_prefix="upstream",
+)
+
+# Fan-out from code that is already running on the upstream executor gets its
+# own pool, so a tool waiting on its per-ticker loads can never starve the
+# pool those loads would otherwise queue on.
+fanout_executor = ThreadPoolExecutor(
+    max_workers=config.FANOUT_EXECUTOR_WORKERS,
+    thread_name_prefix="fanout",
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Runs a blocking function on the upstream executor and awaits its result.
+
+    :param timeout: Seconds to wait before raising asyncio.TimeoutError.
+                    Defaults to UPSTREAM_CALL_TIMEOUT_SECONDS.
+    """
+    loop = asyncio.get_running_loop()
+    # Carries the caller's context (e.g. the request's trace) into the thread.
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(upstream_executor, functools.partial(context.run, func, *args, **kwargs))
+    if timeout is None:
+        timeout = config.UPSTREAM_CALL_TIMEOUT_SECONDS
+    return await asyncio.wait_for(future, timeout)
+
+
+def map_blocking(func: Callable[[Any], Any], items: Iterable[Any]) -> List[Tuple[Any, Optional[BaseException]]]:
+    """
+    Calls `func` on every item concurrently on the fan-out executor and waits
+    for all of them.
+
+    :return: One (result, exception) pair per item, in input order. The
+             exception is None when `func` returned; the result is None when
+             it raised (but can also be None when `func` returned None), so
+             check the exception to tell them apart.
+    """
+    # Each task gets its own copy of the caller's context: a context can only
+    # be entered by one thread at a time.
+    futures = [fanout_executor.submit(contextvars.copy_context().run, func, item) for item in items]
+    outcomes = []
+    for future in futures:
+        error = future.exception()
+        outcomes.append((None, error) if error is not None else (future.result(), None))
+    return outcomes
@@ -0,0 +1,166 @@
+import json
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core import config
+from app.services.symbols import SymbolMaster, symbol_master
+
+
+# --- Intents ---
+# Each intent maps a set of keyword patterns to a single-ticker tool. Intents
+# listed in `overrides` win when both match (a P/E question mentions "price").
+INTENTS: List[Dict[str, Any]] = [
+    {
+        "name": "price_earning",
+        "tool": "get_price_earning_data",
+        "pattern": r"\b(p\s*/\s*e|pe|pe ratio|price[\s-]+to[\s-]+earnings?|price[\s-]+earnings?)\b",
+        "overrides": ("price",),
+    },
+    {
+        "name": "ratios",
+        "tool": "get_financial_ratios",
+        "pattern": r"\b((financial|key) ratios?|ratios|roe|roa|return on equity|debt[\s-]+to[\s-]+equity|d\s*/\s*e|current ratio|margins?|p\s*/\s*b|price[\s-]+to[\s-]+book)\b",
+        "overrides": ("price",),
+    },
+    {
+        "name": "price",
+        "tool": "get_stock_price_data",
+        "pattern": r"\b(price|quote|trading at|ltp|share price|stock price|52[\s-]*week)\b",
+    },
+    {
+        "name": "news",
+        "tool": "get_latest_news",
+        "pattern": r"\b(news|headlines?|latest on)\b",
+    },
+    {
+        "name": "profile",
+        "tool": "get_company_profile",
+        "pattern": r"\b(profile|sector|industry|business summary|employees|headquarter(s|ed)?|website|what does .+ do)\b",
+    },
+    {
+        "name": "statement",
+        "tool": "get_financial_statement",
+        "pattern": r"\b(income statement|p\s*&\s*l|profit and loss|balance sheet|cash\s*flows?( statement)?)\b",
+    },
+]
+_COMPILED = [(intent, re.compile(intent["pattern"], re.IGNORECASE)) for intent in INTENTS]
+
+# Queries that ask for analysis rather than a lookup always go to the LLM,
+# including valuation questions that share keywords with lookups
+# ("margin of safety" is not a margin, "price target" is not a quote).
+_NEEDS_LLM = re.compile(
+    r"\b(compare|comparison|vs\.?|versus|better|why|should i|explain|analy[sz]e|trend|predict"
+    r"|valuations?|valued|intrinsic|fair value|margin of safety|dcf|discounted cash flow"
+    r"|(price|share|stock) targets?|target (price|prices)|under[\s-]?valued|over[\s-]?valued|upside|downside|worth (buying|it|investing))\b",
+    re.IGNORECASE,
+)
+
+
+def matched_intents(query: str) -> List[str]:
+    """Names of every intent whose keywords appear in the query."""
+    return [intent["name"] for intent, pattern in _COMPILED if pattern.search(query)]
+
+
+def _statement_arguments(query: str) -> Dict[str, str]:
+    lowered = query.lower()
+    if "balance" in lowered:
+        statement_type = "balance"
+    elif "cash" in lowered:
+        statement_type = "cashflow"
+    else:
+        statement_type = "income"
+    frequency = "quarterly" if re.search(r"\bquarter(ly|s)?\b", lowered) else "annual"
+    return {"statement_type": statement_type, "frequency": frequency}
+
+
+# --- Path statistics ---
+class RouterStats:
+    """
+    Per-path (fast_path / llm) request counts and latencies, with a bounded
+    window of recent latencies for percentiles.
+    """
+    PATHS = ("fast_path", "llm")
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._counts = {path: 0 for path in self.PATHS}
+        self._total_seconds = {path: 0.0 for path in self.PATHS}
+        self._recent: Dict[str, Deque[float]] = {path: deque(maxlen=window) for path in self.PATHS}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            self._counts[path] += 1
+            self._total_seconds[path] += seconds
+            self._recent[path].append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._counts.values())
+            paths = {}
+            for path in self.PATHS:
+                recent = sorted(self._recent[path])
+                count = self._counts[path]
+                paths[path] = {
+                    "count": count,
+                    "hit_rate": count / total if total else 0.0,
+                    "avg_ms": self._total_seconds[path] / count * 1000 if count else None,
+                    "p50_ms": recent[len(recent) // 2] * 1000 if recent else None,
+                    "p95_ms": recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000 if recent else None,
+                }
+            return {"total": total, "paths": paths}
+
+
+# --- Router ---
+def score_query(query: str, index: SymbolMaster) -> Tuple[float, Optional[Dict[str, Any]], List[str]]:
+    """
+    Scores how safely a query can be answered without the LLM.
+
+    :return: (confidence, matched intent or None, resolved tickers)
+    """
+    tickers = index.find_all(query)
+    matched = [intent for intent, pattern in _COMPILED if pattern.search(query)]
+    overridden = {name for intent in matched for name in intent.get("overrides", ())}
+    matched = [intent for intent in matched if intent["name"] not in overridden]
+
+    if len(matched) != 1 or not tickers or _NEEDS_LLM.search(query):
+        return 0.0, None, tickers
+
+    confidence = 1.0
+    if len(query.split()) > config.FAST_PATH_MAX_WORDS:
+        confidence -= 0.5
+    return confidence, matched[0], tickers
+
+
+class IntentRouter:
+    """
+    Resolves simple queries to tool calls locally, using keyword/regex intent
+    matching and the symbol master. Returns None when the LLM should decide.
+    """
+    def __init__(self, index: SymbolMaster, min_confidence: float = config.FAST_PATH_MIN_CONFIDENCE):
+        self.index = index
+        self.min_confidence = min_confidence
+        self.stats = RouterStats()
+
+    def route(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        confidence, intent, tickers = score_query(query, self.index)
+        if intent is None or confidence < self.min_confidence:
+            return None
+
+        extra = _statement_arguments(query) if intent["tool"] == "get_financial_statement" else {}
+        # Tool calls use the same shape as the ones parsed from the LLM response.
+        return [
+            {
+                "id": f"fastpath_{i}",
+                "type": "function",
+                "function": {
+                    "name": intent["tool"],
+                    "arguments": json.dumps({"ticker_symbol": ticker, **extra}),
+                },
+            }
+            for i, ticker in enumerate(tickers)
+        ]
+
+
+intent_router = IntentRouter(symbol_master)
@@ -0,0 +1,228 @@
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.services.intent_router import matched_intents
+from app.services.symbols import symbol_master
+
+
+def normalize_query(query: str) -> str:
+    """Lower-cases, drops punctuation other than '&', '/', '.' and collapses whitespace."""
+    query = re.sub(r"[^\w&/.\s]", " ", query.lower())
+    return " ".join(query.split()).strip(" .")
+
+
+def query_signature(query: str) -> Tuple:
+    """
+    The parts of a query that must match exactly before a cached decision can
+    be reused for it: the tickers it names, any numbers, the intents its
+    keywords point to, and the reporting frequency. Two queries can be very
+    similar as text ("price of TCS" / "price of TCS.NS") yet only safe to
+    share an answer when these agree.
+    """
+    lowered = query.lower()
+    return (
+        tuple(sorted(symbol_master.find_all(query))),
+        tuple(sorted(re.findall(r"\d+(?:\.\d+)?", lowered))),
+        tuple(sorted(matched_intents(query))),
+        "quarterly" if re.search(r"\bquarter", lowered) else "annual",
+    )
+
+
+class NgramIndex:
+    """
+    A fixed-capacity index of L2-normalized character-trigram vectors (hashed
+    into `dimensions` buckets) for nearest-neighbour lookup by cosine similarity.
+    """
+    def __init__(self, capacity: int, dimensions: int = 2048):
+        self.dimensions = dimensions
+        self._vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._used = np.zeros(capacity, dtype=bool)
+
+    def embed(self, text: str) -> np.ndarray:
+        padded = f"  {text} "
+        buckets = [zlib.crc32(padded[i:i + 3].encode()) % self.dimensions for i in range(len(padded) - 2)]
+        vector = np.bincount(buckets, minlength=self.dimensions).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def put(self, slot: int, vector: np.ndarray):
+        self._vectors[slot] = vector
+        self._used[slot] = True
+
+    def remove(self, slot: int):
+        self._used[slot] = False
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self._used.any():
+            return None, 0.0
+        scores = self._vectors @ vector
+        scores[~self._used] = -1.0
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "slot", "signature", "tickers")
+
+    def __init__(self, value, expires_at, slot=None, signature=None, tickers=()):
+        self.value = value
+        self.expires_at = expires_at
+        self.slot = slot
+        self.signature = signature
+        self.tickers = tuple(tickers)
+
+
+class LLMResponseCache:
+    """
+    Caches LLM outputs so repeated work does not spend tokens:
+
+    - Tool-selection decisions, keyed on the normalized query text. A query
+      with no exact entry can reuse the decision of its nearest cached query
+      when their trigram similarity clears the threshold and their
+      `query_signature` is identical and names at least one ticker.
+    - Comparison texts, keyed on a content hash of the statements compared.
+      Entries are indexed by ticker so they can be dropped when a ticker's
+      statement data changes.
+    """
+    def __init__(
+        self,
+        max_entries: int = config.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = config.LLM_CACHE_TTL_SECONDS,
+        similarity_threshold: float = config.LLM_CACHE_SIMILARITY_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._decisions: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._slot_owner: Dict[int, str] = {}
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._index = NgramIndex(max_entries)
+        self._responses: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._ticker_keys: Dict[str, set] = {}
+        self._counters = {
+            "decision_exact_hits": 0, "decision_similar_hits": 0, "decision_misses": 0,
+            "response_hits": 0, "response_misses": 0, "invalidations": 0,
+        }
+
+    # --- Tool-selection decisions ---
+    def _drop_decision(self, key: str):
+        """Must be called with the lock held."""
+        entry = self._decisions.pop(key)
+        self._index.remove(entry.slot)
+        self._slot_owner.pop(entry.slot, None)
+        self._free_slots.append(entry.slot)
+
+    def get_decision(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        key = normalize_query(query)
+        now = self._clock()
+        with self._lock:
+            entry = self._decisions.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._drop_decision(key)
+                entry = None
+            if entry is not None:
+                self._decisions.move_to_end(key)
+                self._counters["decision_exact_hits"] += 1
+                return copy.deepcopy(entry.value)
+
+            # Without a resolved ticker the signature cannot tell companies
+            # outside the symbol master apart ("Adani Green" / "Adani Power"),
+            # so such queries only reuse exact hits.
+            signature = query_signature(query)
+            slot, similarity = self._index.nearest(self._index.embed(key)) if signature[0] else (None, 0.0)
+            if slot is not None and similarity >= self.similarity_threshold:
+                candidate_key = self._slot_owner[slot]
+                candidate = self._decisions[candidate_key]
+                if candidate.expires_at > now and candidate.signature == signature:
+                    self._decisions.move_to_end(candidate_key)
+                    self._counters["decision_similar_hits"] += 1
+                    return copy.deepcopy(candidate.value)
+
+            self._counters["decision_misses"] += 1
+            return None
+
+    def put_decision(self, query: str, tool_calls: List[Dict[str, Any]]):
+        key = normalize_query(query)
+        signature = query_signature(query)
+        vector = self._index.embed(key)
+        with self._lock:
+            if key in self._decisions:
+                self._drop_decision(key)
+            if not self._free_slots:
+                self._drop_decision(next(iter(self._decisions)))
+            slot = self._free_slots.pop()
+            self._index.put(slot, vector)
+            self._slot_owner[slot] = key
+            self._decisions[key] = _Entry(
+                copy.deepcopy(tool_calls), self._clock() + self.ttl_seconds, slot=slot, signature=signature
+            )
+
+    # --- Data-dependent responses ---
+    @staticmethod
+    def response_key(kind: str, *parts: Any) -> str:
+        """A stable key for a response computed from `parts` (e.g. content hashes)."""
+        return hashlib.sha256(json.dumps([kind, *parts], sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_response(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None:
+                    self._forget_response(key)
+                self._counters["response_misses"] += 1
+                return None
+            self._responses.move_to_end(key)
+            self._counters["response_hits"] += 1
+            return copy.deepcopy(entry.value)
+
+    def put_response(self, key: str, tickers: Iterable[str], value: Any):
+        tickers = [ticker.upper() for ticker in tickers]
+        with self._lock:
+            if key in self._responses:
+                self._forget_response(key)
+            self._responses[key] = _Entry(copy.deepcopy(value), self._clock() + self.ttl_seconds, tickers=tickers)
+            for ticker in tickers:
+                self._ticker_keys.setdefault(ticker, set()).add(key)
+            while len(self._responses) > self.max_entries:
+                self._forget_response(next(iter(self._responses)))
+
+    def _forget_response(self, key: str):
+        """Must be called with the lock held."""
+        entry = self._responses.pop(key, None)
+        if entry is None:
+            return
+        for ticker in entry.tickers:
+            keys = self._ticker_keys.get(ticker)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._ticker_keys[ticker]
+
+    def invalidate_ticker(self, ticker_symbol: str) -> int:
+        """Drops every cached response computed from this ticker's data."""
+        with self._lock:
+            keys = list(self._ticker_keys.get(ticker_symbol.upper(), ()))
+            for key in keys:
+                self._forget_response(key)
+            self._counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "decisions": len(self._decisions), "responses": len(self._responses)}
+
+
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,319 @@
+import bisect
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core import config
+
+trace_logger = logging.getLogger("sirius.trace")
+if config.TRACE_LOG_ENABLED and not trace_logger.handlers:
+    # One JSON object per line, to a file or stderr, whatever the server's
+    # own logging configuration is.
+    _handler = logging.FileHandler(config.TRACE_LOG_FILE) if config.TRACE_LOG_FILE else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.addHandler(_handler)
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.propagate = False
+
+# Latency buckets (seconds) shared by every histogram: fine enough at the low
+# end for cache hits and local tools, wide enough for slow LLM calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def labels(**values: Any) -> Labels:
+    return _labels(values)
+
+
+def _labels(values: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in values.items()))
+
+
+def _label_pairs(labels: Labels) -> str:
+    return ",".join(
+        f'{name}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels
+    )
+
+
+def _format_labels(labels: Labels) -> str:
+    return "{" + _label_pairs(labels) + "}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# --- Metric types ---
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in values]
+        return lines
+
+
+class Histogram:
+    """
+    A Prometheus histogram: cumulative bucket counts, sum and count per label
+    set, from which p50/p95/p99 are computed at query time
+    (histogram_quantile) over any window.
+    """
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_value(bound) for bound in self.buckets + (math.inf,)]
+        for labels, (counts, total) in series:
+            pairs = _label_pairs(labels)
+            bucket = f"{self.name}_bucket{{{pairs}{',' if pairs else ''}le=\""
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{bucket}{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    A gauge or counter whose values are read from `collect` (labels -> value)
+    at scrape time, for state another component already keeps, such as the
+    caches' own hit counters.
+    """
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Dict[Labels, float]], kind: str = "gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in sorted(self.collect().items())]
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def callback(
+        self, name: str, help_text: str, collect: Callable[[], Dict[Labels, float]], kind: str = "gauge"
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help_text, collect, kind))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "sirius_http_request_duration_seconds", "API request latency by route, method and status, until the last byte."
+)
+stage_seconds = registry.histogram(
+    "sirius_stage_duration_seconds", "Latency of each pipeline stage (see `span`), by stage and name."
+)
+stage_errors = registry.counter("sirius_stage_errors_total", "Pipeline stages that raised, by stage and name.")
+upstream_requests = registry.counter(
+    "sirius_upstream_http_requests_total", "HTTP requests to upstream hosts (yfinance, OpenAI), by host and status."
+)
+upstream_retries = registry.counter("sirius_upstream_http_retries_total", "Retried upstream HTTP requests, by host.")
+llm_tokens = registry.counter("sirius_llm_tokens_total", "LLM tokens used, by model, purpose and type (prompt/completion).")
+report_sections = registry.counter(
+    "sirius_report_sections_total", "Company report sections by section and outcome (ok, error, pending)."
+)
+
+
+# --- Spans and traces ---
+class Trace:
+    """The spans of one API request, logged as one JSON line when it ends."""
+    def __init__(self, method: str, route: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.route = route
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Dict[str, Any]):
+        # Spans arrive from the event loop and from executor threads.
+        with self._lock:
+            self.spans.append(span)
+
+    def to_json(self, status: int, seconds: float) -> str:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        return json.dumps({
+            "trace_id": self.id, "method": self.method, "route": self.route, "status": status,
+            "duration_ms": round(seconds * 1000, 2), "spans": spans,
+        })
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("sirius_trace", default=None)
+
+
+@contextmanager
+def span(stage: str, name: str = "") -> Iterator[None]:
+    """
+    Times a pipeline stage into `sirius_stage_duration_seconds` and, when the
+    request is being traced, adds it to the request's trace. Works around
+    awaits as well as blocking code; executor threads see the request's
+    trace because `run_blocking` and `map_blocking` copy the context.
+    """
+    if not config.METRICS_ENABLED:
+        yield
+        return
+    trace = _current_trace.get()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        stage_errors.inc(stage=stage, name=name)
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        stage_seconds.observe(seconds, stage=stage, name=name)
+        if trace is not None:
+            entry = {
+                "stage": stage, "name": name,
+                "start_ms": round((started - trace.started) * 1000, 2), "duration_ms": round(seconds * 1000, 2),
+            }
+            if error:
+                entry["error"] = error
+            trace.add(entry)
+
+
+def record_tokens(model: str, purpose: str, usage: Any):
+    """Adds an OpenAI response's `usage` (if any) to `sirius_llm_tokens_total`."""
+    if usage is None or not config.METRICS_ENABLED:
+        return
+    llm_tokens.inc(getattr(usage, "prompt_tokens", 0) or 0, model=model, purpose=purpose, type="prompt")
+    llm_tokens.inc(getattr(usage, "completion_tokens", 0) or 0, model=model, purpose=purpose, type="completion")
+
+
+def record_upstream(host: str, status: Any):
+    if config.METRICS_ENABLED:
+        upstream_requests.inc(host=host, status=status)
+
+
+def _route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. '/api/v1/company/{ticker}/news'.
+    Routes of an included router may carry only their own part of the path,
+    so the prefix is taken from the request path, one segment per segment
+    of the template.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    depth = template.count("/")
+    return scope["path"].rsplit("/", depth)[0] + template
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing every API request by route template (not raw
+    path, to keep label cardinality bounded) until its last body chunk is
+    sent, so streamed responses are measured in full. When TRACE_LOG_ENABLED
+    is set it also collects the request's spans and logs them as one JSON
+    line on the 'sirius.trace' logger, for requests slower than
+    TRACE_LOG_MIN_MS.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"]) if config.TRACE_LOG_ENABLED else None
+        token = _current_trace.set(trace)
+        started = time.perf_counter()
+        status = {"code": 500}
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            seconds = time.perf_counter() - started
+            route = _route_template(scope)
+            http_request_seconds.observe(seconds, route=route, method=scope["method"], status=status["code"])
+            if trace is not None and seconds * 1000 >= config.TRACE_LOG_MIN_MS:
+                trace.route = route
+                trace_logger.info(trace.to_json(status["code"], seconds))
+
+        async def send_and_time(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_and_time)
+        finally:
+            finish()
+            _current_trace.reset(token)
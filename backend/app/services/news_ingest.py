@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import re
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core import config
+from app.services import news_store
+from app.services.search_index import search_index
+
+logger = logging.getLogger(__name__)
+
+# A (ticker, item) pair flowing through the pipeline: raw upstream dicts
+# after `fetch_items`, normalized articles after `normalize`.
+Item = Tuple[str, Dict[str, Any]]
+
+# Query parameters that only track the click, so they are dropped before a
+# URL is hashed.
+_TRACKING_PARAMETER = re.compile(r"^(utm_|ncid$|guccounter$|fbclid$|gclid$|\.tsrc$)")
+
+
+def normalize_url(url: str) -> str:
+    """Lower-cases the scheme and host and drops tracking parameters, fragments and trailing slashes."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMETER.match(key)
+    ))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _title_key(title: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def _published_at(value: Any) -> Optional[datetime]:
+    """Parses an epoch timestamp or ISO 8601 string into a naive UTC datetime."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+    return None
+
+
+def normalize_item(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Maps one upstream news item to the stored article fields. Accepts both
+    yfinance's current layout (fields under "content") and its older flat
+    one. Returns None for items without a title, link or publication time.
+    """
+    content = raw.get("content") if isinstance(raw.get("content"), dict) else raw
+    url = (
+        (content.get("canonicalUrl") or {}).get("url")
+        or (content.get("clickThroughUrl") or {}).get("url")
+        or content.get("link")
+    )
+    title = (content.get("title") or "").strip()
+    published_at = _published_at(content.get("pubDate") or content.get("providerPublishTime"))
+    if not url or not title or published_at is None:
+        return None
+    url = normalize_url(url)
+    return {
+        "url_hash": _hash(url),
+        "content_hash": _hash(_title_key(title)),
+        "url": url,
+        "title": title,
+        "publisher": ((content.get("provider") or {}).get("displayName") or content.get("publisher") or "")[:128],
+        "summary": (content.get("summary") or "").strip(),
+        "published_at": published_at,
+    }
+
+
+# --- Pipeline stages ---
+# Each stage is a generator over (ticker, item) pairs, so a poll streams
+# items from upstream to the store in bounded batches without holding every
+# ticker's feed in memory.
+def fetch_items(
+    tickers: Iterable[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    errors: Dict[str, str],
+) -> Iterator[Item]:
+    """Yields the raw feed items of each ticker. Tickers whose feed fails are recorded in `errors` and skipped."""
+    for ticker_symbol in tickers:
+        try:
+            feed = fetch(ticker_symbol) or []
+        except Exception as e:
+            logger.warning("News fetch for %s failed: %s", ticker_symbol, e)
+            errors[ticker_symbol] = str(e)
+            continue
+        for raw in feed:
+            yield ticker_symbol, raw
+
+
+def normalize(items: Iterable[Item]) -> Iterator[Item]:
+    for ticker_symbol, raw in items:
+        article = normalize_item(raw)
+        if article is not None:
+            yield ticker_symbol, article
+
+
+def after_cursor(items: Iterable[Item], cursors: Dict[str, Optional[datetime]]) -> Iterator[Item]:
+    """
+    Drops items published before the ticker's cursor. Items at the cursor
+    itself pass, since a feed can publish several at the same second; dedup
+    catches the ones already stored.
+    """
+    for ticker_symbol, article in items:
+        if ticker_symbol not in cursors:
+            cursors[ticker_symbol] = news_store.read_cursor(ticker_symbol)
+        cursor = cursors[ticker_symbol]
+        if cursor is None or article["published_at"] >= cursor:
+            yield ticker_symbol, article
+
+
+def dedupe(items: Iterable[Item]) -> Iterator[Item]:
+    """Drops repeats within one poll: the same URL or the same story under another URL."""
+    seen: Set[Tuple[str, str]] = set()
+    for ticker_symbol, article in items:
+        keys = {(ticker_symbol, article["url_hash"]), (ticker_symbol, article["content_hash"])}
+        if keys & seen:
+            continue
+        seen |= keys
+        yield ticker_symbol, article
+
+
+def batched(items: Iterable[Item], size: int) -> Iterator[List[Item]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ingest_news(
+    tickers: Iterable[str],
+    fetch: Callable[[str], List[Dict[str, Any]]],
+    batch_size: int = config.NEWS_WRITE_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Polls the news feed of every ticker and writes the items newer than its
+    cursor to the news store, deduplicated against each other and against
+    stored articles, and indexes them for full-text search. Each polled
+    ticker's cursor then moves to the newest item seen.
+
+    :param fetch: Returns one ticker's raw upstream feed.
+    :return: Write counts, plus the tickers whose feed failed in "errors".
+    """
+    tickers = list(dict.fromkeys(tickers))
+    errors: Dict[str, str] = {}
+    cursors: Dict[str, Optional[datetime]] = {}
+    newest: Dict[str, datetime] = {}
+    counts = {"articles": 0, "mentions": 0, "duplicates": 0}
+
+    stream = dedupe(after_cursor(normalize(fetch_items(tickers, fetch, errors)), cursors))
+    for batch in batched(stream, batch_size):
+        for name, count in news_store.write_articles(batch).items():
+            counts[name] += count
+        search_index.index_news(batch)
+        for ticker_symbol, article in batch:
+            if ticker_symbol not in newest or article["published_at"] > newest[ticker_symbol]:
+                newest[ticker_symbol] = article["published_at"]
+
+    for ticker_symbol in tickers:
+        if ticker_symbol not in errors:
+            news_store.advance_cursor(ticker_symbol, newest.get(ticker_symbol))
+    return {**counts, "errors": errors}
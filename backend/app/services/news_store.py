@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, select, tuple_
+
+from app.db.models import NewsArticle, NewsCursor, NewsMention
+from app.db.session import SessionLocal, init_db, utcnow
+
+
+def write_articles(items: Sequence[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+    """
+    Writes a batch of (ticker, article) pairs. An article already stored
+    under the same URL or title hash is not stored again; only its link to
+    the ticker is added if missing.
+
+    :return: Counts of new articles, new ticker mentions and articles that
+             were already stored.
+    """
+    init_db()
+    counts = {"articles": 0, "mentions": 0, "duplicates": 0}
+    if not items:
+        return counts
+    now = utcnow()
+    url_hashes = {article["url_hash"] for _, article in items}
+    content_hashes = {article["content_hash"] for _, article in items}
+
+    with SessionLocal() as session, session.begin():
+        by_url, by_content = {}, {}
+        for row in session.scalars(select(NewsArticle).where(or_(
+            NewsArticle.url_hash.in_(url_hashes), NewsArticle.content_hash.in_(content_hashes),
+        ))):
+            by_url[row.url_hash] = by_content[row.content_hash] = row
+
+        resolved: List[Tuple[str, NewsArticle]] = []
+        for ticker_symbol, article in items:
+            row = by_url.get(article["url_hash"]) or by_content.get(article["content_hash"])
+            if row is None:
+                row = NewsArticle(**article, ingested_at=now)
+                session.add(row)
+                by_url[row.url_hash] = by_content[row.content_hash] = row
+                counts["articles"] += 1
+            else:
+                counts["duplicates"] += 1
+            resolved.append((ticker_symbol, row))
+        session.flush()
+
+        pairs = {(ticker_symbol, row.id): row for ticker_symbol, row in resolved}
+        linked = set(session.execute(
+            select(NewsMention.ticker, NewsMention.article_id)
+            .where(tuple_(NewsMention.ticker, NewsMention.article_id).in_(list(pairs)))
+        ).all())
+        for (ticker_symbol, article_id), row in pairs.items():
+            if (ticker_symbol, article_id) not in linked:
+                session.add(NewsMention(ticker=ticker_symbol, article_id=article_id, published_at=row.published_at))
+                counts["mentions"] += 1
+
+    return counts
+
+
+# --- Cursors ---
+def read_cursor(ticker_symbol: str) -> Optional[datetime]:
+    """The newest publication time ingested for a ticker, or None if it has never been polled."""
+    init_db()
+    with SessionLocal() as session:
+        cursor = session.get(NewsCursor, ticker_symbol)
+        return cursor.latest_published_at if cursor else None
+
+
+def advance_cursor(ticker_symbol: str, latest_published_at: Optional[datetime]):
+    """Records a poll of a ticker's feed, moving its cursor forward (never back)."""
+    init_db()
+    with SessionLocal() as session, session.begin():
+        cursor = session.get(NewsCursor, ticker_symbol)
+        if cursor is None:
+            session.add(NewsCursor(ticker=ticker_symbol, latest_published_at=latest_published_at, polled_at=utcnow()))
+            return
+        if latest_published_at is not None and (
+            cursor.latest_published_at is None or latest_published_at > cursor.latest_published_at
+        ):
+            cursor.latest_published_at = latest_published_at
+        cursor.polled_at = utcnow()
+
+
+def is_stale(ticker_symbol: str, max_age_seconds: float) -> bool:
+    init_db()
+    with SessionLocal() as session:
+        cursor = session.get(NewsCursor, ticker_symbol)
+        return cursor is None or utcnow() - cursor.polled_at > timedelta(seconds=max_age_seconds)
+
+
+# --- Reads ---
+def latest_news(ticker_symbol: str, limit: int) -> List[Dict[str, Any]]:
+    """A ticker's `limit` most recent stored articles, newest first."""
+    init_db()
+    with SessionLocal() as session:
+        rows = session.scalars(
+            select(NewsArticle)
+            .join(NewsMention, NewsMention.article_id == NewsArticle.id)
+            .where(NewsMention.ticker == ticker_symbol)
+            .order_by(NewsMention.published_at.desc())
+            .limit(limit)
+        ).all()
+    return [
+        {
+            "title": row.title,
+            "publisher": row.publisher,
+            "published_at": row.published_at.isoformat() + "Z",
+            "url": row.url,
+            "summary": row.summary,
+        }
+        for row in rows
+    ]
@@ -1,18 +1,25 @@
-from openai import OpenAI
+import asyncio
+import copy
 import json
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 
 # Local imports
-from app.services import scraper
+from app.core import config
+from app.services import comparison, ratios, risk, scraper, valuation
+from app.services.executor import run_blocking
+from app.services.intent_router import intent_router
+from app.services.llm_cache import llm_response_cache, normalize_query
+from app.services.metrics import record_tokens, span
+from app.services.search_index import search_documents
+from app.services.transport import async_openai_client
 from dotenv import load_dotenv
-import os
 
 
 load_dotenv()
-# Initialize the OpenAI client
+# Initialize the OpenAI client on the shared, pooled HTTP transport
 # It will automatically look for the OPENAI_API_KEY environment variable
 try:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = async_openai_client()
 except Exception as e:
     print(f"Warning: OpenAI client could not be initialized. {e}")
     client = None
@@ -25,7 +32,15 @@ tool_map = {
     "get_financial_statement": scraper.get_financial_statement,
     "get_company_profile": scraper.get_company_profile,
     "get_latest_news": scraper.get_latest_news,
-    "compare_two_companies_financial_statement": scraper.compare_two_companies_financial_statement
+    "compare_two_companies_financial_statement": comparison.compare_two_companies_financial_statement,
+    "compare_peer_financial_statements": comparison.compare_peer_financial_statements,
+    "get_financial_ratios": ratios.get_financial_ratios,
+    "compare_with_industry_peers": ratios.compare_with_industry_peers,
+    "calculate_risk_metrics": risk.calculate_risk_metrics,
+    "get_historical_performance": risk.get_historical_performance,
+    "calculate_dcf_valuation": valuation.calculate_dcf_valuation,
+    "estimate_fair_value": valuation.estimate_fair_value,
+    "search_documents": search_documents,
 }
 
 # This is the JSON schema for the tools that we will send to the LLM.
@@ -113,13 +128,17 @@ tools_schema = [
         "type": "function",
         "function": {
             "name": "get_latest_news",
-            "description": "Fetches the latest news articles for a given company.",
+            "description": "Fetches the latest news articles for a given company, newest first.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "ticker_symbol": {
                         "type": "string",
                         "description": "The stock ticker symbol, e.g., 'RELIANCE.NS'."
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of articles to return. Default: 10."
                     }
                 },
                 "required": ["ticker_symbol"],
@@ -156,16 +175,235 @@ tools_schema = [
             "required": ["ticker_symbol_1", "ticker_symbol_2"],
         },
     }
-}
+},
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_peer_financial_statements",
+            "description": "Compares the financial statements of three or more companies at once (e.g. 'HDFC vs ICICI vs Kotak'): latest values, growth, rank and peer median of key line items, with an LLM-written analysis.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbols": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The ticker symbols of the companies to compare, e.g., ['HDFCBANK.NS', 'ICICIBANK.NS', 'KOTAKBANK.NS']."
+                    },
+                    "statement_type": {
+                        "type": "string",
+                        "enum": ["income", "balance", "cashflow"],
+                        "description": "The type of financial statement to compare."
+                    },
+                    "frequency": {
+                        "type": "string",
+                        "enum": ["annual", "quarterly"],
+                        "description": "The frequency of the report. Defaults to 'annual'."
+                    }
+                },
+                "required": ["ticker_symbols", "statement_type"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_financial_ratios",
+            "description": "Calculates key financial ratios for a company (ROE, ROA, debt-to-equity, current ratio, gross/operating/net margins, interest coverage, EPS and EPS growth, P/E, P/B, price-to-sales) from its financial statements.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbol": {
+                        "type": "string",
+                        "description": "The stock ticker symbol, e.g., 'RELIANCE.NS'."
+                    },
+                    "frequency": {
+                        "type": "string",
+                        "enum": ["annual", "quarterly"],
+                        "description": "The frequency of the statements used. Defaults to 'annual'."
+                    }
+                },
+                "required": ["ticker_symbol"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_with_industry_peers",
+            "description": "Compares the key financial and valuation ratios (P/E, ROE, debt-to-equity, margins, growth, etc.) of several companies side by side, with the peer median for each ratio.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbols": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The ticker symbols of the companies to compare, e.g., ['HDFCBANK.NS', 'ICICIBANK.NS', 'KOTAKBANK.NS']."
+                    },
+                    "frequency": {
+                        "type": "string",
+                        "enum": ["annual", "quarterly"],
+                        "description": "The frequency of the statements used. Defaults to 'annual'."
+                    }
+                },
+                "required": ["ticker_symbols"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "calculate_risk_metrics",
+            "description": "Calculates annualized return, volatility, Sharpe ratio, beta against the NIFTY 50 and maximum drawdown for one or more companies from their daily price history.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbols": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The ticker symbols, e.g., ['RELIANCE.NS'] or ['HDFCBANK.NS', 'ICICIBANK.NS']."
+                    },
+                    "period_years": {
+                        "type": "number",
+                        "description": "Lookback period in years. Defaults to 3."
+                    }
+                },
+                "required": ["ticker_symbols"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_historical_performance",
+            "description": "Fetches trailing 1, 5 and 10-year returns for one or more companies, with the average, worst and best rolling returns over each horizon.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbols": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The ticker symbols, e.g., ['RELIANCE.NS'] or ['TCS.NS', 'INFY.NS']."
+                    }
+                },
+                "required": ["ticker_symbols"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "calculate_dcf_valuation",
+            "description": "Performs a Discounted Cash Flow (DCF) valuation from a company's free cash flow history: a base-case fair value per share, a sensitivity grid over discount and growth rates, and a Monte Carlo fair-value distribution with the probability that the stock is undervalued.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbol": {
+                        "type": "string",
+                        "description": "The stock ticker symbol, e.g., 'RELIANCE.NS'."
+                    },
+                    "discount_rate": {
+                        "type": "number",
+                        "description": "Annual discount rate as a fraction, e.g. 0.12. Only if the user gives one."
+                    },
+                    "growth_rate": {
+                        "type": "number",
+                        "description": "Free cash flow growth over the next 5 years as a fraction, e.g. 0.10. Only if the user gives one; defaults to historical growth."
+                    },
+                    "terminal_growth": {
+                        "type": "number",
+                        "description": "Long-run growth after 5 years as a fraction, e.g. 0.04. Only if the user gives one."
+                    }
+                },
+                "required": ["ticker_symbol"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "estimate_fair_value",
+            "description": "Estimates a stock's fair value from several models (DCF, and peer P/E and P/B multiples when peers are given) and compares it with the current price.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticker_symbol": {
+                        "type": "string",
+                        "description": "The stock ticker symbol, e.g., 'RELIANCE.NS'."
+                    },
+                    "peer_tickers": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional peer ticker symbols for the multiples models, e.g., ['IOC.NS', 'BPCL.NS']."
+                    }
+                },
+                "required": ["ticker_symbol"],
+            },
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_documents",
+            "description": "Searches company profiles and news articles by keywords or quoted phrases, e.g. to find which companies mention a product, technology or event. Returns ranked matches with snippets and the companies they are about.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Keywords or quoted phrases, e.g., 'green hydrogen'."
+                    },
+                    "kind": {
+                        "type": "string",
+                        "enum": ["profile", "news"],
+                        "description": "Search only company profiles or only news. Default: both."
+                    },
+                    "ticker_symbol": {
+                        "type": "string",
+                        "description": "Only documents about this company, e.g., 'RELIANCE.NS'."
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of results. Default: 10."
+                    }
+                },
+                "required": ["query"],
+            },
+        }
+    }
 ]
 
 
 # --- Step 2: The Decider (Orchestrator) ---
-def decide_on_tool(query: str) -> List[Dict[str, Any]]:
+# Decisions being fetched from the LLM, by normalized query. Concurrent misses
+# for the same query await the first one's call instead of making their own.
+_decisions_in_flight: Dict[str, "asyncio.Task"] = {}
+decision_stats = {"llm_calls": 0, "coalesced": 0}
+
+
+async def decide_on_tool(query: str) -> List[Dict[str, Any]]:
     """
     Takes a user query, sends it to the LLM with a list of available tools,
     and returns the tool(s) the LLM decides to call.
     """
+    if config.LLM_CACHE_ENABLED:
+        cached = llm_response_cache.get_decision(query)
+        if cached is not None:
+            return cached
+
+    key = normalize_query(query)
+    in_flight = _decisions_in_flight.get(key)
+    if in_flight is None:
+        in_flight = asyncio.ensure_future(_ask_llm_for_tools(query))
+        _decisions_in_flight[key] = in_flight
+        in_flight.add_done_callback(lambda _: _decisions_in_flight.pop(key, None))
+    else:
+        decision_stats["coalesced"] += 1
+    # Shielded, so a caller that is cancelled does not cancel the shared call.
+    return copy.deepcopy(await asyncio.shield(in_flight))
+
+
+async def _ask_llm_for_tools(query: str) -> List[Dict[str, Any]]:
+    """The LLM round-trip behind `decide_on_tool`; caches what it decides."""
     if not client:
         return [{"error": "OpenAI client not configured. Please set the OPENAI_API_KEY."}]
 
@@ -176,20 +414,30 @@ def decide_on_tool(query: str) -> List[Dict[str, Any]]:
     If the user asks about an Indian company, ensure the ticker symbol ends with '.NS'.
     If the user query involves comparing two companies, always call the 
     `compare_two_companies_financial_statement` tool, not individual fetch tools.
+    If it compares the statements of three or more companies, call
+    `compare_peer_financial_statements` once with all of them.
+    If the user asks for the same data about several companies, call the tool once
+    per company; the calls are executed in parallel.
+    If the user asks which companies or news mention a topic, call `search_documents`.
+    If the user asks what a stock is worth or whether it is under- or overvalued, call
+    `estimate_fair_value`; for a DCF or what-if discount/growth rates, call `calculate_dcf_valuation`.
 
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o", # Or any model that supports tool calling
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query}
-            ],
-            tools=tools_schema,
-            tool_choice="auto",  # Let the model decide whether to call a tool
-        )
-        
+        decision_stats["llm_calls"] += 1
+        with span("llm_decision"):
+            response = await client.chat.completions.create(
+                model="gpt-4o", # Or any model that supports tool calling
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": query}
+                ],
+                tools=tools_schema,
+                tool_choice="auto",  # Let the model decide whether to call a tool
+            )
+        record_tokens("gpt-4o", "tool_selection", response.usage)
+
         tool_calls = response.choices[0].message.tool_calls
         if tool_calls:
             # Manually construct a list of dictionaries from the tool_call objects
@@ -204,21 +452,40 @@ def decide_on_tool(query: str) -> List[Dict[str, Any]]:
                         "arguments": call.function.arguments
                     }
                 })
-            return parsed_tool_calls
         else:
             # The LLM decided not to call any tool. It might be a general question.
             # For now, we'll handle this as "no action taken".
-            return []
+            parsed_tool_calls = []
+
+        if config.LLM_CACHE_ENABLED:
+            llm_response_cache.put_decision(query, parsed_tool_calls)
+        return parsed_tool_calls
 
     except Exception as e:
         return [{"error": f"An error occurred with the OpenAI API: {e}"}]
 
 
+async def route_query(query: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Picks the tool call(s) for a query. Simple, high-confidence queries are
+    resolved locally by the intent router with no LLM round-trip; everything
+    else goes to `decide_on_tool`.
+
+    :return: (path, tool_calls) where path is 'fast_path' or 'llm'.
+    """
+    if config.FAST_PATH_ENABLED:
+        with span("intent_router"):
+            tool_calls = intent_router.route(query)
+        if tool_calls is not None:
+            return "fast_path", tool_calls
+    return "llm", await decide_on_tool(query)
+
+
 # --- Step 3: The Executor ---
-def execute_tool_call(tool_call: Dict[str, Any]) -> Any:
+async def execute_tool_call(tool_call: Dict[str, Any]) -> Any:
     """
     Takes a single tool call object from the LLM's response and executes
-    the corresponding Python function.
+    the corresponding Python function on the upstream executor.
     """
     function_name = tool_call['function']['name']
     function_to_call = tool_map.get(function_name)
@@ -227,16 +494,149 @@ def execute_tool_call(tool_call: Dict[str, Any]) -> Any:
         return f"Error: Tool '{function_name}' not found."
 
     try:
-        function_args = json.loads(tool_call['function']['arguments'])
+        with span("tool_args", function_name):
+            function_args = json.loads(tool_call['function']['arguments'])
         
         # Security check: Ensure the arguments are what we expect
         # For now, we assume the LLM is trusted. In a production system,
         # you would add validation here (e.g., using Pydantic).
         
-        result = function_to_call(**function_args)
+        with span("tool", function_name):
+            result = await run_blocking(function_to_call, **function_args)
         return result
     except json.JSONDecodeError:
         return "Error: Invalid arguments format from LLM."
+    except asyncio.TimeoutError:
+        return f"Error: Tool '{function_name}' timed out."
     except Exception as e:
         return f"Error executing function '{function_name}': {e}"
 
+
+def _is_error_result(result: Any) -> bool:
+    """
+    Tools report failures as an "Error: ..." string, an {"error": ...} dict,
+    or a list whose first item is an {"error": ...} dict.
+    """
+    if isinstance(result, str):
+        return result.startswith("Error")
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        return "error" in result[0]
+    return False
+
+
+def _result_entry(tool_call: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    return {
+        "id": tool_call.get("id"),
+        "name": tool_call["function"]["name"],
+        "arguments": tool_call["function"]["arguments"],
+        "status": "error" if _is_error_result(result) else "ok",
+        "result": result,
+    }
+
+
+async def execute_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Executes every tool call from the LLM's response concurrently, with at most
+    TOOL_CALL_MAX_CONCURRENCY running at once, and returns one entry per call
+    in the model's order. A failing call does not affect the others; its entry
+    carries the error under "result" and is marked with status "error".
+    """
+    semaphore = asyncio.Semaphore(config.TOOL_CALL_MAX_CONCURRENCY)
+
+    async def run(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            result = await execute_tool_call(tool_call)
+        return _result_entry(tool_call, result)
+
+    return list(await asyncio.gather(*(run(tool_call) for tool_call in tool_calls)))
+
+
+# --- Step 4: Streaming ---
+# Tools that end in an LLM call, mapped to the function that prepares that
+# call. When streaming, the completion is run here token by token instead of
+# inside the tool.
+streaming_tool_map = {
+    "compare_two_companies_financial_statement": comparison.prepare_comparison,
+    "compare_peer_financial_statements": comparison.prepare_peer_comparison,
+}
+
+
+async def _stream_llm_tool(tool_call: Dict[str, Any], emit) -> Any:
+    """
+    Runs a streaming tool: prepares it on the upstream executor, then streams
+    the completion, emitting a "comparison_delta" event for each chunk.
+    """
+    function_name = tool_call["function"]["name"]
+    try:
+        with span("tool_args", function_name):
+            function_args = json.loads(tool_call["function"]["arguments"])
+        with span("tool", function_name):
+            prepared = await run_blocking(streaming_tool_map[function_name], **function_args)
+    except json.JSONDecodeError:
+        return "Error: Invalid arguments format from LLM."
+    except asyncio.TimeoutError:
+        return f"Error: Tool '{function_name}' timed out."
+    except Exception as e:
+        return f"Error executing function '{function_name}': {e}"
+
+    if "error" in prepared:
+        return prepared
+    if "cached" in prepared:
+        return prepared["cached"]
+    if not client:
+        return {"error": "OpenAI client not configured. Please set the OPENAI_API_KEY."}
+
+    try:
+        with span("llm_comparison"):
+            stream = await client.chat.completions.create(
+                model=comparison.COMPARISON_MODEL,
+                messages=comparison.comparison_messages(prepared),
+                stream=True,
+                # The last chunk then carries the token usage of the whole completion.
+                stream_options={"include_usage": True},
+            )
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    await emit({"event": "comparison_delta", "data": {"id": tool_call.get("id"), "delta": delta}})
+                if getattr(chunk, "usage", None):
+                    record_tokens(comparison.COMPARISON_MODEL, "comparison", chunk.usage)
+    except Exception as e:
+        return {"error": f"LLM comparison failed: {e}"}
+    return comparison.finish_comparison(prepared, "".join(parts))
+
+
+async def stream_tool_calls(tool_calls: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Executes the tool calls like `execute_tool_calls`, but yields events as
+    they happen instead of waiting for all of them: a "tool_result" event per
+    call in completion order, and "comparison_delta" events while a
+    comparison is being written. Every event is {"event": name, "data": ...}.
+    """
+    semaphore = asyncio.Semaphore(config.TOOL_CALL_MAX_CONCURRENCY)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run(tool_call: Dict[str, Any]):
+        async with semaphore:
+            if tool_call["function"]["name"] in streaming_tool_map:
+                result = await _stream_llm_tool(tool_call, queue.put)
+            else:
+                result = await execute_tool_call(tool_call)
+        await queue.put({"event": "tool_result", "data": _result_entry(tool_call, result)})
+
+    tasks = [asyncio.create_task(run(tool_call)) for tool_call in tool_calls]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            event = await queue.get()
+            if event["event"] == "tool_result":
+                remaining -= 1
+            yield event
+    finally:
+        # The client may disconnect mid-stream; stop whatever is still running.
+        for task in tasks:
+            task.cancel()
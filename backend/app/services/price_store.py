@@ -0,0 +1,201 @@
+import json
+import os
+import shutil
+import threading
+from functools import reduce
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core import config
+
+# Column files kept per ticker, each a flat little-endian array with one
+# value per trading day. Dates are int64 days since the epoch.
+DATE_FIELD = "date"
+FIELDS = ("open", "high", "low", "close", "adj_close", "volume")
+_DTYPES = {DATE_FIELD: np.dtype("<i8"), **{field: np.dtype("<f8") for field in FIELDS}}
+
+
+def to_day(value) -> np.datetime64:
+    """Parses a date ('2024-01-31', datetime, datetime64) into a datetime64[D]."""
+    return np.datetime64(value, "D")
+
+
+class PriceSeries:
+    """
+    A date range of one ticker's daily OHLCV bars. `dates` is datetime64[D]
+    in ascending order; every column in `columns` is aligned with it. Arrays
+    read from the store are in-memory copies of just that range.
+    """
+    __slots__ = ("ticker", "dates", "columns")
+
+    def __init__(self, ticker: str, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.ticker = ticker
+        self.dates = dates
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def to_json(self) -> str:
+        """Columnar JSON ({"ticker", "dates", <field>: [...]}) with null for missing values."""
+        parts = [
+            f'"ticker": {json.dumps(self.ticker)}',
+            f'"dates": {json.dumps(np.datetime_as_string(self.dates, unit="D").tolist())}',
+        ]
+        for field, values in self.columns.items():
+            parts.append(f'"{field}": {json.dumps(np.asarray(values).tolist()).replace("NaN", "null")}')
+        return "{" + ", ".join(parts) + "}"
+
+
+class PriceStore:
+    """
+    Append-only daily OHLCV history on disk, one directory per ticker with one
+    binary file per column. A date-range query is two binary searches over the
+    date column, then one positioned read of that range from each requested
+    column file; nothing outside it is read or parsed, and no file stays open
+    after the read (so reading thousands of tickers holds no descriptors).
+
+    Appends only ever add days after the last stored one. A crash between
+    column writes leaves files of different lengths; readers use the shortest
+    and the next append truncates the others back to it.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._ticker_locks: Dict[str, threading.Lock] = {}
+
+    # --- Files ---
+    def _directory(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker.upper())
+
+    def _path(self, ticker: str, field: str) -> str:
+        return os.path.join(self._directory(ticker), f"{field}.bin")
+
+    def _rows(self, ticker: str) -> int:
+        sizes = []
+        for field, dtype in _DTYPES.items():
+            path = self._path(ticker, field)
+            sizes.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(sizes)
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._lock:
+            return self._ticker_locks.setdefault(ticker.upper(), threading.Lock())
+
+    def _read_column(self, ticker: str, field: str, start: int, stop: int) -> np.ndarray:
+        """Rows [start, stop) of one column file, read with a single positioned read."""
+        dtype = _DTYPES[field]
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+        return np.fromfile(self._path(ticker, field), dtype=dtype, count=stop - start, offset=start * dtype.itemsize)
+
+    # --- Reads ---
+    def tickers(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if not name.startswith("."))
+
+    def last_date(self, ticker: str) -> Optional[np.datetime64]:
+        rows = self._rows(ticker)
+        return self._read_column(ticker, DATE_FIELD, rows - 1, rows)[0].astype("datetime64[D]") if rows else None
+
+    def read(self, ticker: str, start=None, end=None, fields: Sequence[str] = FIELDS) -> PriceSeries:
+        """
+        Returns the bars with start <= date <= end (either bound optional),
+        located by binary search on the date column.
+        """
+        ticker = ticker.upper()
+        # Held so an append or replace cannot land between the column reads.
+        with self._ticker_lock(ticker):
+            # Readers use the shortest column, so a crash between column
+            # writes never pairs dates with missing values.
+            dates = self._read_column(ticker, DATE_FIELD, 0, self._rows(ticker)).view("datetime64[D]")
+            lo = 0 if start is None else int(np.searchsorted(dates, to_day(start), side="left"))
+            hi = len(dates) if end is None else int(np.searchsorted(dates, to_day(end), side="right"))
+            columns = {field: self._read_column(ticker, field, lo, hi) for field in fields}
+        return PriceSeries(ticker, dates[lo:hi], columns)
+
+    def read_matrix(
+        self,
+        tickers: Sequence[str],
+        field: str = "adj_close",
+        start=None,
+        end=None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lays out one field for several tickers on a shared date axis (the
+        union of their trading days in the range).
+
+        :return: (dates, (tickers x dates) float64 matrix with NaN where a
+                 ticker has no bar)
+        """
+        series = [self.read(ticker, start, end, fields=(field,)) for ticker in tickers]
+        dates = reduce(np.union1d, (s.dates for s in series), np.empty(0, dtype="datetime64[D]"))
+        matrix = np.full((len(series), len(dates)), np.nan)
+        for row, s in enumerate(series):
+            matrix[row, np.searchsorted(dates, s.dates)] = s[field]
+        return dates, matrix
+
+    # --- Writes ---
+    def append(self, ticker: str, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Appends the bars dated after the last stored day; earlier ones are
+        ignored. Missing fields are written as NaN.
+
+        :return: Number of bars appended.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        with self._ticker_lock(ticker):
+            rows = self._rows(ticker)
+            last = self.last_date(ticker)
+            keep = order if last is None else order[dates[order] > last]
+            # Also drop duplicate days within the batch, keeping the first.
+            keep = keep[np.concatenate(([True], np.diff(dates[keep]) > np.timedelta64(0, "D")))] if len(keep) else keep
+            if not len(keep):
+                return 0
+
+            os.makedirs(self._directory(ticker), exist_ok=True)
+            for field, dtype in _DTYPES.items():
+                path = self._path(ticker, field)
+                if os.path.exists(path) and os.path.getsize(path) > rows * dtype.itemsize:
+                    os.truncate(path, rows * dtype.itemsize)
+            for field in FIELDS:
+                values = columns.get(field)
+                values = np.full(len(dates), np.nan) if values is None else np.asarray(values, dtype=np.float64)
+                with open(self._path(ticker, field), "ab") as f:
+                    f.write(values[keep].astype(_DTYPES[field]).tobytes())
+            # The date column is written last, so a partial append never
+            # exposes dates without their values.
+            with open(self._path(ticker, DATE_FIELD), "ab") as f:
+                f.write(dates[keep].astype(np.int64).astype(_DTYPES[DATE_FIELD]).tobytes())
+            return len(keep)
+
+    def replace(self, ticker: str, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Rewrites a ticker's whole history, e.g. after a split or dividend
+        changed the adjusted closes of past days. The new files are staged
+        and swapped in with a rename while holding the ticker's lock, so a
+        read sees either the old history or the new one.
+        """
+        ticker = ticker.upper()
+        staging = PriceStore(os.path.join(self.root, f".staging-{ticker}"))
+        shutil.rmtree(staging._directory(ticker), ignore_errors=True)
+        written = staging.append(ticker, dates, columns)
+        with self._ticker_lock(ticker):
+            directory = self._directory(ticker)
+            retired = os.path.join(self.root, f".retired-{ticker}")
+            shutil.rmtree(retired, ignore_errors=True)
+            if os.path.exists(directory):
+                os.rename(directory, retired)
+            os.rename(staging._directory(ticker), directory)
+            shutil.rmtree(retired, ignore_errors=True)
+            shutil.rmtree(staging.root, ignore_errors=True)
+        return written
+
+
+price_store = PriceStore(config.PRICE_STORE_DIR)
@@ -0,0 +1,213 @@
+import math
+import re
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.services.statement_table import StatementTable, format_number
+
+# Roughly how BPE tokenizers split financial text: words, runs of up to three
+# digits, and individual punctuation marks each cost about one token.
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """A local, dependency-free estimate of the number of LLM tokens in `text`."""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def _format_ratio(value: float) -> str:
+    return "-" if math.isnan(value) else f"{value * 100:+.1f}%"
+
+
+def select_line_items(tables: Sequence[StatementTable], statement_type: str, line_items: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    The configured key line items that at least one company reports, in
+    priority order. If none of them are reported, falls back to the line items
+    with the most values across the companies.
+    """
+    wanted = list(line_items) if line_items is not None else config.PROMPT_LINE_ITEMS.get(statement_type, [])
+    present = [item for item in wanted if any(item in table.line_items for table in tables)]
+    if present:
+        return present
+
+    coverage = {}
+    for table in tables:
+        counts = (~np.isnan(table.values)).sum(axis=1)
+        for item, count in zip(table.line_items, counts):
+            coverage[item] = coverage.get(item, 0) + int(count)
+    ranked = sorted(coverage, key=coverage.get, reverse=True)
+    return ranked[: max(len(wanted), 10)]
+
+
+def align_periods(tables: Sequence[StatementTable], line_items: Sequence[str], max_periods: int) -> np.ndarray:
+    """
+    Aligns the companies by period recency: column 0 is each company's latest
+    period, column 1 the one before, and so on. This lines up fiscal years
+    that end on different dates.
+
+    :return: (companies x line items x periods) array, NaN where missing.
+    """
+    aligned = np.full((len(tables), len(line_items), max_periods), np.nan)
+    for c, table in enumerate(tables):
+        selected = table.select(periods=table.periods[:max_periods])
+        for i, item in enumerate(line_items):
+            if item in selected.line_items:
+                row = selected.line_item(item)
+                aligned[c, i, : len(row)] = row
+    return aligned
+
+
+def _growth(aligned: np.ndarray) -> np.ndarray:
+    """Latest-period growth over the prior period for each company and line item."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (aligned[:, :, 0] - aligned[:, :, 1]) / np.abs(aligned[:, :, 1])
+    growth[~np.isfinite(growth)] = np.nan
+    return growth
+
+
+def render_comparison_table(
+    tables: Sequence[StatementTable],
+    line_items: Sequence[str],
+    max_periods: int,
+) -> str:
+    """
+    Renders a dense pipe-separated table: one row per line item with every
+    company's values for the aligned periods, each company's latest growth
+    and, for two companies, the latest-period difference.
+    """
+    aligned = align_periods(tables, line_items, max_periods)
+    growth = _growth(aligned) if max_periods > 1 else np.full(aligned.shape[:2], np.nan)
+    labels = [f"C{c + 1}" for c in range(len(tables))]
+
+    header = ["item"]
+    header += [f"{label} P{p}" for label in labels for p in range(max_periods)]
+    header += [f"{label} yoy" for label in labels]
+    if len(tables) == 2:
+        header.append("C1-C2 P0")
+    lines = ["|".join(header)]
+
+    for i, item in enumerate(line_items):
+        if np.isnan(aligned[:, i, :]).all():
+            continue
+        row = [item]
+        row += [format_number(value) for c in range(len(tables)) for value in aligned[c, i]]
+        row += [_format_ratio(value) for value in growth[:, i]]
+        if len(tables) == 2:
+            row.append(format_number(aligned[0, i, 0] - aligned[1, i, 0]))
+        lines.append("|".join(row))
+
+    legend = "; ".join(
+        f"{label}={table.ticker} ({', '.join(f'P{p}={period}' for p, period in enumerate(table.periods[:max_periods]))})"
+        for label, table in zip(labels, tables)
+    )
+    return f"Companies: {legend}\n" + "\n".join(lines)
+
+
+def build_comparison_table(
+    tables: Sequence[StatementTable],
+    statement_type: str,
+    line_items: Optional[Sequence[str]] = None,
+    max_periods: int = config.PROMPT_MAX_PERIODS,
+    token_budget: int = config.PROMPT_TOKEN_BUDGET,
+) -> Tuple[str, int]:
+    """
+    Builds the data section of a comparison prompt within `token_budget`
+    estimated tokens. Older periods are dropped first, then the lowest
+    priority line items.
+
+    :return: (table text, estimated tokens)
+    """
+    items = select_line_items(tables, statement_type, line_items)
+    periods = max(1, min(max_periods, max((len(table.periods) for table in tables), default=1)))
+
+    text = render_comparison_table(tables, items, periods)
+    tokens = estimate_tokens(text)
+    while tokens > token_budget and (periods > 2 or len(items) > 1):
+        if periods > 2:
+            periods -= 1
+        else:
+            items = items[:-1]
+        text = render_comparison_table(tables, items, periods)
+        tokens = estimate_tokens(text)
+    return text, tokens
+
+
+# --- Peer comparisons ---
+def peer_matrix(tables: Sequence[StatementTable], line_items: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    The comparison matrix for N companies, computed in one pass over the
+    aligned (companies x line items x periods) array.
+
+    :return: "latest" and "growth" are (companies x line items); "rank" is
+             each company's position per line item (1 = largest, NaN where
+             missing); "median" and "growth_median" are per line item.
+    """
+    aligned = align_periods(tables, line_items, 2)
+    latest = aligned[:, :, 0]
+    growth = _growth(aligned)
+
+    missing = np.isnan(latest)
+    order = np.argsort(np.where(missing, -np.inf, latest), axis=0, kind="stable")[::-1]
+    rank = np.empty_like(latest)
+    rank[order, np.arange(latest.shape[1])] = np.arange(1, latest.shape[0] + 1)[:, None]
+    rank[missing] = np.nan
+
+    with warnings.catch_warnings():
+        # nanmedian warns on line items that no company reports; those stay NaN.
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        median = np.nanmedian(latest, axis=0)
+        growth_median = np.nanmedian(growth, axis=0)
+    return {"latest": latest, "growth": growth, "rank": rank, "median": median, "growth_median": growth_median}
+
+
+def render_peer_table(tables: Sequence[StatementTable], line_items: Sequence[str], matrix: Dict[str, np.ndarray]) -> str:
+    """
+    Renders one row per company (latest period, then each line item's latest
+    value and growth over the prior period) followed by a peer median row.
+    Companies are rows rather than columns so the table stays narrow as the
+    number of peers grows.
+    """
+    header = ["ticker", "P0"] + [f"{item}|yoy" for item in line_items]
+    lines = ["|".join(header)]
+    for c, table in enumerate(tables):
+        row = [table.ticker, table.periods[0] if table.periods else "-"]
+        for i in range(len(line_items)):
+            row += [format_number(matrix["latest"][c, i]), _format_ratio(matrix["growth"][c, i])]
+        lines.append("|".join(row))
+    median = ["median", "-"]
+    for i in range(len(line_items)):
+        median += [format_number(matrix["median"][i]), _format_ratio(matrix["growth_median"][i])]
+    lines.append("|".join(median))
+    return "\n".join(lines)
+
+
+def build_peer_table(
+    tables: Sequence[StatementTable],
+    statement_type: str,
+    line_items: Optional[Sequence[str]] = None,
+    token_budget: int = config.PROMPT_TOKEN_BUDGET,
+) -> Tuple[str, int, List[str], Dict[str, np.ndarray]]:
+    """
+    Builds the data section of an N-company comparison prompt within
+    `token_budget` estimated tokens, dropping the lowest priority line items
+    until it fits.
+
+    :return: (table text, estimated tokens, line items kept, peer matrix)
+    """
+    items = select_line_items(tables, statement_type, line_items)
+    matrix = peer_matrix(tables, items)
+    reported = ~np.isnan(matrix["latest"]).all(axis=0)
+    items = [item for item, keep in zip(items, reported) if keep]
+    matrix = {name: values[..., reported] for name, values in matrix.items()}
+
+    text = render_peer_table(tables, items, matrix)
+    tokens = estimate_tokens(text)
+    while tokens > token_budget and len(items) > 1:
+        items = items[:-1]
+        matrix = {name: values[..., :-1] for name, values in matrix.items()}
+        text = render_peer_table(tables, items, matrix)
+        tokens = estimate_tokens(text)
+    return text, tokens, items, matrix
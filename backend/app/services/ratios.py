@@ -0,0 +1,281 @@
+import warnings
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from app.core import config
+from app.services import scraper
+from app.services.executor import map_blocking
+from app.services.statement_table import StatementTable
+
+
+# --- Ratio inputs ---
+# Each input is read from one statement, using the first line item name that
+# the statement actually reports.
+RATIO_INPUTS = {
+    "revenue": ("income", ("Total Revenue", "Operating Revenue")),
+    "gross_profit": ("income", ("Gross Profit",)),
+    "operating_income": ("income", ("Operating Income", "Total Operating Income As Reported", "EBIT")),
+    "ebit": ("income", ("EBIT", "Operating Income")),
+    "interest_expense": ("income", ("Interest Expense", "Interest Expense Non Operating")),
+    "net_income": ("income", ("Net Income", "Net Income Common Stockholders")),
+    "eps": ("income", ("Diluted EPS", "Basic EPS")),
+    "equity": ("balance", ("Stockholders Equity", "Common Stock Equity")),
+    "total_assets": ("balance", ("Total Assets",)),
+    "total_debt": ("balance", ("Total Debt",)),
+    "cash": ("balance", ("Cash And Cash Equivalents", "Cash Cash Equivalents And Short Term Investments")),
+    "current_assets": ("balance", ("Current Assets",)),
+    "current_liabilities": ("balance", ("Current Liabilities",)),
+    "shares": ("balance", ("Ordinary Shares Number", "Share Issued")),
+    "operating_cash_flow": ("cashflow", ("Operating Cash Flow",)),
+    "capital_expenditure": ("cashflow", ("Capital Expenditure", "Capital Expenditure Reported")),
+    "free_cash_flow": ("cashflow", ("Free Cash Flow",)),
+}
+_INPUT_POSITION = {name: i for i, name in enumerate(RATIO_INPUTS)}
+
+# Ratios computed for every period, and valuation ratios that need the current
+# price and are therefore only computed for the latest period.
+PERIOD_RATIOS = (
+    "roe", "roa", "debt_to_equity", "current_ratio", "gross_margin", "operating_margin",
+    "net_margin", "fcf_margin", "interest_coverage", "book_value_per_share", "eps",
+    "revenue_growth", "eps_growth", "net_income_growth",
+)
+VALUATION_RATIOS = ("pe_ratio", "pb_ratio", "price_to_sales", "earnings_yield")
+FREQUENCIES = ("annual", "quarterly")
+
+# Inputs that accumulate over a period (unlike balance sheet positions). For
+# quarterly statements, ratios that set them against a balance or a price use
+# their trailing-twelve-month sum, so they stay comparable with annual ones.
+_FLOW_INPUTS = (
+    "revenue", "gross_profit", "operating_income", "ebit", "interest_expense", "net_income", "eps",
+    "operating_cash_flow", "capital_expenditure", "free_cash_flow",
+)
+_QUARTERS_PER_YEAR = 4
+
+
+def divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division with NaN wherever the result is not finite."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def _growth(series: np.ndarray) -> np.ndarray:
+    """
+    Period-over-period growth along the last axis. Periods are newest first,
+    so each column is compared with the one after it; the oldest is NaN.
+    """
+    growth = np.full_like(series, np.nan)
+    growth[..., :-1] = divide(series[..., :-1] - series[..., 1:], np.abs(series[..., 1:]))
+    return growth
+
+
+def _trailing_sum(series: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of each period and the `window - 1` before it, along the last axis
+    (periods newest first). NaN where any of them is missing, including the
+    oldest periods, which have too few before them.
+    """
+    total = np.full_like(series, np.nan)
+    periods = series.shape[-1]
+    if periods >= window:
+        total[..., : periods - window + 1] = np.lib.stride_tricks.sliding_window_view(series, window, axis=-1).sum(axis=-1)
+    return total
+
+
+def to_list(values: np.ndarray) -> List[Any]:
+    """NaN-safe conversion of an array to (nested) lists for JSON."""
+    converted = values.astype(object)
+    converted[np.isnan(values)] = None
+    return converted.tolist()
+
+
+def period_grid(statements: Dict[str, StatementTable], max_periods: int) -> List[str]:
+    """The union of the statements' periods, newest first, capped at max_periods."""
+    periods = {period for table in statements.values() for period in table.periods}
+    return sorted(periods, reverse=True)[:max_periods]
+
+
+def build_input_cube(
+    statements_by_ticker: Sequence[Dict[str, StatementTable]],
+    max_periods: int,
+) -> tuple:
+    """
+    Lays out every ratio input for every ticker on a (tickers x inputs x
+    periods) float64 array. Each ticker's periods are aligned by recency
+    (column 0 is its latest period), so companies with different fiscal
+    year-ends can still be compared period by period.
+
+    :return: (cube, per-ticker period labels)
+    """
+    cube = np.full((len(statements_by_ticker), len(RATIO_INPUTS), max_periods), np.nan)
+    labels = []
+    for t, statements in enumerate(statements_by_ticker):
+        grid = period_grid(statements, max_periods)
+        labels.append(grid)
+        aligned = {kind: table.reindex_periods(grid) for kind, table in statements.items()}
+        for name, (kind, candidates) in RATIO_INPUTS.items():
+            table = aligned.get(kind)
+            if table is None:
+                continue
+            for line_item in candidates:
+                if line_item in table.line_items:
+                    cube[t, _INPUT_POSITION[name], : len(grid)] = table.line_item(line_item)
+                    break
+    return cube, labels
+
+
+def input_series(cube: np.ndarray, name: str) -> np.ndarray:
+    """One input from a cube as a (tickers x periods) array."""
+    return cube[:, _INPUT_POSITION[name], :]
+
+
+def free_cash_flow(cube: np.ndarray) -> np.ndarray:
+    """
+    (tickers x periods) free cash flow. Where it is not reported, it is
+    derived from operating cash flow; yfinance reports capital expenditure
+    as a negative number.
+    """
+    reported = input_series(cube, "free_cash_flow")
+    derived = input_series(cube, "operating_cash_flow") + input_series(cube, "capital_expenditure")
+    return np.where(np.isnan(reported), derived, reported)
+
+
+def compute_ratios(cube: np.ndarray, prices: np.ndarray, frequency: str = "annual") -> Dict[str, np.ndarray]:
+    """
+    Computes every ratio for every ticker and period at once.
+
+    :param cube: (tickers x inputs x periods) array from build_input_cube.
+    :param prices: (tickers,) array of current prices, NaN where unknown.
+    :param frequency: The statements' frequency. For 'quarterly', ROE, ROA
+                      and the valuation ratios use trailing-twelve-month
+                      flows; margins, EPS and growth stay per quarter.
+    :return: {ratio: (tickers x periods) array} for PERIOD_RATIOS and
+             {ratio: (tickers,) array} for VALUATION_RATIOS.
+    """
+    x = {name: cube[:, i, :] for name, i in _INPUT_POSITION.items()}
+    # Flows over a year: the statement's own for annual data, TTM sums for quarterly.
+    yearly = dict(x)
+    if frequency == "quarterly":
+        yearly.update({name: _trailing_sum(x[name], _QUARTERS_PER_YEAR) for name in _FLOW_INPUTS})
+
+    ratios = {
+        "roe": divide(yearly["net_income"], x["equity"]),
+        "roa": divide(yearly["net_income"], x["total_assets"]),
+        "debt_to_equity": divide(x["total_debt"], x["equity"]),
+        "current_ratio": divide(x["current_assets"], x["current_liabilities"]),
+        "gross_margin": divide(x["gross_profit"], x["revenue"]),
+        "operating_margin": divide(x["operating_income"], x["revenue"]),
+        "net_margin": divide(x["net_income"], x["revenue"]),
+        "fcf_margin": divide(free_cash_flow(cube), x["revenue"]),
+        "interest_coverage": divide(x["ebit"], np.abs(x["interest_expense"])),
+        "book_value_per_share": divide(x["equity"], x["shares"]),
+        "eps": np.where(np.isnan(x["eps"]), divide(x["net_income"], x["shares"]), x["eps"]),
+        "revenue_growth": _growth(x["revenue"]),
+        "net_income_growth": _growth(x["net_income"]),
+    }
+    ratios["eps_growth"] = _growth(ratios["eps"])
+
+    yearly_eps = np.where(np.isnan(yearly["eps"]), divide(yearly["net_income"], x["shares"]), yearly["eps"])
+    latest_eps = yearly_eps[:, 0]
+    ratios["pe_ratio"] = divide(prices, latest_eps)
+    ratios["pb_ratio"] = divide(prices, ratios["book_value_per_share"][:, 0])
+    ratios["price_to_sales"] = divide(prices * x["shares"][:, 0], yearly["revenue"][:, 0])
+    ratios["earnings_yield"] = divide(latest_eps, prices)
+    return ratios
+
+
+def load_statements(ticker_symbol: str, frequency: str) -> Dict[str, StatementTable]:
+    """A company's income, balance and cash flow statements, keyed by statement type."""
+    return {
+        kind: scraper.get_statement_table(ticker_symbol, kind, frequency)
+        for kind in ("income", "balance", "cashflow")
+    }
+
+
+def current_prices(ticker_symbols: List[str]) -> np.ndarray:
+    """(tickers,) current prices from one batch quote, NaN where unknown."""
+    quotes = scraper.get_batch_stock_price_data(ticker_symbols)
+    return np.array(
+        [np.nan if price is None else price for price in quotes["currentPrice"]], dtype=np.float64
+    )
+
+
+def get_financial_ratios(ticker_symbol: str, frequency: str = "annual") -> Dict[str, Any]:
+    """
+    Calculates key financial ratios (ROE, ROA, D/E, current ratio, margins,
+    interest coverage, EPS and growth, P/E, P/B, P/S) from a company's income
+    statement, balance sheet and cash flow statement.
+
+    :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
+    :param frequency: 'annual' or 'quarterly'. Default: 'annual'.
+    """
+    if frequency not in FREQUENCIES:
+        return {"error": f"Invalid frequency '{frequency}'. Must be 'annual' or 'quarterly'."}
+    try:
+        statements = load_statements(ticker_symbol, frequency)
+        cube, labels = build_input_cube([statements], config.RATIOS_MAX_PERIODS)
+        if not labels[0]:
+            return {"error": f"No financial statements found for ticker '{ticker_symbol}'."}
+        ratios = compute_ratios(cube, current_prices([ticker_symbol]), frequency)
+    except Exception as e:
+        return {"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}
+
+    periods = labels[0]
+    latest = {name: to_list(ratios[name][:, 0])[0] for name in PERIOD_RATIOS}
+    latest.update({name: to_list(ratios[name])[0] for name in VALUATION_RATIOS})
+    return {
+        "ticker": statements["income"].ticker,
+        "frequency": frequency,
+        "periods": periods,
+        "ratios": latest,
+        "history": {name: to_list(ratios[name][0, : len(periods)]) for name in PERIOD_RATIOS},
+    }
+
+
+def compare_with_industry_peers(ticker_symbols: List[str], frequency: str = "annual") -> Dict[str, Any]:
+    """
+    Computes the latest-period ratios for a set of peer companies in one
+    vectorized pass and returns them column-wise, with the peer median of
+    each ratio for benchmarking.
+
+    :param ticker_symbols: Peer ticker symbols (e.g., ['HDFCBANK.NS', 'ICICIBANK.NS']).
+    :param frequency: 'annual' or 'quarterly'. Default: 'annual'.
+    """
+    if frequency not in FREQUENCIES:
+        return {"error": f"Invalid frequency '{frequency}'. Must be 'annual' or 'quarterly'."}
+    ticker_symbols = list(dict.fromkeys(ticker_symbols))
+    if len(ticker_symbols) > config.RATIOS_PEER_MAX_TICKERS:
+        return {"error": f"At most {config.RATIOS_PEER_MAX_TICKERS} companies can be compared at once."}
+    statements_by_ticker = []
+    tickers = []
+    errors = {}
+    outcomes = map_blocking(lambda ticker_symbol: load_statements(ticker_symbol, frequency), ticker_symbols)
+    for ticker_symbol, (statements, error) in zip(ticker_symbols, outcomes):
+        if error is not None:
+            errors[ticker_symbol] = str(error)
+            continue
+        statements_by_ticker.append(statements)
+        tickers.append(statements["income"].ticker)
+    if not tickers:
+        return {"error": "Could not load statements for any of the requested tickers.", "details": errors}
+
+    cube, labels = build_input_cube(statements_by_ticker, config.RATIOS_MAX_PERIODS)
+    ratios = compute_ratios(cube, current_prices(tickers), frequency)
+
+    latest = {name: ratios[name][:, 0] for name in PERIOD_RATIOS}
+    latest.update({name: ratios[name] for name in VALUATION_RATIOS})
+    with warnings.catch_warnings():
+        # nanmedian warns on ratios that no peer reports; those stay NaN.
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        medians = {name: np.nanmedian(values) for name, values in latest.items()}
+
+    return {
+        "frequency": frequency,
+        "ticker": tickers,
+        "latest_period": [grid[0] if grid else None for grid in labels],
+        "ratios": {name: to_list(values) for name, values in latest.items()},
+        "peer_median": {name: None if np.isnan(value) else float(value) for name, value in medians.items()},
+        "errors": errors,
+    }
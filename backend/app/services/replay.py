@@ -0,0 +1,422 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from openai import DefaultHttpxClient
+
+from app.core import config
+
+# The httpx the OpenAI SDK sends requests with (httpx itself, or the httpx2
+# fork later SDKs are built on); replayed responses must be of its types.
+sdk_httpx = importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.partition(".")[0])
+
+UPSTREAM_MODES = ("live", "record", "replay")
+
+# yfinance Ticker properties saved and served one fixture file each. Price
+# history is a method (`history`) and is kept as one growing fixture.
+TICKER_FIXTURES = (
+    "info", "news",
+    "income_stmt", "quarterly_income_stmt", "balance_sheet",
+    "quarterly_balance_sheet", "cashflow", "quarterly_cashflow",
+)
+
+# Statuses not worth saving: replaying a throttled or failed call would
+# only reproduce the outage.
+_UNRECORDED_STATUSES = {429, 500, 502, 503, 504}
+_PERIOD = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+class ReplayMiss(LookupError):
+    """No fixture was recorded for an upstream call being replayed."""
+
+
+def injected_delay(milliseconds: float) -> float:
+    """Seconds to wait for a replayed call, varied by REPLAY_LATENCY_JITTER."""
+    jitter = config.REPLAY_LATENCY_JITTER
+    return max(0.0, milliseconds * (1 + random.uniform(-jitter, jitter))) / 1000
+
+
+# --- Fixture encoding ---
+# DataFrames (statements, price history) are stored as labelled value
+# matrices; everything else yfinance returns is already JSON.
+def _encode_labels(index: pd.Index) -> Dict[str, Any]:
+    if isinstance(index, pd.MultiIndex):
+        return {"kind": "tuple", "labels": [[str(level) for level in label] for label in index]}
+    if isinstance(index, pd.DatetimeIndex):
+        # Offsets alone would lose the zone name (Asia/Kolkata, not +05:30).
+        return {"kind": "datetime", "labels": [timestamp.isoformat() for timestamp in index],
+                "tz": str(index.tz) if index.tz is not None else None}
+    return {"kind": "str", "labels": [str(label) for label in index]}
+
+
+def _decode_labels(encoded: Dict[str, Any]) -> pd.Index:
+    if encoded["kind"] == "tuple":
+        return pd.MultiIndex.from_tuples([tuple(label) for label in encoded["labels"]])
+    if encoded["kind"] == "datetime":
+        if encoded.get("tz"):
+            return pd.DatetimeIndex(pd.to_datetime(encoded["labels"], utc=True)).tz_convert(encoded["tz"])
+        return pd.DatetimeIndex(pd.to_datetime(encoded["labels"]))
+    return pd.Index(encoded["labels"])
+
+
+def encode_value(value: Any) -> Any:
+    if not isinstance(value, pd.DataFrame):
+        return value
+    values = value.to_numpy(dtype=np.float64, na_value=np.nan)
+    return {
+        "__frame__": True,
+        "index": _encode_labels(value.index),
+        "columns": _encode_labels(value.columns),
+        "values": np.where(np.isnan(values), None, values).tolist(),
+    }
+
+
+def decode_value(value: Any) -> Any:
+    if not (isinstance(value, dict) and value.get("__frame__")):
+        return value
+    index, columns = _decode_labels(value["index"]), _decode_labels(value["columns"])
+    return pd.DataFrame(
+        np.array(value["values"], dtype=np.float64).reshape(len(index), len(columns)), index=index, columns=columns,
+    )
+
+
+def select_period(frame: pd.DataFrame, period: Optional[str] = None, start=None, end=None) -> pd.DataFrame:
+    """Applies yfinance's history arguments to a recorded daily history: `start` (inclusive), `end` (exclusive) or `period`."""
+    index = frame.index
+
+    def timestamp(value) -> pd.Timestamp:
+        value = pd.Timestamp(value)
+        if index.tz is not None and value.tz is None:
+            return value.tz_localize(index.tz)
+        return value
+
+    if start is not None or end is not None:
+        keep = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            keep &= index >= timestamp(start)
+        if end is not None:
+            keep &= index < timestamp(end)
+        return frame[keep]
+    match = _PERIOD.match(period or "max")
+    if match is None or not len(frame):
+        return frame
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return frame.iloc[-count:]
+    offset = {"wk": pd.DateOffset(weeks=count), "mo": pd.DateOffset(months=count), "y": pd.DateOffset(years=count)}[unit]
+    return frame[index > index[-1] - offset]
+
+
+def fixture_key(path: str, model: Optional[str], stream: bool, tools: bool, message: Any) -> str:
+    material = json.dumps(
+        {"path": path, "model": model, "stream": stream, "tools": tools, "message": message}, sort_keys=True
+    )
+    return hashlib.sha256(material.encode()).hexdigest()[:24]
+
+
+def request_key(request: "sdk_httpx.Request") -> str:
+    """
+    The fixture key of an OpenAI request: its path, model, streaming flag,
+    whether tools were offered, and the last message. The system prompt and
+    tool schemas are left out, so recorded fixtures survive prompt edits.
+    """
+    try:
+        body = json.loads(request.content or b"{}")
+    except ValueError:
+        body = {}
+    messages = body.get("messages") or [{}]
+    return fixture_key(
+        request.url.path, body.get("model"), bool(body.get("stream")), bool(body.get("tools")),
+        messages[-1].get("content"),
+    )
+
+
+# --- Fixture store ---
+class FixtureStore:
+    """
+    Upstream responses on disk, one JSON file per fixture:
+    <directory>/yfinance/<TICKER>/<property>.json and
+    <directory>/openai/<key>.json. Also counts the calls it serves, so a
+    benchmark or test can tell how many upstream calls a request made.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._parsed: Dict[str, Any] = {}
+        self._counters: Dict[str, int] = {}
+
+    def count(self, name: str):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
+
+    def _read(self, *parts: str) -> Any:
+        path = os.path.join(self.directory, *parts)
+        with self._lock:
+            if path in self._parsed:
+                return self._parsed[path]
+        try:
+            with open(path, encoding="utf-8") as f:
+                parsed = json.load(f)
+        except FileNotFoundError:
+            raise ReplayMiss(f"No fixture {os.path.join(*parts)} in {self.directory}.") from None
+        with self._lock:
+            self._parsed[path] = parsed
+        return parsed
+
+    def _write(self, value: Any, *parts: str):
+        path = os.path.join(self.directory, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(value, f, default=str)
+        os.replace(temporary, path)
+        with self._lock:
+            self._parsed[path] = value
+
+    # --- yfinance ---
+    def load(self, ticker_symbol: str, name: str) -> Any:
+        try:
+            return decode_value(self._read("yfinance", ticker_symbol, f"{name}.json"))
+        except ReplayMiss:
+            self.count("misses")
+            raise
+
+    def save(self, ticker_symbol: str, name: str, value: Any):
+        self._write(encode_value(value), "yfinance", ticker_symbol, f"{name}.json")
+
+    def save_history(self, ticker_symbol: str, frame: pd.DataFrame):
+        """Merges downloaded bars into the recorded history, so top-up downloads extend it."""
+        try:
+            recorded = decode_value(self._read("yfinance", ticker_symbol, "history.json"))
+        except ReplayMiss:
+            recorded = None
+        if recorded is not None and len(recorded) and len(frame):
+            if recorded.index.tz is not None and frame.index.tz is not None:
+                recorded.index = recorded.index.tz_convert(frame.index.tz)
+            frame = pd.concat([recorded, frame])
+            frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        self.save(ticker_symbol, "history", frame)
+
+    # --- OpenAI ---
+    def response(self, request: "sdk_httpx.Request") -> "sdk_httpx.Response":
+        """
+        The recorded response to an OpenAI request. Requests with no fixture
+        of their own get the directory's default response if it has one
+        (default.json, or default-stream.json for streamed requests), for
+        fixture sets whose prompts depend on data; otherwise a 404.
+        """
+        key = request_key(request)
+        stream = b'"stream":true' in (request.content or b"").replace(b" ", b"")
+        self.count("openai.stream" if stream else "openai.completion")
+        try:
+            fixture = self._read("openai", f"{key}.json")
+        except ReplayMiss:
+            try:
+                fixture = self._read("openai", "default-stream.json" if stream else "default.json")
+            except ReplayMiss:
+                self.count("misses")
+                message = f"No replay fixture for {request.url.path} ({key})."
+                return sdk_httpx.Response(404, json={"error": {"message": message}}, request=request)
+        return sdk_httpx.Response(
+            fixture["status"], headers={"content-type": fixture["content_type"]},
+            content=fixture["body"].encode(), request=request,
+        )
+
+    def save_response(self, request: "sdk_httpx.Request", status: int, content_type: str, body: bytes):
+        if status in _UNRECORDED_STATUSES:
+            return
+        try:
+            summary = json.loads(request.content or b"{}")
+        except ValueError:
+            summary = {}
+        self._write({
+            "request": {
+                "path": request.url.path, "model": summary.get("model"), "stream": bool(summary.get("stream")),
+                "message": str(((summary.get("messages") or [{}])[-1]).get("content"))[:200],
+            },
+            "status": status, "content_type": content_type, "body": body.decode("utf-8", "replace"),
+        }, "openai", f"{request_key(request)}.json")
+
+
+fixture_store = FixtureStore(config.UPSTREAM_FIXTURES_DIR)
+
+
+# --- yfinance ---
+class ReplayTicker:
+    def __init__(self, store: FixtureStore, ticker_symbol: str):
+        self._store = store
+        self.ticker = ticker_symbol
+
+    def _fixture(self, name: str) -> Any:
+        time.sleep(injected_delay(config.REPLAY_YFINANCE_LATENCY_MS))
+        self._store.count(f"yfinance.{name}")
+        return self._store.load(self.ticker, name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in TICKER_FIXTURES:
+            return self._fixture(name)
+        raise AttributeError(name)
+
+    def history(self, period: Optional[str] = None, start=None, end=None, **kwargs) -> pd.DataFrame:
+        return select_period(self._fixture("history"), period, start, end)
+
+
+class ReplayYFinance:
+    """Stands in for the yfinance module in replay mode: `Ticker` and `download` are served from fixtures."""
+    def __init__(self, store: FixtureStore):
+        self.store = store
+
+    def Ticker(self, ticker_symbol: str, session=None) -> ReplayTicker:
+        return ReplayTicker(self.store, ticker_symbol)
+
+    def download(self, tickers, period: Optional[str] = None, start=None, end=None, group_by: str = "column", **kwargs):
+        """One grouped call, like yfinance's: latency is injected once, whatever the number of tickers."""
+        time.sleep(injected_delay(config.REPLAY_YFINANCE_LATENCY_MS))
+        self.store.count("yfinance.download")
+        frames = {}
+        for ticker_symbol in [tickers] if isinstance(tickers, str) else tickers:
+            try:
+                frames[ticker_symbol] = select_period(self.store.load(ticker_symbol, "history"), period, start, end)
+            except ReplayMiss:
+                continue
+        if not frames:
+            return pd.DataFrame()
+        frame = pd.concat(frames, axis=1)
+        return frame.swaplevel(axis=1).sort_index(axis=1) if group_by == "column" else frame
+
+
+class RecordingTicker:
+    def __init__(self, store: FixtureStore, ticker, ticker_symbol: str):
+        self._store = store
+        self._ticker = ticker
+        self._symbol = ticker_symbol
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._ticker, name)
+        if name in TICKER_FIXTURES and value is not None:
+            self._store.save(self._symbol, name, value)
+        return value
+
+    def history(self, **kwargs) -> pd.DataFrame:
+        frame = self._ticker.history(**kwargs)
+        if frame is not None and len(frame):
+            self._store.save_history(self._symbol, frame)
+        return frame
+
+
+class RecordingYFinance:
+    """Wraps the yfinance module in record mode, saving what every call returns."""
+    def __init__(self, module, store: FixtureStore):
+        self.module = module
+        self.store = store
+
+    def Ticker(self, ticker_symbol: str, session=None) -> RecordingTicker:
+        return RecordingTicker(self.store, self.module.Ticker(ticker_symbol, session=session), ticker_symbol)
+
+    def download(self, tickers, **kwargs):
+        frame = self.module.download(tickers, **kwargs)
+        if frame is not None and len(frame) and isinstance(frame.columns, pd.MultiIndex):
+            # Saved per ticker as history, from which replayed downloads are assembled.
+            level = 1 if kwargs.get("group_by", "column") == "column" else 0
+            for ticker_symbol in frame.columns.get_level_values(level).unique():
+                bars = frame.xs(ticker_symbol, axis=1, level=level).dropna(how="all")
+                if len(bars):
+                    self.store.save_history(str(ticker_symbol), bars)
+        return frame
+
+
+def upstream_yfinance(module):
+    """The yfinance module for UPSTREAM_MODE: itself when live, else its recorder or replayer."""
+    if config.UPSTREAM_MODE not in UPSTREAM_MODES:
+        raise ValueError(f"UPSTREAM_MODE must be one of: {', '.join(UPSTREAM_MODES)}.")
+    if config.UPSTREAM_MODE == "record":
+        return RecordingYFinance(module, fixture_store)
+    if config.UPSTREAM_MODE == "replay":
+        return ReplayYFinance(fixture_store)
+    return module
+
+
+# --- OpenAI ---
+def _recorded(store: FixtureStore, response, body: bytes, request) -> "sdk_httpx.Response":
+    store.save_response(request, response.status_code, response.headers.get("content-type", ""), body)
+    # The body is already decoded, so its encoding headers no longer apply.
+    headers = [
+        (name, value) for name, value in response.headers.multi_items()
+        if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+    ]
+    return sdk_httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+
+class ReplayTransport(sdk_httpx.BaseTransport):
+    def __init__(self, store: FixtureStore = fixture_store):
+        self.store = store
+
+    def handle_request(self, request: "sdk_httpx.Request") -> "sdk_httpx.Response":
+        time.sleep(injected_delay(config.REPLAY_OPENAI_LATENCY_MS))
+        return self.store.response(request)
+
+
+class AsyncReplayTransport(sdk_httpx.AsyncBaseTransport):
+    def __init__(self, store: FixtureStore = fixture_store):
+        self.store = store
+
+    async def handle_async_request(self, request: "sdk_httpx.Request") -> "sdk_httpx.Response":
+        await asyncio.sleep(injected_delay(config.REPLAY_OPENAI_LATENCY_MS))
+        return self.store.response(request)
+
+
+class RecordingTransport(sdk_httpx.BaseTransport):
+    """Saves every response, streamed ones included (buffered whole, then handed on)."""
+    def __init__(self, transport: "sdk_httpx.BaseTransport", store: FixtureStore = fixture_store):
+        self.transport = transport
+        self.store = store
+
+    def handle_request(self, request: "sdk_httpx.Request") -> "sdk_httpx.Response":
+        response = self.transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        return _recorded(self.store, response, body, request)
+
+
+class AsyncRecordingTransport(sdk_httpx.AsyncBaseTransport):
+    def __init__(self, transport: "sdk_httpx.AsyncBaseTransport", store: FixtureStore = fixture_store):
+        self.transport = transport
+        self.store = store
+
+    async def handle_async_request(self, request: "sdk_httpx.Request") -> "sdk_httpx.Response":
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        return _recorded(self.store, response, body, request)
+
+
+def openai_transport(limits, asynchronous: bool = False):
+    """The httpx transport of the OpenAI clients for UPSTREAM_MODE; None (httpx's own) when live."""
+    if config.UPSTREAM_MODE == "replay":
+        return AsyncReplayTransport() if asynchronous else ReplayTransport()
+    if config.UPSTREAM_MODE == "record":
+        if asynchronous:
+            return AsyncRecordingTransport(sdk_httpx.AsyncHTTPTransport(limits=limits))
+        return RecordingTransport(sdk_httpx.HTTPTransport(limits=limits))
+    return None
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core import config
+from app.services import ratios, scraper
+from app.services.executor import run_blocking
+from app.services.metrics import report_sections, span
+
+# Section name -> (tool, arguments after the ticker). Sections run
+# concurrently on the upstream executor; the loads they share (the info blob
+# behind price and profile, the annual statements behind the ratios) are
+# coalesced by the ticker cache, so each is fetched once.
+REPORT_SECTIONS: Dict[str, Tuple[Callable[..., Any], tuple]] = {
+    "price": (scraper.get_stock_price_data, ()),
+    "profile": (scraper.get_company_profile, ()),
+    **{
+        f"{statement_type}_{frequency}": (scraper.get_financial_statement, (statement_type, frequency))
+        for statement_type in ("income", "balance", "cashflow")
+        for frequency in ("annual", "quarterly")
+    },
+    "news": (scraper.get_latest_news, ()),
+    "ratios": (ratios.get_financial_ratios, ()),
+}
+
+
+def _section_error(result: Any) -> Optional[str]:
+    """Tools report failures as an {"error": ...} dict, or a list starting with one."""
+    if isinstance(result, dict):
+        return result.get("error")
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        return result[0].get("error")
+    return None
+
+
+def _run_section(name: str, ticker_symbol: str) -> Any:
+    function, args = REPORT_SECTIONS[name]
+    with span("report_section", name):
+        result = function(ticker_symbol, *args)
+    if name == "news":
+        # Drops the "No recent news found." placeholder; an empty list says as much.
+        result = result if _section_error(result) else [article for article in result if "title" in article]
+    return result
+
+
+async def build_company_report(ticker_symbol: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Builds a company report from every section in REPORT_SECTIONS, fetched
+    concurrently, and returns once all of them have finished or the deadline
+    has passed, whichever comes first. One slow upstream therefore delays
+    only its own section: sections still loading at the deadline are marked
+    "pending" and keep loading in the background, so a repeat request finds
+    them in the cache.
+
+    :param ticker_symbol: A resolved yfinance ticker (e.g., 'RELIANCE.NS').
+    :param deadline: Seconds to wait. Defaults to REPORT_DEADLINE_SECONDS.
+    :return: Each section with its status ('ok', 'error' or 'pending') and
+             its data, error message or nothing, plus the pending names.
+    """
+    if deadline is None:
+        deadline = config.REPORT_DEADLINE_SECONDS
+    started = time.perf_counter()
+    finished: Dict[str, float] = {}
+
+    def task(name: str) -> asyncio.Task:
+        section = asyncio.ensure_future(run_blocking(_run_section, name, ticker_symbol, timeout=deadline))
+        section.add_done_callback(lambda _: finished.setdefault(name, time.perf_counter() - started))
+        return section
+
+    tasks = {name: task(name) for name in REPORT_SECTIONS}
+    await asyncio.wait(tasks.values(), timeout=deadline)
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    for name, section in tasks.items():
+        if not section.done() or isinstance(section.exception(), asyncio.TimeoutError):
+            # Only the wait is cancelled; the worker thread finishes the load.
+            section.cancel()
+            entry: Dict[str, Any] = {"status": "pending"}
+        elif section.exception() is not None:
+            entry = {"status": "error", "error": str(section.exception())}
+        elif _section_error(section.result()):
+            entry = {"status": "error", "error": _section_error(section.result())}
+        else:
+            entry = {"status": "ok", "data": section.result()}
+        if name in finished and entry["status"] != "pending":
+            entry["elapsed_ms"] = round(finished[name] * 1000, 1)
+        report_sections.inc(section=name, status=entry["status"])
+        sections[name] = entry
+
+    pending = [name for name, entry in sections.items() if entry["status"] == "pending"]
+    return {
+        "ticker": ticker_symbol,
+        "generated_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec="seconds") + "Z",
+        "deadline_seconds": deadline,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "complete": not pending,
+        "pending": pending,
+        "sections": sections,
+    }
@@ -0,0 +1,338 @@
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.services import scraper
+from app.services.executor import map_blocking
+from app.services.price_store import price_store
+from app.services.ratios import divide, to_list
+
+RISK_METRICS = ("annual_return", "volatility", "sharpe", "beta", "max_drawdown")
+
+
+# --- Price matrix helpers ---
+def forward_fill(prices: np.ndarray) -> np.ndarray:
+    """
+    Carries each row's last known price forward over NaN gaps (days a ticker
+    did not trade). Leading NaNs, before a ticker's first bar, stay NaN.
+    """
+    valid = ~np.isnan(prices)
+    index = np.where(valid, np.arange(prices.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return prices[np.arange(prices.shape[0])[:, None], index]
+
+
+def daily_returns(prices: np.ndarray) -> np.ndarray:
+    """(tickers x days-1) simple daily returns, NaN before a ticker's first bar."""
+    filled = forward_fill(prices)
+    return divide(filled[:, 1:] - filled[:, :-1], filled[:, :-1])
+
+
+def _nanstat(func, values: np.ndarray, axis: int) -> np.ndarray:
+    with warnings.catch_warnings():
+        # All-NaN rows (tickers without enough history) stay NaN.
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return func(values, axis=axis)
+
+
+# --- Batch metrics ---
+def compute_risk_metrics(
+    prices: np.ndarray,
+    benchmark: np.ndarray,
+    risk_free_rate: float = config.RISK_FREE_RATE,
+    periods_per_year: int = config.TRADING_DAYS_PER_YEAR,
+) -> Dict[str, np.ndarray]:
+    """
+    Computes risk metrics for every ticker at once.
+
+    :param prices: (tickers x days) adjusted closes on a shared date axis, NaN
+                   where a ticker has no bar.
+    :param benchmark: (days,) benchmark closes on the same axis.
+    :return: {metric: (tickers,) array} for RISK_METRICS. Returns, volatility
+             and Sharpe are annualized; beta uses days both traded.
+    """
+    returns = daily_returns(prices)
+    market = daily_returns(benchmark[None, :])[0]
+
+    own = ~np.isnan(returns)
+    count = own.sum(axis=1)
+    zeroed = np.where(own, returns, 0.0)
+    mean = divide(zeroed.sum(axis=1), count)
+    deviation = np.where(own, returns - mean[:, None], 0.0)
+    variance = divide((deviation ** 2).sum(axis=1), count - 1)
+
+    joint = own & ~np.isnan(market)[None, :]
+    joint_count = joint.sum(axis=1)
+    r = np.where(joint, returns, 0.0)
+    m = np.where(joint, market[None, :], 0.0)
+    r_dev = np.where(joint, r - divide(r.sum(axis=1), joint_count)[:, None], 0.0)
+    m_dev = np.where(joint, m - divide(m.sum(axis=1), joint_count)[:, None], 0.0)
+    beta = divide((r_dev * m_dev).sum(axis=1), (m_dev ** 2).sum(axis=1))
+
+    filled = forward_fill(prices)
+    drawdown = divide(filled, np.fmax.accumulate(filled, axis=1)) - 1
+    first = filled[np.arange(len(filled)), np.argmax(~np.isnan(filled), axis=1)]
+    growth = divide(filled[:, -1], first) if filled.shape[1] else np.full(len(filled), np.nan)
+
+    risk_free_daily = (1 + risk_free_rate) ** (1 / periods_per_year) - 1
+    return {
+        "annual_return": growth ** divide(np.full(len(count), float(periods_per_year)), count) - 1,
+        "volatility": np.sqrt(variance * periods_per_year),
+        "sharpe": divide(mean - risk_free_daily, np.sqrt(variance)) * np.sqrt(periods_per_year),
+        "beta": beta,
+        "max_drawdown": _nanstat(np.nanmin, drawdown, axis=1),
+    }
+
+
+def trailing_returns(prices: np.ndarray, dates: np.ndarray, years: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return from the last bar on or before (last date - `years`) to the last
+    date, for every ticker.
+
+    :return: (total return, annualized return) arrays of shape (tickers,)
+    """
+    if not len(dates):
+        empty = np.full(prices.shape[0], np.nan)
+        return empty, empty.copy()
+    filled = forward_fill(prices)
+    target = (dates[-1].astype("datetime64[D]") - np.timedelta64(365 * years + years // 4, "D"))
+    position = int(np.searchsorted(dates, target, side="right")) - 1
+    if position < 0:
+        empty = np.full(prices.shape[0], np.nan)
+        return empty, empty.copy()
+    total = divide(filled[:, -1], filled[:, position]) - 1
+    return total, (1 + total) ** (1 / years) - 1
+
+
+def rolling_returns(prices: np.ndarray, years: int, periods_per_year: int = config.TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """
+    Annualized `years`-year return ending on every day, measured over
+    `years * periods_per_year` trading days.
+
+    :return: (tickers x days - lag) array; empty when history is shorter.
+    """
+    lag = years * periods_per_year
+    filled = forward_fill(prices)
+    if filled.shape[1] <= lag:
+        return np.empty((filled.shape[0], 0))
+    return divide(filled[:, lag:], filled[:, :-lag]) ** (1 / years) - 1
+
+
+def compute_performance(
+    prices: np.ndarray,
+    dates: np.ndarray,
+    windows: Sequence[int] = config.PERFORMANCE_WINDOWS_YEARS,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Trailing and rolling returns for every ticker and horizon at once.
+
+    :return: {"<n>y": {"total", "annualized", "rolling_mean", "rolling_min",
+             "rolling_max", "rolling_positive"}} of (tickers,) arrays, where
+             "rolling_positive" is the share of n-year windows that gained.
+    """
+    performance = {}
+    for years in windows:
+        total, annualized = trailing_returns(prices, dates, years)
+        rolling = rolling_returns(prices, years)
+        counted = (~np.isnan(rolling)).sum(axis=1)
+        performance[f"{years}y"] = {
+            "total": total,
+            "annualized": annualized,
+            "rolling_mean": _nanstat(np.nanmean, rolling, axis=1) if rolling.shape[1] else np.full(len(prices), np.nan),
+            "rolling_min": _nanstat(np.nanmin, rolling, axis=1) if rolling.shape[1] else np.full(len(prices), np.nan),
+            "rolling_max": _nanstat(np.nanmax, rolling, axis=1) if rolling.shape[1] else np.full(len(prices), np.nan),
+            "rolling_positive": divide((rolling > 0).sum(axis=1).astype(np.float64), counted),
+        }
+    return performance
+
+
+# --- Incremental rolling mode ---
+class RollingRiskWindow:
+    """
+    Keeps risk metrics for a fixed set of tickers over the last `window`
+    daily returns, updated in O(tickers) per appended day from running sums
+    instead of recomputing over the whole window.
+
+    Volatility, Sharpe, beta and annual return cover the window; max drawdown
+    covers every day pushed since the window was created.
+    """
+    def __init__(
+        self,
+        tickers: int,
+        window: int,
+        risk_free_rate: float = config.RISK_FREE_RATE,
+        periods_per_year: int = config.TRADING_DAYS_PER_YEAR,
+    ):
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self._risk_free_daily = (1 + risk_free_rate) ** (1 / periods_per_year) - 1
+        self._returns = np.full((tickers, window), np.nan)
+        self._market = np.full(window, np.nan)
+        self._position = 0
+        self._last_prices = np.full(tickers, np.nan)
+        self._last_market = np.nan
+        self._peak = np.full(tickers, np.nan)
+        self._max_drawdown = np.full(tickers, np.nan)
+        # Running sums over the window: own-return stats, then joint stats
+        # over days where both the ticker and the benchmark have a return.
+        self._n = np.zeros(tickers)
+        self._sum = np.zeros(tickers)
+        self._sum_sq = np.zeros(tickers)
+        self._log_sum = np.zeros(tickers)
+        self._n_joint = np.zeros(tickers)
+        self._sum_r = np.zeros(tickers)
+        self._sum_m = np.zeros(tickers)
+        self._sum_rm = np.zeros(tickers)
+        self._sum_mm = np.zeros(tickers)
+
+    def _accumulate(self, returns: np.ndarray, market: float, sign: float):
+        own = ~np.isnan(returns)
+        r = np.where(own, returns, 0.0)
+        self._n += sign * own
+        self._sum += sign * r
+        self._sum_sq += sign * r * r
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._log_sum += sign * np.where(own, np.log1p(r), 0.0)
+        if not np.isnan(market):
+            rj = np.where(own, r, 0.0)
+            mj = np.where(own, market, 0.0)
+            self._n_joint += sign * own
+            self._sum_r += sign * rj
+            self._sum_m += sign * mj
+            self._sum_rm += sign * rj * mj
+            self._sum_mm += sign * mj * mj
+
+    def push(self, prices: np.ndarray, benchmark_price: float):
+        """Appends one day's closes (NaN for tickers that did not trade)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        filled = np.where(np.isnan(prices), self._last_prices, prices)
+        returns = divide(filled - self._last_prices, self._last_prices)
+        market_close = self._last_market if np.isnan(benchmark_price) else benchmark_price
+        market = (market_close - self._last_market) / self._last_market
+
+        slot = self._position % self.window
+        if self._position >= self.window:
+            self._accumulate(self._returns[:, slot], self._market[slot], -1.0)
+        self._returns[:, slot] = returns
+        self._market[slot] = market
+        self._accumulate(returns, market, 1.0)
+        self._position += 1
+
+        self._last_prices = filled
+        self._last_market = market_close
+        self._peak = np.fmax(self._peak, filled)
+        drawdown = divide(filled, self._peak) - 1
+        self._max_drawdown = np.fmin(self._max_drawdown, drawdown)
+
+    def seed(self, prices: np.ndarray, benchmark: np.ndarray):
+        """Pushes a (tickers x days) history, oldest day first."""
+        for day in range(prices.shape[1]):
+            self.push(prices[:, day], benchmark[day])
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """The current {metric: (tickers,) array} for RISK_METRICS."""
+        mean = divide(self._sum, self._n)
+        variance = divide(self._sum_sq - self._sum * mean, self._n - 1)
+        variance = np.where(variance < 0, 0.0, variance)
+        covariance = self._sum_rm - divide(self._sum_r * self._sum_m, self._n_joint)
+        market_variance = self._sum_mm - divide(self._sum_m * self._sum_m, self._n_joint)
+        return {
+            "annual_return": np.exp(divide(self._log_sum * self.periods_per_year, self._n)) - 1,
+            "volatility": np.sqrt(variance * self.periods_per_year),
+            "sharpe": divide(mean - self._risk_free_daily, np.sqrt(variance)) * np.sqrt(self.periods_per_year),
+            "beta": divide(covariance, market_variance),
+            "max_drawdown": self._max_drawdown.copy(),
+        }
+
+
+# --- Tools ---
+def _load_price_matrix(ticker_symbols: List[str], start=None) -> Dict[str, Any]:
+    """
+    Refreshes the stored history of every ticker and the benchmark
+    concurrently, then reads their adjusted closes on a shared date axis.
+    """
+    ticker_symbols = list(dict.fromkeys(ticker_symbols))
+    if not ticker_symbols:
+        return {"error": "At least one ticker symbol is required."}
+    if len(ticker_symbols) > config.RISK_MAX_TICKERS:
+        return {"error": f"At most {config.RISK_MAX_TICKERS} tickers can be requested at once."}
+
+    requested = ticker_symbols + [config.RISK_BENCHMARK_TICKER]
+    outcomes = map_blocking(lambda ticker_symbol: scraper.get_price_history(ticker_symbol, start), requested)
+    tickers, errors = [], {}
+    for ticker_symbol, (series, error) in zip(ticker_symbols, outcomes[:-1]):
+        if error is not None:
+            errors[ticker_symbol] = str(error)
+        elif not len(series):
+            errors[ticker_symbol] = "No price history found."
+        else:
+            tickers.append(series.ticker)
+    benchmark_series, benchmark_error = outcomes[-1]
+    if benchmark_error is not None:
+        return {"error": f"Could not load benchmark {config.RISK_BENCHMARK_TICKER}: {benchmark_error}"}
+    if not tickers:
+        return {"error": "Could not load price history for any of the requested tickers.", "details": errors}
+
+    dates, matrix = price_store.read_matrix(tickers + [benchmark_series.ticker], "adj_close", start=start)
+    return {"tickers": tickers, "dates": dates, "prices": matrix[:-1], "benchmark": matrix[-1], "errors": errors}
+
+
+def calculate_risk_metrics(ticker_symbols: List[str], period_years: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Calculates annualized return, volatility, Sharpe ratio, beta against the
+    NIFTY 50 and maximum drawdown for one or more companies from their daily
+    adjusted closes, in one vectorized pass over all of them.
+
+    :param ticker_symbols: Ticker symbols (e.g., ['RELIANCE.NS', 'TCS.NS']).
+    :param period_years: Lookback in years. Default: RISK_LOOKBACK_YEARS.
+    """
+    period_years = period_years or config.RISK_LOOKBACK_YEARS
+    start = np.datetime64("today", "D") - np.timedelta64(int(round(period_years * 365.25)), "D")
+    try:
+        loaded = _load_price_matrix(ticker_symbols, start)
+        if "error" in loaded:
+            return loaded
+        metrics = compute_risk_metrics(loaded["prices"], loaded["benchmark"])
+    except Exception as e:
+        return {"error": f"An error occurred computing risk metrics: {e}"}
+
+    dates = loaded["dates"]
+    return {
+        "ticker": loaded["tickers"],
+        "benchmark": config.RISK_BENCHMARK_TICKER,
+        "start": str(dates[0]) if len(dates) else None,
+        "end": str(dates[-1]) if len(dates) else None,
+        "risk_free_rate": config.RISK_FREE_RATE,
+        "metrics": {name: to_list(values) for name, values in metrics.items()},
+        "errors": loaded["errors"],
+    }
+
+
+def get_historical_performance(ticker_symbols: List[str]) -> Dict[str, Any]:
+    """
+    Calculates trailing 1, 5 and 10-year returns for one or more companies,
+    with the mean, worst and best rolling return over each horizon and the
+    share of rolling windows that were positive.
+
+    :param ticker_symbols: Ticker symbols (e.g., ['RELIANCE.NS', 'TCS.NS']).
+    """
+    try:
+        loaded = _load_price_matrix(ticker_symbols)
+        if "error" in loaded:
+            return loaded
+        performance = compute_performance(loaded["prices"], loaded["dates"])
+    except Exception as e:
+        return {"error": f"An error occurred computing historical performance: {e}"}
+
+    dates = loaded["dates"]
+    return {
+        "ticker": loaded["tickers"],
+        "end": str(dates[-1]) if len(dates) else None,
+        "performance": {
+            horizon: {name: to_list(values) for name, values in stats.items()}
+            for horizon, stats in performance.items()
+        },
+        "errors": loaded["errors"],
+    }
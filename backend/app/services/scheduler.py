@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.core import config
+from app.services.cache import ticker_cache
+from app.services.executor import run_blocking
+from app.services.ratelimit import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTracker:
+    """
+    Counts requests per ticker with exponential decay, so the ranking reflects
+    recent traffic rather than all-time totals, and remembers which cache
+    entries (price, news, one statement, ...) of each ticker were asked for.
+    """
+    def __init__(self, half_life_seconds: float, max_tracked: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self._decay = math.log(2) / half_life_seconds
+        self.max_tracked = max_tracked
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._entries: Dict[str, Set[Hashable]] = {}
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.exp(-self._decay * (now - updated_at))
+
+    def record(self, ticker_symbol: str, key: Optional[Hashable] = None):
+        """
+        :param key: The cache key of the entry requested, so the prefetcher
+                    refreshes only what was asked for.
+        """
+        now = self._clock()
+        with self._lock:
+            score, updated_at = self._scores.get(ticker_symbol, (0.0, now))
+            self._scores[ticker_symbol] = (self._decayed(score, updated_at, now) + 1.0, now)
+            if key is not None:
+                self._entries.setdefault(ticker_symbol, set()).add(key)
+            if len(self._scores) > self.max_tracked:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        """Drops the coldest half of the tracked tickers. Must be called with the lock held."""
+        ranked = sorted(self._scores.items(), key=lambda item: self._decayed(*item[1], now))
+        for ticker_symbol, _ in ranked[: len(ranked) // 2]:
+            del self._scores[ticker_symbol]
+            self._entries.pop(ticker_symbol, None)
+
+    def requested(self, ticker_symbol: str) -> Set[Hashable]:
+        """The cache keys requested for a ticker while it has been tracked."""
+        with self._lock:
+            return set(self._entries.get(ticker_symbol, ()))
+
+    def top(self, n: int) -> List[str]:
+        now = self._clock()
+        with self._lock:
+            ranked = sorted(
+                self._scores.items(), key=lambda item: self._decayed(*item[1], now), reverse=True
+            )
+        return [ticker_symbol for ticker_symbol, _ in ranked[:n]]
+
+
+class PrefetchScheduler:
+    """
+    Periodically refreshes the cache entries of the tracked tickers and the
+    top-N most requested ones once less than `refresh_margin` of their TTL remains, so popular
+    tickers are served from cache instead of a cold upstream call. Top-N
+    tickers only get the entries that were actually requested (a ticker only
+    ever quoted does not pull its statements); PREFETCH_TRACKED_TICKERS get all.
+
+    Refreshes run one at a time through the upstream executor and the global
+    rate limiter; failed refreshes are retried with jittered exponential backoff.
+    """
+    def __init__(
+        self,
+        tracker: RequestTracker,
+        top_n: int = config.PREFETCH_TOP_N,
+        interval_seconds: float = config.PREFETCH_INTERVAL_SECONDS,
+        refresh_margin: float = config.PREFETCH_REFRESH_MARGIN,
+        max_retries: int = config.PREFETCH_MAX_RETRIES,
+    ):
+        self.tracker = tracker
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.refresh_margin = refresh_margin
+        self.max_retries = max_retries
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"runs": 0, "refreshed": 0, "skipped_fresh": 0, "skipped_unrequested": 0, "failed": 0, "retries": 0}
+
+    def _needs_refresh(self, data_class: str, key) -> bool:
+        remaining = ticker_cache.ttl_remaining(data_class, key)
+        if remaining is None:
+            return True
+        return remaining <= self.refresh_margin * ticker_cache.ttls[data_class]
+
+    async def _refresh(self, data_class: str, key, loader) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await run_blocking(ticker_cache.refresh, data_class, key, loader)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.warning("Prefetch of %s failed after %d attempts: %s", key, attempt + 1, e)
+                    return False
+                self.stats["retries"] += 1
+                await asyncio.sleep(backoff_delay(
+                    attempt, config.PREFETCH_BACKOFF_BASE_SECONDS, config.PREFETCH_BACKOFF_MAX_SECONDS
+                ))
+        return False
+
+    async def run_once(self):
+        """Refreshes every due entry of the tracked and current top-N tickers."""
+        # Imported here because the scraper records requests on `request_tracker`.
+        from app.services import scraper
+
+        self.stats["runs"] += 1
+        tickers = dict.fromkeys(config.PREFETCH_TRACKED_TICKERS + self.tracker.top(self.top_n))
+        for ticker_symbol in tickers:
+            requested = None if ticker_symbol in config.PREFETCH_TRACKED_TICKERS else self.tracker.requested(ticker_symbol)
+            for data_class, key, loader in scraper.prefetch_entries(ticker_symbol):
+                if requested is not None and key not in requested:
+                    self.stats["skipped_unrequested"] += 1
+                    continue
+                if not self._needs_refresh(data_class, key):
+                    self.stats["skipped_fresh"] += 1
+                    continue
+                if await self._refresh(data_class, key, loader):
+                    self.stats["refreshed"] += 1
+                else:
+                    self.stats["failed"] += 1
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Prefetch run failed")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+request_tracker = RequestTracker(config.PREFETCH_POPULARITY_HALF_LIFE_SECONDS)
+prefetch_scheduler = PrefetchScheduler(request_tracker)
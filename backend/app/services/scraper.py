@@ -1,21 +1,260 @@
-from typing import Dict, Any, List
-import yfinance as yf
-from openai import OpenAI
+from datetime import date, datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import functools
+import math
+import numpy as np
+import yfinance
+
+from app.core import config
+from app.services import news_store, statement_store
+from app.services.cache import ticker_cache
+from app.services.llm_cache import llm_response_cache
+from app.services.metrics import span
+from app.services.news_ingest import ingest_news
+from app.services.price_store import PriceSeries, price_store, to_day
+from app.services.ratelimit import upstream_limiter
+from app.services.replay import upstream_yfinance
+from app.services.scheduler import request_tracker
+from app.services.search_index import search_index
+from app.services.statement_table import StatementTable
+from app.services.symbols import resolve_ticker, symbol_master
+from app.services.transport import yf_session
+
+# yfinance itself, or its recorder or replayer when UPSTREAM_MODE says so.
+yf = upstream_yfinance(yfinance)
+
+
+# --- Cached upstream fetches ---
+# Every yfinance round-trip goes through these helpers so repeated requests for
+# the same ticker are served from the shared, TTL-aware `ticker_cache`.
+_STATEMENT_ATTRIBUTES = {
+    ("income", "annual"): "income_stmt",
+    ("income", "quarterly"): "quarterly_income_stmt",
+    ("balance", "annual"): "balance_sheet",
+    ("balance", "quarterly"): "quarterly_balance_sheet",
+    ("cashflow", "annual"): "cashflow",
+    ("cashflow", "quarterly"): "quarterly_cashflow",
+}
+
+
+def _acquire_upstream_token():
+    """Takes a token from the global upstream rate limiter, waiting at most UPSTREAM_RATE_LIMIT_WAIT_SECONDS."""
+    with span("rate_limit_wait"):
+        if not upstream_limiter.acquire(timeout=config.UPSTREAM_RATE_LIMIT_WAIT_SECONDS):
+            raise TimeoutError("Timed out waiting for the upstream rate limiter.")
+
+
+def _upstream_ticker(ticker_symbol: str) -> yfinance.Ticker:
+    """
+    Returns a yfinance Ticker on the shared pooled session after taking a
+    token from the global upstream rate limiter. Each Ticker is used for a
+    single upstream property.
+    """
+    _acquire_upstream_token()
+    return yf.Ticker(ticker_symbol, session=yf_session)
+
+
+def _load_info(ticker_symbol: str) -> Dict[str, Any]:
+    ticker = _upstream_ticker(ticker_symbol)
+    with span("upstream", "info"):
+        info = ticker.info
+    # Keeps the profile searchable; a no-op unless the profile text changed.
+    search_index.index_profile(ticker_symbol, info)
+    return info
+
+
+def _news_feed(ticker_symbol: str) -> List[Dict[str, Any]]:
+    ticker = _upstream_ticker(ticker_symbol)
+    with span("upstream", "news"):
+        return ticker.news
+
+
+def _fetch_info(ticker_symbol: str) -> Dict[str, Any]:
+    """
+    Returns the yfinance `.info` blob for a ticker. It carries the live price,
+    so it follows the 'price' freshness window.
+    """
+    ticker_symbol = ticker_symbol.upper()
+    key = ("info", ticker_symbol)
+    request_tracker.record(ticker_symbol, key)
+    return ticker_cache.get_or_load("price", key, lambda: _load_info(ticker_symbol))
+
+
+def _load_statement(ticker_symbol: str, statement_type: str, frequency: str) -> StatementTable:
+    """
+    Serves a statement from the persistent store, refreshing it from yfinance
+    first when it is older than the 'statement' freshness window. Only new or
+    changed periods are written back. If the refresh fails, stale stored data
+    is returned rather than an error.
+    """
+    max_age = config.CACHE_TTL_SECONDS["statement"]
+    if statement_store.is_stale(ticker_symbol, statement_type, frequency, max_age):
+        attribute = _STATEMENT_ATTRIBUTES[(statement_type, frequency)]
+        try:
+            ticker = _upstream_ticker(ticker_symbol)
+            with span("upstream", "statement"):
+                statement_df = getattr(ticker, attribute)
+            counts = statement_store.upsert_statement(ticker_symbol, statement_type, frequency, statement_df)
+            if counts["inserted"] or counts["updated"]:
+                # LLM answers computed from the old figures are no longer valid.
+                llm_response_cache.invalidate_ticker(ticker_symbol)
+        except Exception:
+            stored = statement_store.read_statement(ticker_symbol, statement_type, frequency)
+            if stored is None:
+                raise
+            return stored
+    stored = statement_store.read_statement(ticker_symbol, statement_type, frequency)
+    if stored is None:
+        return StatementTable(ticker_symbol, statement_type, frequency, [], [], np.empty((0, 0)))
+    return stored
+
+
+def _fetch_statement(ticker_symbol: str, statement_type: str, frequency: str) -> StatementTable:
+    """
+    Returns a statement as a StatementTable. `statement_type` and `frequency`
+    must already be validated and lower-cased.
+    """
+    ticker_symbol = ticker_symbol.upper()
+    key = ("statement", ticker_symbol, statement_type, frequency)
+    request_tracker.record(ticker_symbol, key)
+    return ticker_cache.get_or_load(
+        "statement", key, lambda: _load_statement(ticker_symbol, statement_type, frequency)
+    )
+
+
+def _load_news(ticker_symbol: str) -> Dict[str, Any]:
+    """
+    Ingests a ticker's news feed into the news store, unless it was polled
+    recently enough that the prefetcher would not refresh it yet (e.g. just
+    before a restart). If the poll fails, previously stored news is served;
+    with nothing stored, the error is raised.
+    """
+    max_age = config.CACHE_TTL_SECONDS["news"] * (1 - config.PREFETCH_REFRESH_MARGIN)
+    if not news_store.is_stale(ticker_symbol, max_age):
+        return {}
+    result = ingest_news([ticker_symbol], _news_feed)
+    if ticker_symbol in result["errors"] and not news_store.latest_news(ticker_symbol, 1):
+        raise RuntimeError(result["errors"][ticker_symbol])
+    return result
+
+
+def _fetch_news(ticker_symbol: str) -> Dict[str, Any]:
+    """
+    Makes sure a ticker's stored news is within the 'news' freshness window;
+    callers then read it from `news_store`.
+    """
+    ticker_symbol = ticker_symbol.upper()
+    key = ("news", ticker_symbol)
+    request_tracker.record(ticker_symbol, key)
+    return ticker_cache.get_or_load("news", key, lambda: _load_news(ticker_symbol))
+
+
+# yfinance history columns -> price store fields.
+_HISTORY_COLUMNS = {
+    "Open": "open", "High": "high", "Low": "low", "Close": "close", "Adj Close": "adj_close", "Volume": "volume",
+}
+
+
+def _history_arrays(history_df) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Converts a yfinance daily history DataFrame to (dates, columns) for the
+    price store. Today's bar is dropped: it is still forming, and the store
+    only appends completed days.
+    """
+    index = history_df.index
+    if getattr(index, "tz", None) is not None:
+        today = np.datetime64(datetime.now(index.tz).date(), "D")
+        index = index.tz_localize(None)
+    else:
+        today = np.datetime64(date.today(), "D")
+    dates = index.values.astype("datetime64[D]")
+    complete = dates < today
+    columns = {
+        field: history_df[column].to_numpy(dtype=np.float64, na_value=np.nan)[complete]
+        for column, field in _HISTORY_COLUMNS.items() if column in history_df
+    }
+    return dates[complete], columns
+
+
+def _download_history(ticker_symbol: str, **kwargs):
+    ticker = _upstream_ticker(ticker_symbol)
+    with span("upstream", "history"):
+        return ticker.history(interval="1d", auto_adjust=False, actions=False, **kwargs)
+
+
+def _load_history(ticker_symbol: str) -> Optional[np.datetime64]:
+    """
+    Tops up a ticker's stored daily history with the days since its last
+    stored bar; the first call downloads PRICE_HISTORY_INITIAL_PERIOD.
+    Adjusted closes are rebased by every split or dividend, so when the
+    re-downloaded last stored day no longer matches, the whole history is
+    downloaded again and replaced. If the refresh fails, the stored history
+    is kept and served as is.
+
+    :return: The date of the last stored bar, or None if there is none.
+    """
+    last = price_store.last_date(ticker_symbol)
+    if last is not None and last >= np.datetime64(date.today(), "D") - 1:
+        return last
+    try:
+        if last is None:
+            dates, columns = _history_arrays(_download_history(ticker_symbol, period=config.PRICE_HISTORY_INITIAL_PERIOD))
+            price_store.append(ticker_symbol, dates, columns)
+        else:
+            dates, columns = _history_arrays(_download_history(ticker_symbol, start=str(last)))
+            stored = price_store.read(ticker_symbol, last, last, fields=("adj_close",))["adj_close"]
+            overlap = columns.get("adj_close", np.empty(0))[dates == last]
+            if len(overlap) and len(stored) and not np.isclose(overlap[0], stored[0], rtol=1e-6, equal_nan=True):
+                dates, columns = _history_arrays(_download_history(ticker_symbol, period=config.PRICE_HISTORY_INITIAL_PERIOD))
+                price_store.replace(ticker_symbol, dates, columns)
+            else:
+                price_store.append(ticker_symbol, dates, columns)
+    except Exception:
+        if last is None:
+            raise
+    return price_store.last_date(ticker_symbol)
+
+
+def _fetch_history(ticker_symbol: str) -> Optional[np.datetime64]:
+    """Makes sure a ticker's stored history is fresh, at most once per 'history' window."""
+    ticker_symbol = ticker_symbol.upper()
+    key = ("history", ticker_symbol)
+    request_tracker.record(ticker_symbol, key)
+    return ticker_cache.get_or_load("history", key, lambda: _load_history(ticker_symbol))
+
+
+def prefetch_entries(ticker_symbol: str) -> List[Tuple[str, Tuple, Callable[[], Any]]]:
+    """
+    Lists every cache entry held for a ticker as (data_class, key, loader), so
+    the prefetch scheduler can refresh them ahead of expiry. The keys match the
+    ones used by the `_fetch_*` helpers above.
+    """
+    ticker_symbol = ticker_symbol.upper()
+    entries = [
+        ("price", ("info", ticker_symbol), functools.partial(_load_info, ticker_symbol)),
+        ("news", ("news", ticker_symbol), functools.partial(_load_news, ticker_symbol)),
+        ("history", ("history", ticker_symbol), functools.partial(_load_history, ticker_symbol)),
+    ]
+    for statement_type, frequency in _STATEMENT_ATTRIBUTES:
+        entries.append((
+            "statement",
+            ("statement", ticker_symbol, statement_type, frequency),
+            functools.partial(_load_statement, ticker_symbol, statement_type, frequency),
+        ))
+    return entries
 
 
 def get_stock_price_data(ticker_symbol: str) -> Dict[str, Any]:
     """
     Fetches key stock price data for a given ticker symbol using yfinance.
-    For Indian stocks on NSE, '.NS' should be appended (e.g., 'RELIANCE.NS').
+    Accepts a yfinance ticker (e.g., 'RELIANCE.NS'), a bare NSE symbol or a company name.
     """
     try:
-        # Append .NS for Indian tickers if not already present
-        if ".NS" not in ticker_symbol.upper() and ".BO" not in ticker_symbol.upper():
-             # This is a simple heuristic, might need refinement
-            ticker_symbol += ".NS"
-
-        stock = yf.Ticker(ticker_symbol)
-        stock_info = stock.info
+        ticker_symbol = resolve_ticker(ticker_symbol)
+    except ValueError as e:
+        return {"error": str(e)}
+    try:
+        stock_info = _fetch_info(ticker_symbol)
 
         # Check if the market is open to get current price, otherwise fallback
         current_price = stock_info.get('currentPrice') or stock_info.get('regularMarketPrice')
@@ -41,19 +280,117 @@ def get_stock_price_data(ticker_symbol: str) -> Dict[str, Any]:
         return {"error": f"An error occurred with yfinance for ticker '{ticker_symbol}': {e}"}
 
 
+# Fields returned for every ticker by the batch quote path, in column order.
+BATCH_QUOTE_FIELDS = ("currentPrice", "previousClose", "open", "dayHigh", "dayLow", "volume")
+
+
+def _download_quotes(ticker_symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetches daily bars for all tickers in one grouped yfinance download and
+    derives a quote per ticker from the last two sessions. The extraction is
+    done on (days x tickers) arrays, so its cost does not grow with per-ticker
+    Python work. Tickers with no data are left out of the result.
+    """
+    _acquire_upstream_token()
+    with span("upstream", "quotes"):
+        frame = yf.download(
+            ticker_symbols, period="5d", interval="1d", group_by="column",
+            auto_adjust=False, threads=True, progress=False, session=yf_session,
+        )
+    if frame is None or frame.empty:
+        return {}
+
+    def field(name: str) -> np.ndarray:
+        return frame[name].reindex(columns=ticker_symbols).to_numpy(dtype=float)
+
+    close = field("Close")
+    columns = np.arange(len(ticker_symbols))
+    valid = ~np.isnan(close)
+    has_data = valid.any(axis=0)
+    last = close.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    valid[last, columns] = False
+    has_previous = valid.any(axis=0)
+    previous = close.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+
+    values = {
+        "currentPrice": close[last, columns],
+        "previousClose": np.where(has_previous, close[previous, columns], np.nan),
+        "open": field("Open")[last, columns],
+        "dayHigh": field("High")[last, columns],
+        "dayLow": field("Low")[last, columns],
+        "volume": field("Volume")[last, columns],
+    }
+    rows = np.column_stack([values[name] for name in BATCH_QUOTE_FIELDS]).tolist()
+    return {
+        symbol: {name: (None if math.isnan(value) else value) for name, value in zip(BATCH_QUOTE_FIELDS, row)}
+        for symbol, row, ok in zip(ticker_symbols, rows, has_data.tolist())
+        if ok
+    }
+
+
+def get_batch_stock_price_data(ticker_symbols: List[str]) -> Dict[str, Any]:
+    """
+    Fetches quotes for many tickers at once. Tickers not already cached are
+    fetched together in a single bulk download instead of one `.info` call each.
+
+    Returns a columnar payload: one list per field, aligned with "symbol",
+    plus a per-ticker "status" ('ok' or 'error') and "error" message.
+    """
+    resolved = [symbol_master.resolve(ticker_symbol) for ticker_symbol in ticker_symbols]
+    symbols = [ticker or ticker_symbol.strip().upper() for ticker, ticker_symbol in zip(resolved, ticker_symbols)]
+    unknown = {symbol for ticker, symbol in zip(resolved, symbols) if ticker is None}
+
+    quotes: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for symbol in dict.fromkeys(ticker for ticker in resolved if ticker is not None):
+        found, quote = ticker_cache.get("price", ("quote", symbol))
+        if found:
+            quotes[symbol] = quote
+        else:
+            missing.append(symbol)
+
+    download_error = None
+    if missing:
+        try:
+            # Concurrent requests for the same uncached tickers (a watchlist
+            # polled by many clients, the ratios of one company) share one download.
+            fetched = ticker_cache.get_or_load("price", ("quotes", tuple(missing)), lambda: _download_quotes(missing))
+        except Exception as e:
+            fetched = {}
+            download_error = f"An error occurred with yfinance bulk download: {e}"
+        for symbol, quote in fetched.items():
+            ticker_cache.set("price", ("quote", symbol), quote)
+        quotes.update(fetched)
+
+    payload: Dict[str, List[Any]] = {"symbol": symbols, "status": [], "error": []}
+    payload.update({name: [] for name in BATCH_QUOTE_FIELDS})
+    for symbol in symbols:
+        quote = quotes.get(symbol)
+        if quote is None:
+            payload["status"].append("error")
+            payload["error"].append(
+                f"Unknown ticker symbol '{symbol}'." if symbol in unknown
+                else download_error or f"Could not retrieve price for {symbol}. It might be an invalid ticker or delisted."
+            )
+        else:
+            payload["status"].append("ok")
+            payload["error"].append(None)
+        for name in BATCH_QUOTE_FIELDS:
+            payload[name].append(quote[name] if quote else None)
+    return payload
+
+
 def get_price_earning_data(ticker_symbol: str) -> Dict[str, Any]:
     """
     Fetches P/E ratio for a given ticker symbol using yfinance.
-    For Indian stocks on NSE, '.NS' should be appended (e.g., 'RELIANCE.NS').
+    Accepts a yfinance ticker (e.g., 'RELIANCE.NS'), a bare NSE symbol or a company name.
     """
     try:
-        # Append .NS for Indian tickers if not already present
-        if ".NS" not in ticker_symbol.upper() and ".BO" not in ticker_symbol.upper():
-             # This is a simple heuristic, might need refinement
-            ticker_symbol += ".NS"
-
-        stock = yf.Ticker(ticker_symbol)
-        stock_info = stock.info
+        ticker_symbol = resolve_ticker(ticker_symbol)
+    except ValueError as e:
+        return {"error": str(e)}
+    try:
+        stock_info = _fetch_info(ticker_symbol)
 
         # Check if the market is open to get current price, otherwise fallback
         current_price = stock_info.get('currentPrice') or stock_info.get('regularMarketPrice')
@@ -73,35 +410,58 @@ def get_price_earning_data(ticker_symbol: str) -> Dict[str, Any]:
         return {"error": f"An error occurred with yfinance for ticker '{ticker_symbol}': {e}"}
 
 
+def get_statement_table(ticker_symbol: str, statement_type: str, frequency: str = "annual") -> StatementTable:
+    """
+    Returns a company's financial statement as a columnar StatementTable.
+    Raises ValueError for an unknown ticker or an invalid statement_type.
+
+    :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
+    :param statement_type: The type of statement to fetch. Must be one of 'income', 'balance', or 'cashflow'.
+    :param frequency: The frequency of the report. Must be 'annual' or 'quarterly'.
+    """
+    ticker_symbol = resolve_ticker(ticker_symbol)
+    if statement_type.lower() not in ('income', 'balance', 'cashflow'):
+        raise ValueError("Invalid statement_type. Must be 'income', 'balance', or 'cashflow'.")
+    frequency = 'annual' if frequency.lower() == 'annual' else 'quarterly'
+
+    return _fetch_statement(ticker_symbol, statement_type.lower(), frequency)
+
+
+def get_price_history(ticker_symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> PriceSeries:
+    """
+    Returns a company's daily OHLCV bars between two dates (inclusive, both
+    optional) from the local price store, topping the store up from yfinance
+    first when needed. Raises ValueError for an unknown ticker or an
+    unparseable date.
+
+    :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
+    :param start: First date, e.g. '2020-01-01'. Default: the earliest stored.
+    :param end: Last date, e.g. '2024-12-31'. Default: the latest stored.
+    """
+    ticker_symbol = resolve_ticker(ticker_symbol)
+    start = None if start is None else to_day(start)
+    end = None if end is None else to_day(end)
+
+    _fetch_history(ticker_symbol)
+    return price_store.read(ticker_symbol, start, end)
+
+
 def get_financial_statement(ticker_symbol: str, statement_type: str, frequency: str = "annual") -> Dict[str, Any]:
     """
     Fetches a company's financial statements (income statement, balance sheet, or cash flow).
-    
+
+    Returns a columnar payload: "periods" (ISO dates, newest first),
+    "line_items", and "values" with one row per line item aligned with
+    "periods" (None where a value is missing).
+
     :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
     :param statement_type: The type of statement to fetch. Must be one of 'income', 'balance', or 'cashflow'.
     :param frequency: The frequency of the report. Must be 'annual' or 'quarterly'.
     """
     try:
-        if ".NS" not in ticker_symbol.upper() and ".BO" not in ticker_symbol.upper():
-            ticker_symbol += ".NS"
-        
-        stock = yf.Ticker(ticker_symbol)
-        
-        statement_df = None
-        if statement_type.lower() == 'income':
-            statement_df = stock.income_stmt if frequency.lower() == 'annual' else stock.quarterly_income_stmt
-        elif statement_type.lower() == 'balance':
-            statement_df = stock.balance_sheet if frequency.lower() == 'annual' else stock.quarterly_balance_sheet
-        elif statement_type.lower() == 'cashflow':
-            statement_df = stock.cashflow if frequency.lower() == 'annual' else stock.quarterly_cashflow
-        else:
-            return {"error": "Invalid statement_type. Must be 'income', 'balance', or 'cashflow'."}
-
-        # yfinance returns a pandas DataFrame. We convert it to a dictionary.
-        # The index contains timestamps, which we convert to strings for JSON compatibility.
-        statement_dict = statement_df.to_dict()
-        return {str(k): v for k, v in statement_dict.items()}
-
+        return get_statement_table(ticker_symbol, statement_type, frequency).to_payload()
+    except ValueError as e:
+        return {"error": str(e)}
     except Exception as e:
         return {"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}
 
@@ -111,16 +471,16 @@ def get_company_profile(ticker_symbol: str) -> Dict[str, Any]:
     Fetches key profile information for a company, such as sector, industry, and business summary.
     """
     try:
-        if ".NS" not in ticker_symbol.upper() and ".BO" not in ticker_symbol.upper():
-            ticker_symbol += ".NS"
-        
-        stock = yf.Ticker(ticker_symbol)
-        info = stock.info
+        ticker_symbol = resolve_ticker(ticker_symbol)
+    except ValueError as e:
+        return {"error": str(e)}
+    try:
+        info = _fetch_info(ticker_symbol)
 
         profile_data = {
             "longName": info.get("longName"),
             "sector": info.get("sector"),
-            "industry": info.g_et("industry"),
+            "industry": info.get("industry"),
             "fullTimeEmployees": info.get("fullTimeEmployees"),
             "longBusinessSummary": info.get("longBusinessSummary"),
             "website": info.get("website"),
@@ -133,82 +493,20 @@ def get_company_profile(ticker_symbol: str) -> Dict[str, Any]:
         return {"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}
 
 
-def get_latest_news(ticker_symbol: str) -> List[Dict[str, Any]]:
+def get_latest_news(ticker_symbol: str, limit: int = config.NEWS_DEFAULT_LIMIT) -> List[Dict[str, Any]]:
     """
-    Fetches the latest news articles for a given company.
+    Fetches the latest news articles for a given company, newest first.
+
+    :param limit: Number of articles (at most NEWS_MAX_LIMIT).
     """
     try:
-        if ".NS" not in ticker_symbol.upper() and ".BO" not in ticker_symbol.upper():
-            ticker_symbol += ".NS"
-        
-        stock = yf.Ticker(ticker_symbol)
-        # The 'news' attribute returns a list of dictionaries
-        news = stock.news
+        ticker_symbol = resolve_ticker(ticker_symbol)
+    except ValueError as e:
+        return [{"error": str(e)}]
+    try:
+        _fetch_news(ticker_symbol)
+        news = news_store.latest_news(ticker_symbol, max(1, min(limit, config.NEWS_MAX_LIMIT)))
         return news if news else [{"message": "No recent news found."}]
 
     except Exception as e:
         return [{"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}]
-
-
-def compare_two_companies_financial_statement(
-    ticker_symbol_1: str,
-    ticker_symbol_2: str,
-    statement_type: str,
-    frequency: str = "annual"
-) -> Dict[str, Any]:
-    """
-    Compares financial statements of two companies by fetching their data and asking the LLM for analysis.
-
-    :param ticker_symbol_1: First company ticker (e.g., 'RELIANCE.NS').
-    :param ticker_symbol_2: Second company ticker (e.g., 'TCS.NS').
-    :param statement_type: One of 'income', 'balance', or 'cashflow'.
-    :param frequency: 'annual' or 'quarterly'. Default: 'annual'.
-    """
-    client = OpenAI()
-    # Step 1: Fetch both statements
-    data1 = get_financial_statement(ticker_symbol_1, statement_type, frequency)
-    data2 = get_financial_statement(ticker_symbol_2, statement_type, frequency)
-
-    if "error" in data1:
-        return {"error": f"Failed to fetch data for {ticker_symbol_1}", "details": data1}
-    if "error" in data2:
-        return {"error": f"Failed to fetch data for {ticker_symbol_2}", "details": data2}
-
-    # Step 2: Ask the LLM to compare
-    prompt = f"""
-    Compare the following {frequency} {statement_type} statements of two companies.
-
-    Company 1 ({ticker_symbol_1}):
-    {data1}
-
-    Company 2 ({ticker_symbol_2}):
-    {data2}
-
-    Provide a clear comparison of key metrics, highlight major differences,
-    and state which company is stronger financially in this statement.
-    """
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # lightweight model for analysis
-            messages=[
-                {"role": "system", "content": "You are a financial analyst."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        comparison_text = response.choices[0].message.content
-
-        return {
-            "company_1": ticker_symbol_1,
-            "company_2": ticker_symbol_2,
-            "statement_type": statement_type,
-            "frequency": frequency,
-            "comparison": comparison_text
-        }
-
-    except Exception as e:
-        return {"error": f"LLM comparison failed: {e}"}
-
-
-
@@ -0,0 +1,285 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core import config
+from app.services.symbols import resolve_ticker
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_KINDS = ("profile", "news")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    tickers TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    published_at TEXT,
+    content_hash TEXT NOT NULL,
+    UNIQUE (kind, key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, tokenize = 'porter unicode61'
+);
+"""
+
+# Title matches count for more than body matches in the BM25 score.
+_COLUMN_WEIGHTS = (4.0, 1.0)
+
+_TERM = re.compile(r"\w+")
+_PHRASE = re.compile(r'"([^"]*)"')
+# Dropped from free-text queries so "which companies mention green hydrogen"
+# ranks on its content words.
+_STOPWORDS = frozenset(
+    "a an and are about any by companies company do does for from has have in is it mention mentions "
+    "of on or the their to what which who with".split()
+)
+
+
+def match_expression(query: str, operator: str = "AND") -> Optional[str]:
+    """
+    Turns a free-text query into an FTS5 MATCH expression: "quoted phrases"
+    are kept as phrases, other words become terms joined by `operator`.
+    Every part is quoted, so user input can never be read as FTS5 syntax.
+    """
+    parts = []
+    for phrase in _PHRASE.findall(query):
+        terms = _TERM.findall(phrase)
+        if terms:
+            parts.append('"' + " ".join(terms) + '"')
+    for term in _TERM.findall(_PHRASE.sub(" ", query)):
+        if term.lower() not in _STOPWORDS:
+            parts.append(f'"{term}"')
+    return f" {operator} ".join(dict.fromkeys(parts)) or None
+
+
+def _content_hash(*fields: str) -> str:
+    return hashlib.sha256("\x1f".join(fields).encode()).hexdigest()
+
+
+class SearchIndex:
+    """
+    A full-text index over company profiles and news articles, ranked by
+    BM25. It lives in its own SQLite database with FTS5 and is built
+    incrementally: profiles as they are fetched, news as it is ingested.
+    Unchanged documents are not rewritten.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets searches run alongside a write.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    connection.executescript(_SCHEMA)
+                    self._schema_ready = True
+            self._local.connection = connection
+        return connection
+
+    # --- Writes ---
+    def _upsert(
+        self,
+        connection: sqlite3.Connection,
+        kind: str,
+        key: str,
+        tickers: Sequence[str],
+        title: str,
+        body: str,
+        url: Optional[str] = None,
+        published_at: Optional[str] = None,
+    ) -> bool:
+        """Adds or replaces one document. Must be called inside a transaction. Returns False if unchanged."""
+        content_hash = _content_hash(title, body)
+        row = connection.execute(
+            "SELECT id, tickers, content_hash FROM documents WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        if row is None:
+            cursor = connection.execute(
+                "INSERT INTO documents (kind, key, tickers, title, url, published_at, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, " ".join(tickers), title, url, published_at, content_hash),
+            )
+            connection.execute(
+                "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)", (cursor.lastrowid, title, body)
+            )
+            return True
+
+        document_id, stored_tickers, stored_hash = row
+        merged = " ".join(dict.fromkeys(stored_tickers.split() + list(tickers)))
+        if stored_hash == content_hash:
+            if merged != stored_tickers:
+                connection.execute("UPDATE documents SET tickers = ? WHERE id = ?", (merged, document_id))
+            return False
+        connection.execute(
+            "UPDATE documents SET tickers = ?, title = ?, url = ?, published_at = ?, content_hash = ? WHERE id = ?",
+            (merged, title, url, published_at, content_hash, document_id),
+        )
+        connection.execute("DELETE FROM documents_fts WHERE rowid = ?", (document_id,))
+        connection.execute(
+            "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)", (document_id, title, body)
+        )
+        return True
+
+    def index_profile(self, ticker_symbol: str, info: Dict[str, Any]) -> bool:
+        """
+        Indexes a company's name, sector, industry and business summary from
+        its yfinance `.info`. Indexing is best-effort: a failure is logged,
+        never raised to the caller fetching the profile.
+
+        :return: Whether the index changed.
+        """
+        title = info.get("longName") or info.get("shortName") or ticker_symbol
+        body = " ".join(filter(None, (info.get("sector"), info.get("industry"), info.get("longBusinessSummary"))))
+        try:
+            connection = self._connection()
+            with self._write_lock, connection:
+                return self._upsert(connection, "profile", ticker_symbol, [ticker_symbol], title, body)
+        except sqlite3.Error as e:
+            logger.warning("Indexing the profile of %s failed: %s", ticker_symbol, e)
+            return False
+
+    def index_news(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Indexes a batch of (ticker, article) pairs as produced by the news
+        pipeline, one document per story listing every ticker it came with.
+        Stories are keyed by title hash, so syndicated copies under other
+        URLs fold into one document, as they do in the news store.
+        Best-effort, like `index_profile`.
+
+        :return: Number of documents added or changed.
+        """
+        tickers: Dict[str, List[str]] = {}
+        articles: Dict[str, Dict[str, Any]] = {}
+        for ticker_symbol, article in items:
+            tickers.setdefault(article["content_hash"], []).append(ticker_symbol)
+            articles.setdefault(article["content_hash"], article)
+        try:
+            connection = self._connection()
+            with self._write_lock, connection:
+                return sum(
+                    self._upsert(
+                        connection, "news", key, tickers[key], article["title"],
+                        " ".join(filter(None, (article.get("summary"), article.get("publisher")))),
+                        article["url"], article["published_at"].isoformat() + "Z",
+                    )
+                    for key, article in articles.items()
+                )
+        except sqlite3.Error as e:
+            logger.warning("Indexing %d news items failed: %s", len(items), e)
+            return 0
+
+    # --- Queries ---
+    def _query(self, expression: str, kind: Optional[str], ticker_symbol: Optional[str], limit: int) -> List[tuple]:
+        sql = (
+            "SELECT d.kind, d.tickers, d.title, d.url, d.published_at, "
+            "snippet(documents_fts, -1, '[', ']', '...', 16), bm25(documents_fts, ?, ?) AS score "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        parameters: List[Any] = [*_COLUMN_WEIGHTS, expression]
+        if kind is not None:
+            sql += " AND d.kind = ?"
+            parameters.append(kind)
+        if ticker_symbol is not None:
+            sql += " AND (' ' || d.tickers || ' ') LIKE ?"
+            parameters.append(f"% {ticker_symbol} %")
+        sql += " ORDER BY score LIMIT ?"
+        parameters.append(limit)
+        return self._connection().execute(sql, parameters).fetchall()
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        ticker_symbol: Optional[str] = None,
+        limit: int = config.SEARCH_DEFAULT_LIMIT,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search. Documents matching every term come first;
+        if there are none, documents matching any term are returned.
+
+        :param kind: 'profile' or 'news' to search only one kind.
+        :param ticker_symbol: Only documents about this ticker.
+        :return: Best matches first, each with a highlighted snippet.
+        """
+        rows: List[tuple] = []
+        for operator in ("AND", "OR"):
+            expression = match_expression(query, operator)
+            if expression is None:
+                return []
+            rows = self._query(expression, kind, ticker_symbol, limit)
+            if rows:
+                break
+        return [
+            {
+                "kind": row_kind,
+                "tickers": tickers.split(),
+                "title": title,
+                "url": url,
+                "published_at": published_at,
+                "snippet": snippet,
+                # bm25() is lower-is-better; flipped so higher means more relevant.
+                "score": round(-score, 4),
+            }
+            for row_kind, tickers, title, url, published_at, snippet, score in rows
+        ]
+
+    def count(self) -> Dict[str, int]:
+        rows = self._connection().execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall()
+        return {kind: dict(rows).get(kind, 0) for kind in DOCUMENT_KINDS}
+
+
+search_index = SearchIndex(config.SEARCH_INDEX_PATH)
+
+
+def search_documents(
+    query: str,
+    kind: Optional[str] = None,
+    ticker_symbol: Optional[str] = None,
+    limit: int = config.SEARCH_DEFAULT_LIMIT,
+) -> Dict[str, Any]:
+    """
+    Searches company profiles and news articles by keywords or "exact
+    phrases", e.g. to find which companies mention a product, technology or
+    event.
+
+    :param query: Keywords or quoted phrases (e.g., 'green hydrogen').
+    :param kind: 'profile' or 'news' to search only one kind. Default: both.
+    :param ticker_symbol: Only documents about this company (e.g., 'RELIANCE.NS').
+    :param limit: Number of results (at most SEARCH_MAX_LIMIT). Default: 10.
+    """
+    if kind is not None and kind not in DOCUMENT_KINDS:
+        return {"error": f"Invalid kind '{kind}'. Use one of: {', '.join(DOCUMENT_KINDS)}."}
+    if ticker_symbol is not None:
+        try:
+            ticker_symbol = resolve_ticker(ticker_symbol)
+        except ValueError as e:
+            return {"error": str(e)}
+    if match_expression(query) is None:
+        return {"error": "The query has no searchable words."}
+
+    try:
+        results = search_index.search(query, kind, ticker_symbol, max(1, min(limit, config.SEARCH_MAX_LIMIT)))
+    except sqlite3.Error as e:
+        return {"error": f"Search failed: {e}"}
+    return {
+        "query": query,
+        "results": results,
+        # The companies the results are about, in order of their best match.
+        "companies": list(dict.fromkeys(ticker for result in results for ticker in result["tickers"])),
+    }
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.db.models import StatementPeriod, StatementRefresh
+from app.db.session import SessionLocal, init_db, utcnow
+from app.services.statement_table import StatementTable
+
+
+def _period_key(column: Any) -> str:
+    """Statement columns are period-end Timestamps; store them as ISO dates."""
+    return column.date().isoformat() if hasattr(column, "date") else str(column)
+
+
+def _clean_value(value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return value
+    return None if math.isnan(value) else value
+
+
+def _serialize_period(line_items: Dict[str, Any]) -> str:
+    # Keeps yfinance's line item order, which is stable between fetches.
+    return json.dumps({str(name): _clean_value(value) for name, value in line_items.items()})
+
+
+def upsert_statement(ticker_symbol: str, statement_type: str, frequency: str, statement_df) -> Dict[str, int]:
+    """
+    Writes a freshly fetched statement DataFrame (line items x periods) to the
+    store. Only periods that are new or whose values changed are written.
+
+    :return: Counts of inserted, updated and unchanged periods.
+    """
+    init_db()
+    incoming = {
+        _period_key(column): _serialize_period(statement_df[column].to_dict())
+        for column in statement_df.columns
+    }
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    now = utcnow()
+
+    with SessionLocal() as session, session.begin():
+        existing = {
+            row.period: row
+            for row in session.scalars(
+                select(StatementPeriod).where(
+                    StatementPeriod.ticker == ticker_symbol,
+                    StatementPeriod.statement_type == statement_type,
+                    StatementPeriod.frequency == frequency,
+                )
+            )
+        }
+        for period, line_items in incoming.items():
+            content_hash = hashlib.sha256(line_items.encode()).hexdigest()
+            row = existing.get(period)
+            if row is None:
+                session.add(StatementPeriod(
+                    ticker=ticker_symbol,
+                    statement_type=statement_type,
+                    frequency=frequency,
+                    period=period,
+                    line_items=line_items,
+                    content_hash=content_hash,
+                    updated_at=now,
+                ))
+                counts["inserted"] += 1
+            elif row.content_hash != content_hash:
+                row.line_items = line_items
+                row.content_hash = content_hash
+                row.updated_at = now
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+
+        session.merge(StatementRefresh(
+            ticker=ticker_symbol,
+            statement_type=statement_type,
+            frequency=frequency,
+            refreshed_at=now,
+        ))
+
+    return counts
+
+
+def read_statement(ticker_symbol: str, statement_type: str, frequency: str) -> Optional[StatementTable]:
+    """
+    Returns the stored statement as a StatementTable, newest period first, or
+    None if nothing has been stored for it yet.
+    """
+    init_db()
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(StatementPeriod.period, StatementPeriod.line_items)
+            .where(
+                StatementPeriod.ticker == ticker_symbol,
+                StatementPeriod.statement_type == statement_type,
+                StatementPeriod.frequency == frequency,
+            )
+            .order_by(StatementPeriod.period.desc())
+        ).all()
+    if not rows:
+        return None
+    return StatementTable.from_periods(
+        ticker_symbol,
+        statement_type,
+        frequency,
+        {period: json.loads(line_items) for period, line_items in rows},
+    )
+
+
+def last_refreshed(ticker_symbol: str, statement_type: str, frequency: str) -> Optional[datetime]:
+    init_db()
+    with SessionLocal() as session:
+        refresh = session.get(StatementRefresh, (ticker_symbol, statement_type, frequency))
+        return refresh.refreshed_at if refresh else None
+
+
+def is_stale(ticker_symbol: str, statement_type: str, frequency: str, max_age_seconds: float) -> bool:
+    refreshed_at = last_refreshed(ticker_symbol, statement_type, frequency)
+    return refreshed_at is None or utcnow() - refreshed_at > timedelta(seconds=max_age_seconds)
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+def _positions_to_index(positions: List[int]) -> Union[slice, np.ndarray]:
+    """
+    Turns a list of positions into a slice when they form a contiguous,
+    increasing run (so numpy returns a view), otherwise an index array.
+    """
+    if positions and positions == list(range(positions[0], positions[-1] + 1)):
+        return slice(positions[0], positions[-1] + 1)
+    return np.asarray(positions, dtype=np.intp)
+
+
+def format_number(value: float) -> str:
+    """Compact human-readable number for prompts, e.g. 1234567890 -> 1.23B; '-' if missing."""
+    if not math.isfinite(value):
+        return "-"
+    magnitude = abs(value)
+    for threshold, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if magnitude >= threshold:
+            return f"{value / threshold:.3g}{suffix}"
+    return f"{value:.3g}"
+
+
+class StatementTable:
+    """
+    A financial statement held as arrays instead of nested dicts: a tuple of
+    periods (newest first), a tuple of line items, and a float64 matrix of
+    shape (line items x periods) with NaN for missing values.
+
+    Selecting a single period or line item, or a contiguous run of them,
+    returns a view on the same matrix rather than a copy.
+    """
+    __slots__ = ("ticker", "statement_type", "frequency", "periods", "line_items", "values", "_period_index", "_item_index")
+
+    def __init__(
+        self,
+        ticker: str,
+        statement_type: str,
+        frequency: str,
+        periods: Sequence[str],
+        line_items: Sequence[str],
+        values: np.ndarray,
+    ):
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(line_items), len(periods)):
+            raise ValueError(
+                f"values has shape {values.shape}, expected ({len(line_items)}, {len(periods)})."
+            )
+        self.ticker = ticker
+        self.statement_type = statement_type
+        self.frequency = frequency
+        self.periods = tuple(periods)
+        self.line_items = tuple(line_items)
+        self.values = values
+        self._period_index = {period: i for i, period in enumerate(self.periods)}
+        self._item_index = {item: i for i, item in enumerate(self.line_items)}
+
+    # --- Construction ---
+    @classmethod
+    def from_periods(cls, ticker: str, statement_type: str, frequency: str, data: Dict[str, Dict[str, Any]]) -> "StatementTable":
+        """
+        Builds a table from {period: {line_item: value}}, keeping the period
+        order of `data` and the order in which line items first appear.
+        """
+        periods = list(data)
+        line_items = list(dict.fromkeys(item for items in data.values() for item in items))
+        item_index = {item: i for i, item in enumerate(line_items)}
+        values = np.full((len(line_items), len(periods)), np.nan)
+        for column, items in enumerate(data.values()):
+            for item, value in items.items():
+                if value is not None:
+                    values[item_index[item], column] = value
+        return cls(ticker, statement_type, frequency, periods, line_items, values)
+
+    @classmethod
+    def from_dataframe(cls, ticker: str, statement_type: str, frequency: str, statement_df) -> "StatementTable":
+        """Builds a table from a yfinance statement DataFrame (line items x periods)."""
+        periods = [
+            column.date().isoformat() if hasattr(column, "date") else str(column)
+            for column in statement_df.columns
+        ]
+        values = statement_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(ticker, statement_type, frequency, periods, [str(item) for item in statement_df.index], values)
+
+    # --- Access ---
+    def __len__(self) -> int:
+        return len(self.line_items)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def content_hash(self) -> str:
+        """A digest of the periods, line items and values; changes whenever the data does."""
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(self.periods).encode())
+        digest.update(b"\x1e")
+        digest.update("\x1f".join(self.line_items).encode())
+        digest.update(b"\x1e")
+        digest.update(np.ascontiguousarray(self.values).tobytes())
+        return digest.hexdigest()
+
+    def period(self, period: str) -> np.ndarray:
+        """All line items for one period, as a view."""
+        return self.values[:, self._period_index[period]]
+
+    def line_item(self, line_item: str) -> np.ndarray:
+        """One line item across all periods, as a view."""
+        return self.values[self._item_index[line_item]]
+
+    def get(self, line_item: str, period: str) -> Optional[float]:
+        row = self._item_index.get(line_item)
+        column = self._period_index.get(period)
+        if row is None or column is None:
+            return None
+        value = self.values[row, column]
+        return float(value) if math.isfinite(value) else None
+
+    def select(self, periods: Optional[Iterable[str]] = None, line_items: Optional[Iterable[str]] = None) -> "StatementTable":
+        """
+        Returns a table restricted to the given periods and/or line items.
+        Unknown names are ignored. Contiguous selections share memory with
+        this table; others are copied.
+        """
+        period_positions = (
+            [self._period_index[p] for p in periods if p in self._period_index]
+            if periods is not None else list(range(len(self.periods)))
+        )
+        item_positions = (
+            [self._item_index[i] for i in line_items if i in self._item_index]
+            if line_items is not None else list(range(len(self.line_items)))
+        )
+        rows = _positions_to_index(item_positions)
+        columns = _positions_to_index(period_positions)
+        if isinstance(rows, slice) or isinstance(columns, slice):
+            values = self.values[rows, columns]
+        else:
+            values = self.values[np.ix_(rows, columns)]
+        return StatementTable(
+            self.ticker,
+            self.statement_type,
+            self.frequency,
+            [self.periods[i] for i in period_positions],
+            [self.line_items[i] for i in item_positions],
+            values,
+        )
+
+    def reindex_periods(self, periods: Sequence[str]) -> "StatementTable":
+        """
+        Returns a copy laid out on the given period grid, with NaN columns for
+        periods this statement does not have.
+        """
+        values = np.full((len(self.line_items), len(periods)), np.nan)
+        for column, period in enumerate(periods):
+            source = self._period_index.get(period)
+            if source is not None:
+                values[:, column] = self.values[:, source]
+        return StatementTable(self.ticker, self.statement_type, self.frequency, periods, self.line_items, values)
+
+    # --- Serialization ---
+    def to_payload(self) -> Dict[str, Any]:
+        """
+        A JSON-compatible columnar dict: "values" is one row per line item,
+        aligned with "periods", with None for missing or non-finite values.
+        """
+        values = self.values.astype(object)
+        values[~np.isfinite(self.values)] = None
+        return {
+            "ticker": self.ticker,
+            "statement_type": self.statement_type,
+            "frequency": self.frequency,
+            "periods": list(self.periods),
+            "line_items": list(self.line_items),
+            "values": values.tolist(),
+        }
+
+    def to_json(self) -> str:
+        """
+        Serializes the columnar payload straight to JSON text. The matrix is
+        encoded in one pass and NaN tokens are rewritten to null, which is
+        safe because a list of floats cannot contain the text "NaN" otherwise.
+        Infinities (e.g. from a division upstream) are made NaN first, as JSON
+        has no literal for them.
+        """
+        header = json.dumps({
+            "ticker": self.ticker,
+            "statement_type": self.statement_type,
+            "frequency": self.frequency,
+            "periods": self.periods,
+            "line_items": self.line_items,
+        })
+        finite = np.isfinite(self.values)
+        matrix = self.values if finite.all() else np.where(finite, self.values, np.nan)
+        values = json.dumps(matrix.tolist()).replace("NaN", "null")
+        return f'{header[:-1]}, "values": {values}}}'
+
+    def to_dict(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """The nested {period: {line_item: value}} form, for callers that need it."""
+        return {
+            period: {item: self.get(item, period) for item in self.line_items}
+            for period in self.periods
+        }
+
+    def to_prompt_text(self, max_periods: Optional[int] = None) -> str:
+        """
+        A dense pipe-separated table for LLM prompts: one header row of
+        periods, then one row per line item with compact numbers. Line items
+        with no values are dropped.
+        """
+        table = self if max_periods is None else self.select(periods=self.periods[:max_periods])
+        present = ~np.isnan(table.values).all(axis=1)
+        lines = ["line_item|" + "|".join(table.periods)]
+        for item, row, keep in zip(table.line_items, table.values, present):
+            if keep:
+                lines.append(item + "|" + "|".join(format_number(value) for value in row))
+        return "\n".join(lines)
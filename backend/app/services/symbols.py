@@ -0,0 +1,256 @@
+import csv
+import re
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.core import config
+
+# yfinance suffix for each exchange.
+EXCHANGE_SUFFIXES = {"NSE": ".NS", "BSE": ".BO"}
+_SUFFIX_EXCHANGES = {suffix: exchange for exchange, suffix in EXCHANGE_SUFFIXES.items()}
+
+# Header names accepted for each column, so the exchanges' own equity lists
+# (e.g. NSE's EQUITY_L.csv) can be used as the symbols file directly.
+_COLUMN_ALIASES = {
+    "symbol": ("symbol", "security id", "security code"),
+    "exchange": ("exchange",),
+    "isin": ("isin", "isin number", "isin no"),
+    "name": ("name", "name of company", "security name", "issuer name"),
+    "aliases": ("aliases",),
+}
+
+_WELL_FORMED = re.compile(r"\^?[A-Z0-9&\-]{1,20}(\.(NS|BO))?")
+_ISIN = re.compile(r"IN[A-Z0-9]{9}[0-9]")
+
+
+def _normalize_name(text: str) -> str:
+    """Lower-cases and strips punctuation (except '&' and '-') from a name or query."""
+    text = re.sub(r"[^\w&\-\s.]", "", text.lower().replace("'", ""))
+    text = re.sub(r"\.(?!ns\b|bo\b)", " ", text)
+    text = re.sub(r"\b(ltd|limited|inc|corp)\b", " ", text)
+    return " ".join(text.split())
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Symbol(NamedTuple):
+    symbol: str
+    exchange: str
+    isin: str
+    name: str
+
+    @property
+    def ticker(self) -> str:
+        """The yfinance ticker, e.g. 'RELIANCE.NS'."""
+        return self.symbol + EXCHANGE_SUFFIXES.get(self.exchange, ".NS")
+
+
+class SymbolMaster:
+    """
+    An in-memory symbol master for NSE/BSE listings loaded from a CSV file,
+    resolving user input (yfinance tickers, bare symbols, ISINs, company names
+    and aliases, misspelt names) to yfinance tickers:
+
+    - exact lookups by ticker, symbol, ISIN and normalized name are dicts;
+    - a prefix trie over names and symbols serves autocomplete;
+    - a character-trigram inverted index serves fuzzy name matches.
+    """
+    MAX_NGRAM = 5
+
+    def __init__(self, path: str):
+        self._by_ticker: Dict[str, Symbol] = {}
+        self._by_symbol: Dict[str, Symbol] = {}
+        self._by_isin: Dict[str, Symbol] = {}
+        self._names: Dict[str, str] = {}
+        self._trie: Dict[str, dict] = {}
+        self._name_keys: List[str] = []
+        self._name_grams: List[set] = []
+        self._gram_index: Dict[str, List[int]] = defaultdict(list)
+
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                row = self._canonical_row(row)
+                if row["symbol"]:
+                    self._add(row)
+
+    @staticmethod
+    def _canonical_row(row: Dict[str, str]) -> Dict[str, str]:
+        cleaned = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+        return {
+            column: next((cleaned[name] for name in names if cleaned.get(name)), "")
+            for column, names in _COLUMN_ALIASES.items()
+        }
+
+    def _add(self, row: Dict[str, str]):
+        exchange = (row["exchange"] or "NSE").upper()
+        entry = Symbol(row["symbol"].upper(), exchange, row["isin"].upper(), row["name"] or row["symbol"])
+        self._by_ticker.setdefault(entry.ticker, entry)
+        # A bare symbol listed on both exchanges resolves to its NSE listing.
+        if entry.symbol not in self._by_symbol or exchange == "NSE":
+            self._by_symbol[entry.symbol] = entry
+        if entry.isin and (entry.isin not in self._by_isin or exchange == "NSE"):
+            self._by_isin[entry.isin] = entry
+
+        names = [entry.symbol, entry.name] + [alias for alias in row["aliases"].split(";") if alias.strip()]
+        for name in names:
+            key = _normalize_name(name)
+            if not key or key in self._names:
+                continue
+            self._names[key] = entry.ticker
+            node = self._trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault("", []).append(entry.ticker)
+
+            grams = _trigrams(key)
+            position = len(self._name_keys)
+            self._name_keys.append(key)
+            self._name_grams.append(grams)
+            for gram in grams:
+                self._gram_index[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def get(self, ticker: str) -> Optional[Symbol]:
+        return self._by_ticker.get(ticker.upper())
+
+    # --- Lookups ---
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Tickers whose symbol, name or alias starts with `prefix`, shortest names first."""
+        node = self._trie
+        prefix = _normalize_name(prefix)
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        found: List[Tuple[int, str]] = []
+        stack = [(node, len(prefix))]
+        while stack:
+            node, depth = stack.pop()
+            for char, child in node.items():
+                if char == "":
+                    found.extend((depth, ticker) for ticker in child)
+                else:
+                    stack.append((child, depth + 1))
+        found.sort()
+        return list(dict.fromkeys(ticker for _, ticker in found))[:limit]
+
+    def fuzzy(self, text: str, limit: int = 5, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Tickers whose names are most similar to `text` by trigram Dice
+        coefficient, best first, as (ticker, score) pairs.
+        """
+        grams = _trigrams(_normalize_name(text))
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self._gram_index.get(gram, ()):
+                shared[position] += 1
+        scored: Dict[str, float] = {}
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._name_grams[position]))
+            ticker = self._names[self._name_keys[position]]
+            if score >= min_score and score > scored.get(ticker, 0.0):
+                scored[ticker] = score
+        return sorted(scored.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def search(self, text: str, limit: int = 10) -> List[Symbol]:
+        """
+        Listings for a partial or misspelt name, symbol or alias: prefix
+        matches first (for autocomplete), then close fuzzy matches.
+        """
+        tickers = self.complete(text, limit)
+        if len(tickers) < limit:
+            tickers += [
+                ticker for ticker, _ in self.fuzzy(text, limit, min_score=config.SYMBOL_FUZZY_MIN_SCORE / 2)
+                if ticker not in tickers
+            ]
+        return [self._by_ticker[ticker] for ticker in tickers[:limit]]
+
+    def resolve(self, text: str, strict: Optional[bool] = None) -> Optional[str]:
+        """
+        Resolves a ticker, symbol, ISIN or company name to a yfinance ticker.
+
+        Only name-like input (several words, or not symbol-shaped) is matched
+        fuzzily. A single symbol-shaped token that is not listed, in any case,
+        and any other input that matches nothing even fuzzily, is passed through as a symbol (with '.NS' added when
+        there is no exchange suffix) if it is well-formed and `strict` is
+        off; otherwise it does not resolve, so no upstream call is spent on it.
+
+        :param strict: Defaults to SYMBOL_STRICT_MODE.
+        :return: The ticker, or None when the input cannot be resolved.
+        """
+        strict = config.SYMBOL_STRICT_MODE if strict is None else strict
+        cleaned = text.strip()
+        upper = cleaned.upper()
+        if not upper:
+            return None
+        if upper.startswith("^"):
+            return upper if _WELL_FORMED.fullmatch(upper) else None
+        if upper in self._by_ticker:
+            return upper
+        if upper[-3:] in _SUFFIX_EXCHANGES:
+            # An explicit exchange is honoured rather than matched fuzzily.
+            return None if strict or not _WELL_FORMED.fullmatch(upper) else upper
+        if upper in self._by_symbol:
+            return self._by_symbol[upper].ticker
+        if _ISIN.fullmatch(upper):
+            entry = self._by_isin.get(upper)
+            return entry.ticker if entry else None
+
+        key = _normalize_name(cleaned)
+        if key in self._names:
+            return self._names[key]
+        if _WELL_FORMED.fullmatch(upper):
+            # A single symbol-shaped token, in any case, is a symbol the master
+            # does not list, not a misspelt name: hdfcamc must not become HDFCBANK.NS.
+            return None if strict else upper + ".NS"
+        matches = self.fuzzy(cleaned, limit=1, min_score=config.SYMBOL_FUZZY_MIN_SCORE)
+        if matches:
+            return matches[0][0]
+
+        if strict or not _WELL_FORMED.fullmatch(upper):
+            return None
+        return upper + ".NS"
+
+    def find_all(self, query: str) -> List[str]:
+        """
+        Returns the tickers mentioned in a free-text query, in order of
+        appearance. Longer names win over shorter ones ('hdfc life' over
+        'hdfc'), and explicit yfinance symbols such as 'TCS.NS' are accepted
+        as-is.
+        """
+        words = _normalize_name(query).split()
+        found: List[str] = []
+        i = 0
+        while i < len(words):
+            if re.fullmatch(r"[a-z0-9&\-]+\.(ns|bo)", words[i]):
+                found.append(words[i].upper())
+                i += 1
+                continue
+            for size in range(min(self.MAX_NGRAM, len(words) - i), 0, -1):
+                ticker = self._names.get(" ".join(words[i:i + size]))
+                if ticker:
+                    found.append(ticker)
+                    i += size
+                    break
+            else:
+                i += 1
+        return list(dict.fromkeys(found))
+
+
+symbol_master = SymbolMaster(config.SYMBOLS_FILE)
+
+
+def resolve_ticker(ticker_symbol: str) -> str:
+    """
+    Resolves user or LLM input to a yfinance ticker with `symbol_master`.
+    Raises ValueError when it cannot be resolved.
+    """
+    ticker = symbol_master.resolve(ticker_symbol)
+    if ticker is None:
+        raise ValueError(f"Unknown ticker symbol '{ticker_symbol}'.")
+    return ticker
@@ -0,0 +1,222 @@
+import functools
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from curl_cffi import Curl
+from curl_cffi import requests as curl_requests
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from app.core import config
+from app.services.metrics import record_upstream, upstream_retries
+from app.services.ratelimit import TokenBucket, backoff_delay
+from app.services.replay import openai_transport, sdk_httpx
+
+# Responses worth retrying: throttling and gateway/availability errors. A 500
+# usually fails the same way again, so it is returned as-is.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Only these are retried after a connection error, when the server may have
+# already acted on the request.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class HostLimits:
+    """
+    Per-host concurrency slots and token buckets, created on first use and
+    shared by every client in the process.
+    """
+    def __init__(self, max_concurrent: int, rate: float, burst: int):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._slots[host]
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+
+host_limits = HostLimits(
+    config.HTTP_MAX_CONNECTIONS_PER_HOST,
+    config.HTTP_HOST_RATE_LIMIT_PER_SECOND,
+    config.HTTP_HOST_RATE_LIMIT_BURST,
+)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), capped."""
+    value = headers.get("retry-after") if headers else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), config.HTTP_BACKOFF_MAX_SECONDS)
+
+
+# --- yfinance and scraping ---
+class PooledSession(curl_requests.Session):
+    """
+    A curl_cffi session whose connections outlive the threads that use them.
+
+    curl_cffi keeps one curl handle (and so one connection cache) per thread,
+    which makes every short-lived thread, such as the ones `yf.download`
+    starts per ticker, pay for a new TCP and TLS handshake. Here each request
+    checks a handle out of a shared pool instead, so keep-alive connections
+    are reused by whichever thread asks next. Requests also wait for a
+    per-host concurrency slot and rate-limit token, and throttled or failed
+    requests are retried with backoff.
+    """
+    def __init__(
+        self,
+        limits: HostLimits = host_limits,
+        pool_size: int = config.HTTP_POOL_CONNECTIONS,
+        max_retries: int = config.HTTP_MAX_RETRIES,
+        **kwargs,
+    ):
+        kwargs.setdefault("impersonate", "chrome")
+        super().__init__(**kwargs)
+        self.limits = limits
+        self.max_retries = max_retries
+        self._handles: "queue.LifoQueue[Curl]" = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(pool_size)
+        self.stats = {"requests": 0, "retries": 0, "handles": 0}
+
+    @contextmanager
+    def _pooled_handle(self):
+        """Lends this thread a pooled curl handle for the duration of one request."""
+        with self._pool_slots:
+            try:
+                handle = self._handles.get_nowait()
+            except queue.Empty:
+                handle = Curl(debug=self.debug)
+                self.stats["handles"] += 1
+            previous = getattr(self._local, "curl", None)
+            self._local.curl = handle
+            try:
+                yield
+            finally:
+                self._local.curl = previous
+                # The most recently used handle is the most likely to still
+                # hold a live connection, so it is handed out first.
+                self._handles.put(handle)
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlsplit(url).hostname or ""
+        self.stats["requests"] += 1
+        for attempt in range(self.max_retries + 1):
+            if not self.limits.bucket(host).acquire(timeout=config.UPSTREAM_RATE_LIMIT_WAIT_SECONDS):
+                raise curl_requests.RequestsError(f"Timed out waiting for the rate limit of {host}.")
+            delay = None
+            with self.limits.slot(host), self._pooled_handle():
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except curl_requests.RequestsError:
+                    record_upstream(host, "error")
+                    if attempt == self.max_retries or method.upper() not in _IDEMPOTENT_METHODS:
+                        raise
+                else:
+                    record_upstream(host, response.status_code)
+                    if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                        return response
+                    delay = _retry_after(response.headers)
+            self.stats["retries"] += 1
+            upstream_retries.inc(host=host)
+            if delay is None:
+                delay = backoff_delay(attempt, config.HTTP_BACKOFF_BASE_SECONDS, config.HTTP_BACKOFF_MAX_SECONDS)
+            time.sleep(delay)
+
+
+# The session every yfinance call and scraper uses.
+yf_session = PooledSession()
+
+
+# --- OpenAI ---
+# The OpenAI SDK retries throttled and failed requests itself (honouring
+# Retry-After), so its clients only get pooling and per-host limits here. The
+# SDK may be built on an httpx fork, so its types come from `sdk_httpx`.
+def _openai_limits() -> "sdk_httpx.Limits":
+    return sdk_httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry=config.HTTP_KEEPALIVE_SECONDS,
+    )
+
+
+def _throttle(request: "sdk_httpx.Request"):
+    if not host_limits.bucket(request.url.host).acquire(timeout=config.UPSTREAM_RATE_LIMIT_WAIT_SECONDS):
+        raise TimeoutError(f"Timed out waiting for the rate limit of {request.url.host}.")
+
+
+async def _throttle_async(request: "sdk_httpx.Request"):
+    if not await host_limits.bucket(request.url.host).acquire_async(timeout=config.UPSTREAM_RATE_LIMIT_WAIT_SECONDS):
+        raise TimeoutError(f"Timed out waiting for the rate limit of {request.url.host}.")
+
+
+def _count(response: "sdk_httpx.Response"):
+    # Called once per attempt, so retries made by the SDK are counted too.
+    record_upstream(response.request.url.host, response.status_code)
+
+
+async def _count_async(response: "sdk_httpx.Response"):
+    _count(response)
+
+
+def _openai_api_key() -> Optional[str]:
+    # None lets the SDK read OPENAI_API_KEY itself. Replayed responses need
+    # no key, but the SDK refuses to start without one.
+    if config.UPSTREAM_MODE == "replay" and not os.getenv("OPENAI_API_KEY"):
+        return "replay"
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def openai_client() -> OpenAI:
+    """
+    The process-wide synchronous OpenAI client. Raises if no API key is
+    configured; it is created on first successful use.
+    """
+    limits = _openai_limits()
+    return OpenAI(
+        api_key=_openai_api_key(),
+        max_retries=config.HTTP_MAX_RETRIES,
+        timeout=config.OPENAI_TIMEOUT_SECONDS,
+        http_client=DefaultHttpxClient(
+            limits=limits, transport=openai_transport(limits),
+            event_hooks={"request": [_throttle], "response": [_count]},
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def async_openai_client() -> AsyncOpenAI:
+    """The process-wide asynchronous OpenAI client, on the same terms as `openai_client`."""
+    limits = _openai_limits()
+    return AsyncOpenAI(
+        api_key=_openai_api_key(),
+        max_retries=config.HTTP_MAX_RETRIES,
+        timeout=config.OPENAI_TIMEOUT_SECONDS,
+        http_client=DefaultAsyncHttpxClient(
+            limits=limits, transport=openai_transport(limits, asynchronous=True),
+            event_hooks={"request": [_throttle_async], "response": [_count_async]},
+        ),
+    )
@@ -0,0 +1,305 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import config
+from app.services import ratios
+from app.services.ratios import build_input_cube, free_cash_flow, input_series, to_list
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def _round(value: float, digits: int = 2) -> Optional[float]:
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+# --- DCF engine ---
+def dcf_per_share(
+    base_fcf: float,
+    discount: np.ndarray,
+    growth: np.ndarray,
+    terminal_growth: np.ndarray,
+    years: int,
+    net_debt: float,
+    shares: float,
+) -> np.ndarray:
+    """
+    Equity value per share of a two-stage DCF for every scenario at once:
+    free cash flow grows at `growth` for `years`, then at `terminal_growth`
+    forever (Gordon terminal value). The explicit years are summed in closed
+    form (a geometric series), so the cost does not grow with `years`.
+
+    :param discount: (scenarios,) discount rates; the other rate arrays
+                     broadcast against it.
+    :return: (scenarios,) values per share, floored at zero.
+    """
+    ratio = (1 + growth) / (1 + discount)
+    compounded = ratio ** years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # sum of ratio**t for t = 1..years; the ratio == 1 case is the limit.
+        annuity = np.where(np.abs(ratio - 1) < 1e-9, float(years), ratio * (1 - compounded) / (1 - ratio))
+    terminal = compounded * (1 + terminal_growth) / (discount - terminal_growth)
+    equity = base_fcf * (annuity + terminal) - net_debt
+    return np.maximum(equity / shares, 0.0)
+
+
+def sample_assumptions(
+    scenarios: int,
+    discount_rate: float,
+    growth_rate: float,
+    terminal_growth: float,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Draws (discount, growth, terminal growth) for each Monte Carlo scenario
+    from normal distributions around the assumptions. Terminal growth is
+    kept VALUATION_MIN_SPREAD below the scenario's discount rate.
+    """
+    discount = rng.normal(discount_rate, config.VALUATION_DISCOUNT_RATE_STDEV, scenarios)
+    growth = rng.normal(growth_rate, config.VALUATION_GROWTH_STDEV, scenarios)
+    terminal = np.minimum(
+        rng.normal(terminal_growth, config.VALUATION_TERMINAL_GROWTH_STDEV, scenarios),
+        discount - config.VALUATION_MIN_SPREAD,
+    )
+    return discount, growth, terminal
+
+
+def _cagr(series: np.ndarray) -> Optional[float]:
+    """Annual growth between the oldest and latest reported values (newest first), if both are positive."""
+    reported = np.flatnonzero(~np.isnan(series))
+    if len(reported) < 2:
+        return None
+    latest, oldest = series[reported[0]], series[reported[-1]]
+    if latest <= 0 or oldest <= 0:
+        return None
+    return float((latest / oldest) ** (1 / (reported[-1] - reported[0])) - 1)
+
+
+def valuation_inputs(cube: np.ndarray, periods: List[str], price: float) -> Dict[str, Any]:
+    """
+    Derives the DCF inputs of one company from its (1 x inputs x periods)
+    ratio input cube: free cash flow history, the base free cash flow (mean
+    of the last VALUATION_BASE_YEARS), historical growth, net debt and shares.
+
+    :return: The inputs, or {"error": ...} if the company has no positive
+             free cash flow or no share count to value.
+    """
+    fcf = free_cash_flow(cube)[0, : len(periods)]
+    reported = fcf[~np.isnan(fcf)]
+    if not len(reported):
+        return {"error": "No free cash flow history found (operating cash flow and capital expenditure)."}
+    base_fcf = float(reported[: config.VALUATION_BASE_YEARS].mean())
+    if base_fcf <= 0:
+        return {"error": f"A DCF needs positive free cash flow; the recent average is {base_fcf:,.0f}."}
+
+    def latest(name: str) -> float:
+        series = input_series(cube, name)[0, : len(periods)]
+        series = series[~np.isnan(series)]
+        return float(series[0]) if len(series) else np.nan
+
+    shares = latest("shares")
+    if not shares > 0:
+        return {"error": "No share count found in the balance sheet."}
+
+    growth, growth_source = _cagr(fcf), "free_cash_flow"
+    if growth is None:
+        growth, growth_source = _cagr(input_series(cube, "revenue")[0, : len(periods)]), "revenue"
+    if growth is None:
+        growth, growth_source = config.VALUATION_TERMINAL_GROWTH, "default"
+    return {
+        "periods": periods,
+        "free_cash_flow": fcf,
+        "base_free_cash_flow": base_fcf,
+        "historical_growth": growth,
+        "growth_source": growth_source,
+        "net_debt": np.nan_to_num(latest("total_debt")) - np.nan_to_num(latest("cash")),
+        "shares": shares,
+        "current_price": price,
+    }
+
+
+def value_company(
+    inputs: Dict[str, Any],
+    discount_rate: float = config.VALUATION_DISCOUNT_RATE,
+    growth_rate: Optional[float] = None,
+    terminal_growth: float = config.VALUATION_TERMINAL_GROWTH,
+    scenarios: int = config.VALUATION_SCENARIOS,
+    seed: int = config.VALUATION_SEED,
+) -> Dict[str, Any]:
+    """
+    Values a company from `valuation_inputs`: the base case, the sensitivity
+    grid (VALUATION_DISCOUNT_GRID x VALUATION_GROWTH_GRID) and `scenarios`
+    Monte Carlo draws, all laid out on one array and priced in a single
+    vectorized `dcf_per_share` call.
+
+    :param growth_rate: Projection growth. Default: historical growth,
+                        clipped to VALUATION_GROWTH_MIN..VALUATION_GROWTH_MAX.
+    """
+    if growth_rate is None:
+        growth_rate = float(np.clip(inputs["historical_growth"], config.VALUATION_GROWTH_MIN, config.VALUATION_GROWTH_MAX))
+    grid_discount, grid_growth = np.meshgrid(
+        np.array(config.VALUATION_DISCOUNT_GRID), np.array(config.VALUATION_GROWTH_GRID), indexing="ij"
+    )
+    mc_discount, mc_growth, mc_terminal = sample_assumptions(
+        scenarios, discount_rate, growth_rate, terminal_growth, np.random.default_rng(seed)
+    )
+
+    # Row 0 is the base case, then the grid, then the scenarios.
+    discount = np.concatenate(([discount_rate], grid_discount.ravel(), mc_discount))
+    growth = np.concatenate(([growth_rate], grid_growth.ravel(), mc_growth))
+    terminal = np.concatenate((
+        [terminal_growth],
+        np.minimum(terminal_growth, grid_discount.ravel() - config.VALUATION_MIN_SPREAD),
+        mc_terminal,
+    ))
+    values = dcf_per_share(
+        inputs["base_free_cash_flow"], discount, growth, terminal,
+        config.VALUATION_PROJECTION_YEARS, inputs["net_debt"], inputs["shares"],
+    )
+    base_value, grid_values, simulated = values[0], values[1 : grid_discount.size + 1], values[grid_discount.size + 1 :]
+
+    price = inputs["current_price"]
+    # One pass for the reported percentiles and the histogram range; tails
+    # are folded into the outer bins so the histogram shows the body.
+    *percentiles, low, high = np.percentile(simulated, PERCENTILES + (0.5, 99.5))
+    counts, edges = np.histogram(np.clip(simulated, low, high), bins=config.VALUATION_HISTOGRAM_BINS, range=(low, high))
+    priced = np.isfinite(price) and price > 0
+    return {
+        "assumptions": {
+            "discount_rate": discount_rate,
+            "growth_rate": _round(growth_rate, 4),
+            "terminal_growth": terminal_growth,
+            "projection_years": config.VALUATION_PROJECTION_YEARS,
+        },
+        "fair_value": _round(base_value),
+        "current_price": _round(price),
+        "upside": _round(base_value / price - 1, 4) if priced else None,
+        "sensitivity": {
+            "discount_rates": list(config.VALUATION_DISCOUNT_GRID),
+            "growth_rates": list(config.VALUATION_GROWTH_GRID),
+            # One row per discount rate, one column per growth rate.
+            "fair_value": np.round(grid_values.reshape(grid_discount.shape), 2).tolist(),
+        },
+        "monte_carlo": {
+            "scenarios": scenarios,
+            "mean": _round(simulated.mean()),
+            "percentiles": {f"p{p}": _round(value) for p, value in zip(PERCENTILES, percentiles)},
+            "probability_undervalued": _round((simulated > price).mean(), 4) if priced else None,
+            "histogram": {"edges": np.round(edges, 2).tolist(), "counts": counts.tolist()},
+        },
+    }
+
+
+# --- Tools ---
+def _load_inputs(ticker_symbol: str) -> Dict[str, Any]:
+    statements = ratios.load_statements(ticker_symbol, "annual")
+    cube, labels = build_input_cube([statements], config.RATIOS_MAX_PERIODS)
+    if not labels[0]:
+        return {"error": f"No financial statements found for ticker '{ticker_symbol}'."}
+    inputs = valuation_inputs(cube, labels[0], float(ratios.current_prices([ticker_symbol])[0]))
+    inputs["ticker"] = statements["income"].ticker
+    return inputs
+
+
+def calculate_dcf_valuation(
+    ticker_symbol: str,
+    discount_rate: Optional[float] = None,
+    growth_rate: Optional[float] = None,
+    terminal_growth: Optional[float] = None,
+    scenarios: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Performs a Discounted Cash Flow (DCF) valuation from the company's annual
+    free cash flow history: a base-case fair value per share, a sensitivity
+    grid over discount and growth rates, and a Monte Carlo fair-value
+    distribution (percentiles, histogram, probability the stock is
+    undervalued at the current price).
+
+    :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
+    :param discount_rate: Annual discount rate (cost of capital), e.g. 0.12. Default: VALUATION_DISCOUNT_RATE.
+    :param growth_rate: Free cash flow growth over the projection years, e.g. 0.10. Default: historical growth.
+    :param terminal_growth: Growth after the projection years, e.g. 0.04. Default: VALUATION_TERMINAL_GROWTH.
+    :param scenarios: Number of Monte Carlo scenarios (at most VALUATION_MAX_SCENARIOS). Default: 100,000.
+    """
+    discount_rate = config.VALUATION_DISCOUNT_RATE if discount_rate is None else discount_rate
+    terminal_growth = config.VALUATION_TERMINAL_GROWTH if terminal_growth is None else terminal_growth
+    if discount_rate - terminal_growth < config.VALUATION_MIN_SPREAD:
+        return {"error": f"The discount rate must exceed terminal growth by at least {config.VALUATION_MIN_SPREAD:.0%}."}
+    scenarios = max(1, min(scenarios or config.VALUATION_SCENARIOS, config.VALUATION_MAX_SCENARIOS))
+
+    try:
+        inputs = _load_inputs(ticker_symbol)
+    except Exception as e:
+        return {"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}
+    if "error" in inputs:
+        return inputs
+
+    valuation = value_company(inputs, discount_rate, growth_rate, terminal_growth, scenarios)
+    return {
+        "ticker": inputs["ticker"],
+        "latest_period": inputs["periods"][0],
+        "inputs": {
+            "periods": inputs["periods"],
+            "free_cash_flow": to_list(inputs["free_cash_flow"]),
+            "base_free_cash_flow": _round(inputs["base_free_cash_flow"], 0),
+            "historical_growth": _round(inputs["historical_growth"], 4),
+            "growth_source": inputs["growth_source"],
+            "net_debt": _round(inputs["net_debt"], 0),
+            "shares": _round(inputs["shares"], 0),
+        },
+        **valuation,
+    }
+
+
+def estimate_fair_value(ticker_symbol: str, peer_tickers: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Estimates a stock's fair value with several models and compares it with
+    the current price: the median of the DCF Monte Carlo distribution and,
+    when peers are given, the peer median P/E times the company's EPS and
+    the peer median P/B times its book value per share.
+
+    :param ticker_symbol: The stock ticker symbol (e.g., 'RELIANCE.NS').
+    :param peer_tickers: Optional peer ticker symbols for the multiples models.
+    """
+    dcf = calculate_dcf_valuation(ticker_symbol)
+    models: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    price = dcf.get("current_price")
+    if "error" in dcf:
+        errors["dcf"] = dcf["error"]
+    else:
+        percentiles = dcf["monte_carlo"]["percentiles"]
+        models["dcf"] = {"fair_value": percentiles["p50"], "range": [percentiles["p25"], percentiles["p75"]]}
+
+    if peer_tickers:
+        peers = ratios.compare_with_industry_peers(peer_tickers)
+        own = ratios.get_financial_ratios(ticker_symbol)
+        if "error" in peers or "error" in own:
+            errors["multiples"] = peers.get("error") or own.get("error")
+        else:
+            for model, multiple, per_share in (
+                ("pe_multiple", "pe_ratio", "eps"), ("pb_multiple", "pb_ratio", "book_value_per_share"),
+            ):
+                peer_multiple, value = peers["peer_median"][multiple], own["ratios"][per_share]
+                if peer_multiple and value and peer_multiple > 0 and value > 0:
+                    models[model] = {"fair_value": _round(peer_multiple * value), "peer_median": _round(peer_multiple)}
+                else:
+                    errors[model] = f"No positive peer median {multiple} and company {per_share}."
+
+    if not models:
+        return {"error": f"Could not value ticker '{ticker_symbol}'.", "details": errors}
+    if price is None:
+        try:
+            price = _round(float(ratios.current_prices([ticker_symbol])[0]))
+        except Exception as e:
+            return {"error": f"An error occurred for ticker '{ticker_symbol}': {e}"}
+    fair_value = float(np.mean([model["fair_value"] for model in models.values()]))
+    return {
+        "ticker": dcf.get("ticker", ticker_symbol),
+        # The average of the models' fair values.
+        "fair_value": _round(fair_value),
+        "current_price": price,
+        "upside": _round(fair_value / price - 1, 4) if price else None,
+        "models": models,
+        "errors": errors,
+    }
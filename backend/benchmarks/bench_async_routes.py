@@ -0,0 +1,114 @@
+"""
+Load benchmark for the company price and chat routes, comparing the original
+synchronous handlers against the async request path.
+
+Upstreams are stubbed: yfinance calls block their thread for UPSTREAM_LATENCY
+seconds and the OpenAI tool-selection call takes LLM_LATENCY seconds. The
+"before" app reproduces the original `def` endpoints, which run on the server's
+default threadpool; the "after" app is the real application.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_async_routes --requests 400 --concurrency 200
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from app.core import config
+from app.services import executor, orchestrator, scraper
+
+UPSTREAM_LATENCY = 0.2
+LLM_LATENCY = 0.3
+
+
+def stub_price(ticker_symbol: str):
+    time.sleep(UPSTREAM_LATENCY)
+    return {"symbol": ticker_symbol, "currentPrice": 100.0}
+
+
+def _tool_call_response():
+    call = SimpleNamespace(
+        id="call_1",
+        type="function",
+        function=SimpleNamespace(name="get_stock_price_data", arguments='{"ticker_symbol": "TCS.NS"}'),
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))])
+
+
+class StubAsyncCompletions:
+    async def create(self, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        return _tool_call_response()
+
+
+def build_before_app() -> FastAPI:
+    """The original request path: blocking handlers on the default threadpool."""
+    app = FastAPI()
+
+    @app.get("/api/v1/company/{ticker}/price")
+    def get_company_price(ticker: str):
+        return {"ticker": ticker.upper(), "data": stub_price(ticker.upper())}
+
+    @app.post("/api/v1/chat/")
+    def handle_chat(body: dict):
+        time.sleep(LLM_LATENCY)
+        return {"response": stub_price("TCS.NS")}
+
+    return app
+
+
+def build_after_app(executor_workers: int) -> FastAPI:
+    from app.main import app
+
+    executor.upstream_executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="upstream")
+    scraper.get_stock_price_data = stub_price
+    orchestrator.tool_map["get_stock_price_data"] = stub_price
+    orchestrator.client = SimpleNamespace(chat=SimpleNamespace(completions=StubAsyncCompletions()))
+    return app
+
+
+async def drive(app: FastAPI, method: str, url: str, total: int, concurrency: int) -> float:
+    """Issues `total` requests with at most `concurrency` in flight; returns requests/sec."""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one():
+            async with semaphore:
+                if method == "GET":
+                    response = await client.get(url)
+                else:
+                    response = await client.post(url, json={"query": "price of TCS"})
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def main(total: int, concurrency: int, executor_workers: int):
+    before = build_before_app()
+    after = build_after_app(executor_workers)
+    routes = [("GET", "/api/v1/company/TCS.NS/price"), ("POST", "/api/v1/chat/")]
+
+    print(f"{total} requests, concurrency {concurrency}, upstream {UPSTREAM_LATENCY}s, "
+          f"LLM {LLM_LATENCY}s, upstream executor {executor_workers} workers")
+    print(f"{'route':<32}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+    for method, url in routes:
+        before_rps = await drive(before, method, url, total, concurrency)
+        after_rps = await drive(after, method, url, total, concurrency)
+        print(f"{method + ' ' + url:<32}{before_rps:>14.1f}{after_rps:>14.1f}{after_rps / before_rps:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--executor-workers", type=int, default=config.UPSTREAM_EXECUTOR_WORKERS)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.executor_workers))
@@ -0,0 +1,78 @@
+"""
+Benchmark for the batch quote path: per-ticker cost of
+`scraper.get_batch_stock_price_data` as the batch grows, against looping over
+`scraper.get_stock_price_data` (one `.info` round-trip per ticker).
+
+yfinance is stubbed. A bulk download costs DOWNLOAD_LATENCY seconds regardless
+of size (one grouped request), an `.info` call costs INFO_LATENCY seconds.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batch_quotes
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.services import scraper
+from app.services.cache import ticker_cache
+from app.services.ratelimit import TokenBucket
+
+DOWNLOAD_LATENCY = 0.25
+INFO_LATENCY = 0.05
+
+
+def stub_download(tickers, **kwargs):
+    time.sleep(DOWNLOAD_LATENCY)
+    index = pd.date_range("2025-01-01", periods=5, freq="B")
+    fields = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+    columns = pd.MultiIndex.from_product([fields, tickers], names=["Price", "Ticker"])
+    values = np.random.default_rng(0).uniform(100, 200, size=(len(index), len(columns)))
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+class StubTicker:
+    def __init__(self, ticker_symbol, session=None):
+        self.ticker_symbol = ticker_symbol
+
+    @property
+    def info(self):
+        time.sleep(INFO_LATENCY)
+        return {"shortName": self.ticker_symbol, "currentPrice": 100.0, "previousClose": 99.0}
+
+
+def main(sizes):
+    scraper.yf = SimpleNamespace(download=stub_download, Ticker=StubTicker)
+    # Measure fetch cost only, not the upstream rate limit.
+    scraper.upstream_limiter = TokenBucket(rate=1e9, capacity=10**9)
+    print(f"bulk download latency {DOWNLOAD_LATENCY}s, .info latency {INFO_LATENCY}s")
+    print(f"{'tickers':>8}{'loop ms':>12}{'batch ms':>12}{'batch ms/ticker':>18}{'local us/ticker':>18}")
+    for size in sizes:
+        tickers = [f"SYM{i}.NS" for i in range(size)]
+
+        ticker_cache.clear()
+        loop_ms = None
+        if size <= 100:
+            started = time.perf_counter()
+            for ticker in tickers:
+                scraper.get_stock_price_data(ticker)
+            loop_ms = (time.perf_counter() - started) * 1000
+
+        ticker_cache.clear()
+        started = time.perf_counter()
+        payload = scraper.get_batch_stock_price_data(tickers)
+        batch_ms = (time.perf_counter() - started) * 1000
+        assert payload["status"].count("ok") == size
+
+        local_us = (batch_ms - DOWNLOAD_LATENCY * 1000) * 1000 / size
+        loop = f"{loop_ms:>12.0f}" if loop_ms is not None else f"{'-':>12}"
+        print(f"{size:>8}{loop}{batch_ms:>12.0f}{batch_ms / size:>18.2f}{local_us:>18.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 250, 500])
+    main(parser.parse_args().sizes)
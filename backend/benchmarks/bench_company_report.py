@@ -0,0 +1,118 @@
+"""
+Benchmark for the company report: latency of a cold report (nothing cached
+or stored), of a warm one (repeat request within the freshness windows), of
+running the same sections one after another, and of a cold report whose news
+upstream hangs past the deadline.
+
+yfinance is stubbed: every upstream property (.info, .news, each statement)
+and the bulk quote download costs --upstream-ms. Runs against a throwaway
+database, price store and search index, so no network is used.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_company_report --upstream-ms 300 --reports 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+
+def main(upstream_ms: float, reports: int, slow_ms: float, deadline: float):
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'report.db')}"
+    os.environ["SEARCH_INDEX_PATH"] = os.path.join(directory, "search_index.db")
+    os.environ["PRICE_STORE_DIR"] = os.path.join(directory, "price_store")
+    # Imported after the environment is set, so the stores use the throwaway directory.
+    from app.core import config
+    from app.services import scraper
+    from app.services.ratelimit import TokenBucket
+    from app.services.report import REPORT_SECTIONS, _run_section, build_company_report
+
+    line_items = [item for items in config.PROMPT_LINE_ITEMS.values() for item in items]
+    periods = pd.date_range("2021-03-31", periods=5, freq="12ME")[::-1]
+    slow_news = set()
+
+    def upstream(seconds: float = upstream_ms / 1000):
+        time.sleep(seconds)
+
+    class StubTicker:
+        def __init__(self, ticker_symbol, session=None):
+            self.ticker_symbol = ticker_symbol
+
+        def __getattr__(self, attribute):
+            # Statement properties: income_stmt, quarterly_balance_sheet, ...
+            upstream()
+            values = np.random.default_rng(len(attribute)).uniform(1e9, 1e11, size=(len(line_items), len(periods)))
+            return pd.DataFrame(values, index=line_items, columns=periods)
+
+        @property
+        def info(self):
+            upstream()
+            return {"shortName": self.ticker_symbol, "longName": f"{self.ticker_symbol} Limited",
+                    "currentPrice": 100.0, "previousClose": 99.0, "sector": "Energy",
+                    "longBusinessSummary": "Refining, retail and digital services."}
+
+        @property
+        def news(self):
+            upstream(slow_ms / 1000 if self.ticker_symbol in slow_news else upstream_ms / 1000)
+            now = int(time.time())
+            return [{"title": f"{self.ticker_symbol} story {i}", "link": f"https://news.example.com/{self.ticker_symbol}/{i}",
+                     "providerPublishTime": now - i * 600, "publisher": "Example Wire"} for i in range(10)]
+
+    def stub_download(tickers, **kwargs):
+        upstream()
+        columns = pd.MultiIndex.from_product([["Close", "High", "Low", "Open", "Volume"], tickers])
+        index = pd.date_range("2026-01-01", periods=5, freq="B")
+        return pd.DataFrame(100.0, index=index, columns=columns)
+
+    scraper.yf = SimpleNamespace(Ticker=StubTicker, download=stub_download)
+    # Measure fetch cost only, not the upstream rate limit.
+    scraper.upstream_limiter = TokenBucket(rate=1e9, capacity=10**9)
+
+    def report(ticker_symbol: str, report_deadline: float = config.REPORT_DEADLINE_SECONDS):
+        started = time.perf_counter()
+        result = asyncio.run(build_company_report(ticker_symbol, report_deadline))
+        return (time.perf_counter() - started) * 1000, result
+
+    sequential_ms = []
+    for i in range(reports):
+        started = time.perf_counter()
+        for name in REPORT_SECTIONS:
+            _run_section(name, f"SEQ{i}.NS")
+        sequential_ms.append((time.perf_counter() - started) * 1000)
+
+    cold_ms, warm_ms = [], []
+    for i in range(reports):
+        elapsed, result = report(f"SYM{i}.NS")
+        assert result["complete"], result["pending"]
+        errors = {name: section["error"] for name, section in result["sections"].items() if section["status"] == "error"}
+        assert not errors, errors
+        cold_ms.append(elapsed)
+        warm_ms.append(report(f"SYM{i}.NS")[0])
+
+    print(f"{len(REPORT_SECTIONS)} sections, upstream calls stubbed at {upstream_ms:.0f} ms, median of {reports}")
+    print(f"sequential sections: {statistics.median(sequential_ms):>8.0f} ms")
+    print(f"cold report:         {statistics.median(cold_ms):>8.0f} ms")
+    print(f"warm report:         {statistics.median(warm_ms):>8.1f} ms")
+
+    slow_news.add("SLOW.NS")
+    elapsed, result = report("SLOW.NS", deadline)
+    print(f"news upstream at {slow_ms:.0f} ms, deadline {deadline:.1f} s: report in {elapsed:.0f} ms, "
+          f"pending {result['pending']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--upstream-ms", type=float, default=300)
+    parser.add_argument("--reports", type=int, default=5)
+    parser.add_argument("--slow-ms", type=float, default=5000)
+    parser.add_argument("--deadline", type=float, default=1.5)
+    args = parser.parse_args()
+    main(args.upstream_ms, args.reports, args.slow_ms, args.deadline)
@@ -0,0 +1,91 @@
+"""
+Benchmark for the two-company comparison prompt: the raw nested-dict prompt
+the tool originally sent, the full pipe-separated tables, and the compacted
+table from `prompt_builder` (key line items, aligned periods, precomputed
+growth and differences, token budget).
+
+Reports estimated prompt tokens and end-to-end latency against a stubbed
+LLM whose response time grows with prompt length (prefill cost), so the
+effect of the prompt size is measured without network access.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_compare_prompt --pairs 50 --ms-per-1k-tokens 40
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core import config
+from app.services.prompt_builder import build_comparison_table, estimate_tokens
+from app.services.statement_table import StatementTable
+
+LINE_ITEMS = config.PROMPT_LINE_ITEMS["income"] + [f"Other Line Item {i}" for i in range(60)]
+PERIODS = 5
+
+
+def synthetic_statement(ticker: str, seed: int, year_end: str) -> StatementTable:
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-1e11, 1e11, size=(len(LINE_ITEMS), PERIODS))
+    values[rng.random(values.shape) < 0.15] = np.nan
+    periods = pd.date_range(year_end, periods=PERIODS, freq="12ME")[::-1]
+    return StatementTable.from_dataframe(ticker, "income", "annual", pd.DataFrame(values, index=LINE_ITEMS, columns=periods))
+
+
+def raw_prompt(first: StatementTable, second: StatementTable) -> str:
+    return f"Company 1 ({first.ticker}):\n{first.to_dict()}\n\nCompany 2 ({second.ticker}):\n{second.to_dict()}"
+
+
+def table_prompt(first: StatementTable, second: StatementTable) -> str:
+    return f"Company 1 ({first.ticker}):\n{first.to_prompt_text()}\n\nCompany 2 ({second.ticker}):\n{second.to_prompt_text()}"
+
+
+def compact_prompt(first: StatementTable, second: StatementTable) -> str:
+    return build_comparison_table([first, second], "income")[0]
+
+
+def stub_llm(prompt: str, base_ms: float, ms_per_1k_tokens: float) -> float:
+    """Sleeps for a modeled completion latency and returns it in seconds."""
+    seconds = (base_ms + ms_per_1k_tokens * estimate_tokens(prompt) / 1000) / 1000
+    time.sleep(seconds)
+    return seconds
+
+
+def main(pairs: int, base_ms: float, ms_per_1k_tokens: float):
+    statements = [
+        (synthetic_statement("AAA.NS", 2 * i, "2020-03-31"), synthetic_statement("BBB.NS", 2 * i + 1, "2019-12-31"))
+        for i in range(pairs)
+    ]
+    print(f"{pairs} comparisons of {len(LINE_ITEMS)} line items x {PERIODS} periods, "
+          f"stub LLM {base_ms:.0f} ms + {ms_per_1k_tokens:.0f} ms per 1K prompt tokens")
+    print(f"{'prompt':<12}{'tokens':>10}{'build (us)':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+
+    baseline = None
+    for name, build in (("raw dict", raw_prompt), ("full table", table_prompt), ("compact", compact_prompt)):
+        tokens, build_seconds, latencies = [], [], []
+        for first, second in statements:
+            started = time.perf_counter()
+            prompt = build(first, second)
+            build_seconds.append(time.perf_counter() - started)
+            tokens.append(estimate_tokens(prompt))
+            stub_llm(prompt, base_ms, ms_per_1k_tokens)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        mean_tokens = statistics.mean(tokens)
+        baseline = baseline or mean_tokens
+        print(f"{name:<12}{mean_tokens:>10.0f}{statistics.mean(build_seconds) * 1e6:>12.0f}"
+              f"{latencies[len(latencies) // 2] * 1000:>10.1f}"
+              f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000:>10.1f}"
+              f"   ({baseline / mean_tokens:.1f}x fewer tokens)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=50)
+    parser.add_argument("--base-ms", type=float, default=300)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=40)
+    args = parser.parse_args()
+    main(args.pairs, args.base_ms, args.ms_per_1k_tokens)
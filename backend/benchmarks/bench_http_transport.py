@@ -0,0 +1,137 @@
+"""
+Benchmark for the pooled HTTP transport: connections opened (each one a TCP
+and TLS handshake) and wall time for the two request patterns it replaces.
+
+- yfinance: batches of requests each made from fresh threads, as
+  `yf.download` does per ticker. A plain curl_cffi session keeps one handle
+  per thread, so every new thread opens a new connection; `PooledSession`
+  lends pooled handles to whichever thread asks.
+- OpenAI: sequential calls with a new client each time (what `OpenAI()` per
+  call did) versus one shared, pooled client.
+
+Requests go to a local HTTPS server with a throwaway self-signed
+certificate, so no network is used; handshakes to a real upstream cost a
+network round trip or two more than they do here.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_http_transport --batches 20 --threads 8 --calls 100
+"""
+import argparse
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from curl_cffi import requests as curl_requests
+
+from app.services.transport import HostLimits, PooledSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send each response in one segment, so Nagle's algorithm and delayed
+    # ACKs do not add ~40 ms to every request on a reused connection.
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with _Handler.lock:
+            _Handler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(directory: str) -> str:
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"https://localhost:{server.server_address[1]}/"
+
+
+def _measure(run) -> tuple:
+    before = _Handler.connections
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started, _Handler.connections - before
+
+
+def _thread_batches(session, url: str, batches: int, threads: int):
+    def get():
+        session.get(url, verify=False)
+
+    for _ in range(batches):
+        workers = [threading.Thread(target=get) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+
+def _per_call_clients(url: str, calls: int):
+    for _ in range(calls):
+        with httpx.Client(verify=False) as client:
+            client.post(url, json={})
+
+
+def _shared_client(url: str, calls: int):
+    with httpx.Client(verify=False, limits=httpx.Limits(keepalive_expiry=60)) as client:
+        for _ in range(calls):
+            client.post(url, json={})
+
+
+def main(batches: int, threads: int, calls: int):
+    with tempfile.TemporaryDirectory() as directory:
+        url = _serve(directory)
+        requests = batches * threads
+        unlimited = HostLimits(max_concurrent=threads, rate=1e9, burst=10 ** 9)
+
+        print(f"{'pattern':<34}{'requests':>9}{'connections':>13}{'wall (ms)':>11}{'per request (ms)':>18}")
+        rows = [
+            ("yfinance, per-thread session", requests,
+             lambda: _thread_batches(curl_requests.Session(impersonate="chrome"), url, batches, threads)),
+            ("yfinance, PooledSession", requests,
+             lambda: _thread_batches(PooledSession(limits=unlimited, pool_size=threads), url, batches, threads)),
+            ("OpenAI, new client per call", calls, lambda: _per_call_clients(url, calls)),
+            ("OpenAI, shared client", calls, lambda: _shared_client(url, calls)),
+        ]
+        for name, count, run in rows:
+            seconds, connections = _measure(run)
+            print(f"{name:<34}{count:>9}{connections:>13}{seconds * 1000:>11.0f}{seconds * 1000 / count:>18.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args()
+    main(args.batches, args.threads, args.calls)
@@ -0,0 +1,85 @@
+"""
+Benchmark for the news pipeline: throughput of one ingestion poll over many
+tickers (with syndicated duplicates across them), of a repeat poll once the
+cursors have advanced, and the latency of serving a ticker's latest news
+from the store versus an upstream fetch per request.
+
+Upstream feeds are synthetic and the upstream fetch is stubbed with a fixed
+latency, so no network is used. Runs against a throwaway SQLite database.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_news_ingest --tickers 200 --items 20 --fetch-ms 300
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def synthetic_feed(ticker_symbol: str, items: int, now: int):
+    # Every third story is syndicated: the same title under each ticker's
+    # own URL, as when one wire story runs on several sites.
+    return [
+        {
+            "uuid": f"{ticker_symbol}-{i}",
+            "title": f"Sector update {i}" if i % 3 == 0 else f"{ticker_symbol} story {i}",
+            "link": f"https://news.example.com/{ticker_symbol}/{i}?utm_source=feed",
+            "providerPublishTime": now - i * 600,
+            "publisher": "Example Wire",
+        }
+        for i in range(items)
+    ]
+
+
+def main(tickers: int, items: int, fetch_ms: float, requests: int):
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'news.db')}"
+    # Imported after DATABASE_URL is set, so the engine uses the throwaway database.
+    from app.services import news_store
+    from app.services.news_ingest import ingest_news
+
+    now = int(time.time())
+    symbols = [f"SYM{i}.NS" for i in range(tickers)]
+    feeds = {symbol: synthetic_feed(symbol, items, now) for symbol in symbols}
+
+    started = time.perf_counter()
+    first = ingest_news(symbols, feeds.get)
+    first_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    repeat = ingest_news(symbols, feeds.get)
+    repeat_seconds = time.perf_counter() - started
+
+    total = tickers * items
+    print(f"first poll:  {total} items in {first_seconds * 1000:.0f} ms "
+          f"({total / first_seconds:,.0f} items/s), {first['articles']} articles, "
+          f"{first['mentions']} mentions, {first['duplicates']} duplicates")
+    print(f"repeat poll: {total} items in {repeat_seconds * 1000:.0f} ms, "
+          f"{repeat['articles']} new articles, {repeat['duplicates']} at the cursor")
+
+    def upstream(ticker_symbol):
+        time.sleep(fetch_ms / 1000)
+        return feeds[ticker_symbol]
+
+    upstream_ms, store_ms = [], []
+    for i in range(requests):
+        symbol = symbols[i % tickers]
+        started = time.perf_counter()
+        upstream(symbol)
+        upstream_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        news_store.latest_news(symbol, 10)
+        store_ms.append((time.perf_counter() - started) * 1000)
+    print(f"latest 10 per request: upstream fetch {statistics.median(upstream_ms):.1f} ms, "
+          f"store read {statistics.median(store_ms):.2f} ms (median of {requests})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--fetch-ms", type=float, default=300)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    main(args.tickers, args.items, args.fetch_ms, args.requests)
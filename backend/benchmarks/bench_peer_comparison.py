@@ -0,0 +1,59 @@
+"""
+Benchmark for the N-way peer comparison: time to prepare a comparison of N
+companies (statement loads + matrix + prompt) with the loads run one after
+another versus fanned out concurrently, and the prompt tokens of one peer
+prompt versus the N*(N-1)/2 pairwise prompts the two-company tool would need.
+
+Statement loads are stubbed with a fixed latency, so no network is used.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_peer_comparison --peers 10 20 --load-ms 250
+"""
+import argparse
+import time
+from itertools import combinations
+
+from app.core import config
+from app.services import comparison
+from app.services.prompt_builder import build_comparison_table, estimate_tokens
+from benchmarks.bench_compare_prompt import synthetic_statement
+
+
+def main(peer_counts, load_ms: float):
+    config.LLM_CACHE_ENABLED = False
+    tables = {f"PEER{i}.NS": synthetic_statement(f"PEER{i}.NS", i, "2020-03-31") for i in range(max(peer_counts))}
+
+    def load(ticker_symbol, statement_type, frequency):
+        time.sleep(load_ms / 1000)
+        return tables[ticker_symbol]
+
+    comparison.scraper.get_statement_table = load
+    print(f"statement loads stubbed at {load_ms:.0f} ms each")
+    print(f"{'peers':>6}{'sequential (ms)':>17}{'concurrent (ms)':>17}{'peer tokens':>13}{'pairwise tokens':>17}")
+    for peers in peer_counts:
+        tickers = list(tables)[:peers]
+
+        started = time.perf_counter()
+        for ticker in tickers:
+            load(ticker, "income", "annual")
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        prepared = comparison.prepare_peer_comparison(tickers, "income")
+        concurrent = time.perf_counter() - started
+
+        pairwise = sum(
+            estimate_tokens(build_comparison_table([tables[a], tables[b]], "income")[0])
+            for a, b in combinations(tickers, 2)
+        )
+        print(f"{peers:>6}{sequential * 1000:>17.0f}{concurrent * 1000:>17.0f}"
+              f"{estimate_tokens(prepared['prompt']):>13}{pairwise:>17}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peers", type=int, nargs="+", default=[3, 10, 20])
+    parser.add_argument("--load-ms", type=float, default=250)
+    args = parser.parse_args()
+    main(args.peers, args.load_ms)
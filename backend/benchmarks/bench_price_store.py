@@ -0,0 +1,78 @@
+"""
+Benchmark for the columnar OHLCV store: a multi-ticker, multi-year
+date-range query served from the columnar store versus parsing the same
+history from per-ticker CSV files with pandas.
+
+Histories are synthetic and written to a temporary directory.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_price_store --tickers 50 --years 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.price_store import FIELDS, PriceStore
+
+
+def synthetic_history(seed: int, years: int):
+    dates = pd.bdate_range(end="2024-12-31", periods=years * 252)
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    columns = {field: close for field in FIELDS if field != "volume"}
+    columns["volume"] = rng.uniform(1e5, 1e7, len(dates))
+    return dates.values.astype("datetime64[D]"), columns
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(tickers: int, years: int):
+    with tempfile.TemporaryDirectory() as root:
+        store = PriceStore(os.path.join(root, "store"))
+        symbols = [f"SYM{i}.NS" for i in range(tickers)]
+        for i, symbol in enumerate(symbols):
+            dates, columns = synthetic_history(i, years)
+            store.append(symbol, dates, columns)
+            pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name="date")).to_csv(os.path.join(root, f"{symbol}.csv"))
+
+        start, end = "2019-01-01", "2023-12-31"
+
+        def from_store():
+            return store.read_matrix(symbols, "adj_close", start, end)
+
+        def from_csv():
+            frames = [
+                pd.read_csv(os.path.join(root, f"{symbol}.csv"), index_col="date", parse_dates=True).loc[start:end, "adj_close"]
+                for symbol in symbols
+            ]
+            return pd.concat(frames, axis=1)
+
+        def single_store():
+            return store.read(symbols[0], start, end)
+
+        store_seconds, csv_seconds = timed(from_store), timed(from_csv)
+        print(f"{tickers} tickers x {years} years of daily bars, query {start}..{end}")
+        print(f"{'':<32}{'store':>12}{'csv':>12}{'factor':>10}")
+        print(f"{'multi-ticker matrix (ms)':<32}{store_seconds * 1000:>12.2f}{csv_seconds * 1000:>12.2f}"
+              f"{csv_seconds / store_seconds:>9.1f}x")
+        print(f"{'single-ticker range (us)':<32}{timed(single_store, 1000) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--years", type=int, default=20)
+    args = parser.parse_args()
+    main(args.tickers, args.years)
@@ -0,0 +1,101 @@
+"""
+Benchmark for the full-text search index: incremental build time and query
+latency (median and p95) over tens of thousands of synthetic profiles and
+news articles, versus scanning every document's text for the query words.
+
+Runs against a throwaway index file, so no network or database is used.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_search_index --profiles 5000 --news 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.services.search_index import SearchIndex
+
+_WORDS = (
+    "revenue growth margin refinery retail telecom digital cloud services banking credit loan deposit "
+    "steel cement power renewable solar wind battery electric vehicle pharma generic api export "
+    "consumer brand rural urban infrastructure road port airport logistics insurance premium claims "
+    "software consulting outsourcing chemicals fertiliser textile automobile tractor two-wheeler "
+    "mining coal gas pipeline city distribution hospital diagnostics education media entertainment"
+).split()
+_TOPICS = ("green hydrogen", "semiconductor fab", "data centre", "rare earth", "sodium ion")
+_QUERIES = ("green hydrogen", '"semiconductor fab" subsidy', "solar battery", "refinery margin", "sodium ion cells")
+
+
+# Filler vocabulary with a Zipf-like frequency, so domain words are about as
+# rare as they are in real text rather than in every other document.
+_FILLER = [f"w{i}" for i in range(20000)]
+_FILLER_WEIGHTS = [1 / (rank + 1) for rank in range(len(_FILLER))]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    domain = max(1, words // 10)
+    text = rng.choices(_FILLER, weights=_FILLER_WEIGHTS, k=words - domain) + rng.choices(_WORDS, k=domain)
+    rng.shuffle(text)
+    if rng.random() < 0.05:
+        text.insert(rng.randrange(len(text)), rng.choice(_TOPICS))
+    return " ".join(text)
+
+
+def main(profiles: int, news: int, batch_size: int, queries: int):
+    rng = random.Random(7)
+    index = SearchIndex(os.path.join(tempfile.mkdtemp(), "search_index.db"))
+    tickers = [f"SYM{i}.NS" for i in range(profiles)]
+    documents = []
+
+    started = time.perf_counter()
+    for ticker in tickers:
+        info = {"longName": f"{ticker} Limited", "sector": rng.choice(_WORDS), "industry": rng.choice(_WORDS),
+                "longBusinessSummary": _text(rng, 120)}
+        index.index_profile(ticker, info)
+        documents.append(f'{info["longName"]} {info["longBusinessSummary"]}')
+    profile_seconds = time.perf_counter() - started
+
+    published = datetime(2026, 1, 1)
+    items = []
+    for i in range(news):
+        title, summary = _text(rng, 10), _text(rng, 40)
+        article = {"url_hash": f"u{i}", "content_hash": f"c{i}", "url": f"https://news.example.com/{i}",
+                   "title": title, "publisher": "Example Wire", "summary": summary,
+                   "published_at": published + timedelta(minutes=i)}
+        items.append((rng.choice(tickers), article))
+        documents.append(f"{title} {summary}")
+    started = time.perf_counter()
+    for offset in range(0, len(items), batch_size):
+        index.index_news(items[offset:offset + batch_size])
+    news_seconds = time.perf_counter() - started
+
+    print(f"indexed {profiles} profiles one at a time in {profile_seconds:.1f} s, "
+          f"{news} articles in batches of {batch_size} in {news_seconds:.1f} s ({index.count()})")
+    print(f"{'query':<28}{'results':>8}{'index p50 (ms)':>16}{'index p95 (ms)':>16}{'scan (ms)':>11}")
+    lowered = [document.lower() for document in documents]
+    for query in _QUERIES:
+        timings = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            results = index.search(query, limit=10)
+            timings.append((time.perf_counter() - started) * 1000)
+        words = query.replace('"', "").lower().split()
+        started = time.perf_counter()
+        sum(all(word in document for word in words) for document in lowered)
+        scan = (time.perf_counter() - started) * 1000
+        print(f"{query:<28}{len(results):>8}{statistics.median(timings):>16.2f}"
+              f"{statistics.quantiles(timings, n=20)[-1]:>16.2f}{scan:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--news", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    main(args.profiles, args.news, args.batch_size, args.queries)
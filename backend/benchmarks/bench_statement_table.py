@@ -0,0 +1,81 @@
+"""
+Benchmark for the columnar StatementTable against the nested
+{period: {line_item: value}} dicts produced by `DataFrame.to_dict()`.
+
+Reports memory held per cached statement, API serialization time, and the
+size of the text each representation puts into an LLM prompt.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_statement_table --statements 500
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from app.services.statement_table import StatementTable
+
+LINE_ITEMS = 80
+PERIODS = 5
+
+
+def synthetic_statement(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-1e11, 1e11, size=(LINE_ITEMS, PERIODS))
+    values[rng.random(values.shape) < 0.15] = np.nan
+    periods = pd.date_range("2021-03-31", periods=PERIODS, freq="12ME")[::-1]
+    return pd.DataFrame(values, index=[f"Line Item {i}" for i in range(LINE_ITEMS)], columns=periods)
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, current
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(count: int):
+    frames = [synthetic_statement(seed) for seed in range(count)]
+
+    nested, nested_bytes = measure_memory(
+        lambda: [{str(k): v for k, v in df.to_dict().items()} for df in frames]
+    )
+    tables, table_bytes = measure_memory(
+        lambda: [StatementTable.from_dataframe("SYM.NS", "income", "annual", df) for df in frames]
+    )
+
+    nested_seconds = timed(lambda: [json.dumps(jsonable_encoder(d)) for d in nested])
+    table_seconds = timed(lambda: [t.to_json() for t in tables])
+
+    nested_prompt = sum(len(str(d)) for d in nested) / count
+    table_prompt = sum(len(t.to_prompt_text()) for t in tables) / count
+
+    print(f"{count} statements of {LINE_ITEMS} line items x {PERIODS} periods")
+    print(f"{'':<28}{'nested dict':>14}{'columnar':>14}{'factor':>10}")
+    print(f"{'memory per statement (KB)':<28}{nested_bytes / count / 1024:>14.1f}"
+          f"{table_bytes / count / 1024:>14.1f}{nested_bytes / table_bytes:>9.1f}x")
+    print(f"{'serialize per stmt (us)':<28}{nested_seconds / count * 1e6:>14.1f}"
+          f"{table_seconds / count * 1e6:>14.1f}{nested_seconds / table_seconds:>9.1f}x")
+    print(f"{'prompt chars per stmt':<28}{nested_prompt:>14.0f}{table_prompt:>14.0f}"
+          f"{nested_prompt / table_prompt:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=500)
+    main(parser.parse_args().statements)
@@ -0,0 +1,139 @@
+"""
+End-to-end benchmark of the whole backend in replay mode: drives the
+/api/v1/company/* and /api/v1/chat/ routes of the real application at a
+fixed concurrency and reports, per scenario, throughput, p50/p95/p99 latency,
+errors, and how many upstream (yfinance and OpenAI) calls the requests made.
+
+Upstreams are served from fixtures (see app/services/replay.py) after an
+injected latency, so no network or API key is needed and runs are repeatable:
+synthetic fixtures are generated unless --fixtures points at a directory
+recorded with UPSTREAM_MODE=record. Each scenario runs twice: "cold", with
+the in-process ticker cache cleared (the LLM cache starts empty, as no other
+scenario sends its queries), and "warm", straight after. The database, price store and search index are throwaway
+but shared by the scenarios, so what one persists, later ones reuse.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_suite --concurrency 32 --requests 200 --yfinance-ms 150 --openai-ms 600
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+TICKERS = ("RELIANCE", "TCS", "INFY", "WIPRO", "HDFCBANK", "ICICIBANK")
+FAST_PATH_QUERIES = ("price of {}", "latest news on {}", "show me {} annual balance sheet")
+
+
+def _scenarios(llm_queries) -> Dict[str, List[Tuple[str, str, Optional[dict]]]]:
+    """Each scenario's requests as (method, path, JSON body), cycled through by `drive`."""
+    company = "/api/v1/company"
+    per_ticker = {
+        "price": lambda t: ("GET", f"{company}/{t}/price", None),
+        "statements": lambda t: ("GET", f"{company}/{t}/statements/income?frequency=quarterly", None),
+        "news": lambda t: ("GET", f"{company}/{t}/news", None),
+        "ratios": lambda t: ("GET", f"{company}/{t}/ratios", None),
+        "history": lambda t: ("GET", f"{company}/{t}/history?start=2024-01-01", None),
+        "risk": lambda t: ("GET", f"{company}/{t}/risk", None),
+        "report": lambda t: ("GET", f"{company}/{t}/report", None),
+    }
+    scenarios = {name: [request(t) for t in TICKERS] for name, request in per_ticker.items()}
+    scenarios["batch prices"] = [("POST", f"{company}/prices", {"tickers": [f"{t}.NS" for t in TICKERS]})]
+    scenarios["chat, fast path"] = [
+        ("POST", "/api/v1/chat/", {"query": query.format(t)}) for query in FAST_PATH_QUERIES for t in TICKERS
+    ]
+    scenarios["chat, LLM path"] = [("POST", "/api/v1/chat/", {"query": query}) for query in llm_queries]
+    return scenarios
+
+
+def _percentile(latencies: List[float], q: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def drive(client, requests, total: int, concurrency: int) -> Tuple[List[float], int, float]:
+    """Issues `total` requests, cycling through `requests`, with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        method, url, body = requests[i % len(requests)]
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+        errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def _upstream_calls(before: Dict[str, int], after: Dict[str, int]) -> str:
+    delta = Counter(after)
+    delta.subtract(before)
+    yfinance = sum(count for name, count in delta.items() if name.startswith("yfinance."))
+    openai = sum(count for name, count in delta.items() if name.startswith("openai."))
+    return f"{yfinance:>6}{openai:>7}{delta['misses']:>7}"
+
+
+async def run(total: int, concurrency: int):
+    import httpx
+
+    from app.main import app
+    from app.services.cache import ticker_cache
+    from app.services.replay import fixture_store
+    from benchmarks.fixtures import LLM_DECISIONS
+
+    print(f"{'scenario':<18}{'phase':<6}{'req':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}{'yf':>6}{'llm':>7}{'miss':>7}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, requests in _scenarios(LLM_DECISIONS).items():
+            for phase in ("cold", "warm"):
+                if phase == "cold":
+                    ticker_cache.clear()
+                before = fixture_store.stats()
+                latencies, errors, seconds = await drive(client, requests, total, concurrency)
+                print(f"{name:<18}{phase:<6}{total:>6}{total / seconds:>9.1f}"
+                      f"{_percentile(latencies, 50):>9.1f}{_percentile(latencies, 95):>9.1f}"
+                      f"{_percentile(latencies, 99):>9.1f}{errors:>8}"
+                      f"{_upstream_calls(before, fixture_store.stats())}")
+
+
+def main(args):
+    directory = tempfile.mkdtemp()
+    # Set before the application is imported, so its stores and upstreams pick them up.
+    os.environ.update({
+        "UPSTREAM_MODE": "replay",
+        "UPSTREAM_FIXTURES_DIR": args.fixtures or os.path.join(directory, "fixtures"),
+        "REPLAY_YFINANCE_LATENCY_MS": str(args.yfinance_ms),
+        "REPLAY_OPENAI_LATENCY_MS": str(args.openai_ms),
+        "REPLAY_LATENCY_JITTER": str(args.jitter),
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'suite.db')}",
+        "PRICE_STORE_DIR": os.path.join(directory, "price_store"),
+        "SEARCH_INDEX_PATH": os.path.join(directory, "search_index.db"),
+        "PREFETCH_ENABLED": "false",
+    })
+    if not args.fixtures:
+        from benchmarks.fixtures import write_synthetic_fixtures
+        write_synthetic_fixtures(os.environ["UPSTREAM_FIXTURES_DIR"])
+    print(f"yfinance {args.yfinance_ms:.0f} ms, OpenAI {args.openai_ms:.0f} ms (jitter {args.jitter:.0%}), "
+          f"concurrency {args.concurrency}")
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and phase.")
+    parser.add_argument("--yfinance-ms", type=float, default=150)
+    parser.add_argument("--openai-ms", type=float, default=600)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--fixtures", help="A recorded fixture directory to replay instead of synthetic data.")
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+"""
+Benchmark for the DCF valuation engine: time to price the sensitivity grid
+plus N Monte Carlo scenarios in one vectorized pass, against pricing each
+scenario with a per-year Python loop, and the end-to-end time of the
+`calculate_dcf_valuation` tool once its statements are loaded.
+
+Statements and prices are synthetic and stubbed, so no network is used.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_valuation --scenarios 10000 100000 1000000
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core import config
+from app.services import ratios, valuation
+from app.services.ratios import RATIO_INPUTS, build_input_cube
+from app.services.statement_table import StatementTable
+
+_STATEMENT_LINE_ITEMS = {
+    "income": {"Total Revenue": 9e11, "Net Income": 7e10, "Diluted EPS": 52.0},
+    "balance": {"Total Debt": 3e11, "Cash And Cash Equivalents": 1e11, "Ordinary Shares Number": 1.35e9,
+                "Stockholders Equity": 8e11},
+    "cashflow": {"Operating Cash Flow": 1.6e11, "Capital Expenditure": -1.0e11},
+}
+
+
+def synthetic_statements(ticker_symbol: str, years: int = 5):
+    periods = pd.date_range("2021-03-31", periods=years, freq="12ME")[::-1]
+    growth = 1.08 ** -np.arange(years)
+    return {
+        kind: StatementTable.from_dataframe(
+            ticker_symbol, kind, "annual",
+            pd.DataFrame({period: {item: value * g for item, value in items.items()} for period, g in zip(periods, growth)}),
+        )
+        for kind, items in _STATEMENT_LINE_ITEMS.items()
+    }
+
+
+def loop_valuation(inputs, discount, growth, terminal, years):
+    """The same DCF, one scenario and one projected year at a time."""
+    values = []
+    for d, g, tg in zip(discount, growth, terminal):
+        fcf, present = inputs["base_free_cash_flow"], 0.0
+        for year in range(1, years + 1):
+            fcf *= 1 + g
+            present += fcf / (1 + d) ** year
+        present += fcf * (1 + tg) / (d - tg) / (1 + d) ** years
+        values.append(max((present - inputs["net_debt"]) / inputs["shares"], 0.0))
+    return values
+
+
+def _median_ms(function, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(scenario_counts, repeats: int):
+    statements = synthetic_statements("SYN.NS")
+    cube, labels = build_input_cube([statements], config.RATIOS_MAX_PERIODS)
+    inputs = valuation.valuation_inputs(cube, labels[0], 1400.0)
+    assert len(RATIO_INPUTS) and "error" not in inputs, inputs
+
+    print(f"{'scenarios':>10}{'vectorized (ms)':>17}{'python loop (ms)':>18}")
+    for scenarios in scenario_counts:
+        vectorized = _median_ms(lambda: valuation.value_company(inputs, scenarios=scenarios), repeats)
+        sample = min(scenarios, 20000)
+        discount, growth, terminal = valuation.sample_assumptions(
+            sample, config.VALUATION_DISCOUNT_RATE, 0.08, config.VALUATION_TERMINAL_GROWTH, np.random.default_rng(0)
+        )
+        started = time.perf_counter()
+        loop_valuation(inputs, discount, growth, terminal, config.VALUATION_PROJECTION_YEARS)
+        # Extrapolated past 20,000 scenarios.
+        loop = (time.perf_counter() - started) * 1000 * scenarios / sample
+        print(f"{scenarios:>10,}{vectorized:>17.1f}{loop:>18.0f}")
+
+    # The tool end to end with its statements and price already cached.
+    ratios.scraper.get_statement_table = lambda ticker_symbol, kind, frequency: statements[kind]
+    ratios.scraper.get_batch_stock_price_data = lambda tickers: {"currentPrice": [1400.0] * len(tickers)}
+    result = valuation.calculate_dcf_valuation("SYN.NS")
+    tool = _median_ms(lambda: valuation.calculate_dcf_valuation("SYN.NS"), repeats)
+    print(f"calculate_dcf_valuation, {config.VALUATION_SCENARIOS:,} scenarios: {tool:.1f} ms "
+          f"(fair value {result['fair_value']}, p50 {result['monte_carlo']['percentiles']['p50']}, "
+          f"P(undervalued) {result['monte_carlo']['probability_undervalued']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.scenarios, args.repeats)
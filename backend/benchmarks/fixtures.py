@@ -0,0 +1,208 @@
+"""
+Synthetic upstream fixtures for replay mode: what yfinance would return for a
+handful of NSE tickers and the NIFTY 50, and the OpenAI responses the chat
+benchmark and tests ask for. Dates are relative to today, so the data is
+always fresh enough to be served without a refresh.
+
+Fixtures recorded from the real services (UPSTREAM_MODE=record) replay the
+same way; these exist so the suite and the tests need no network or keys.
+"""
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core import config
+from app.services.replay import FixtureStore, sdk_httpx
+
+TICKERS = ("RELIANCE.NS", "TCS.NS", "INFY.NS", "WIPRO.NS", "HDFCBANK.NS", "ICICIBANK.NS")
+OPENAI_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+_PROFILES = {
+    "RELIANCE.NS": ("Reliance Industries Limited", "Energy", "Oil & Gas Refining & Marketing",
+                    "Refining, petrochemicals, retail and digital services, and new energy including green hydrogen."),
+    "TCS.NS": ("Tata Consultancy Services Limited", "Technology", "Information Technology Services",
+               "IT services, consulting and business solutions for global enterprises."),
+    "INFY.NS": ("Infosys Limited", "Technology", "Information Technology Services",
+                "Digital services and consulting, cloud and application management."),
+    "WIPRO.NS": ("Wipro Limited", "Technology", "Information Technology Services",
+                 "IT, consulting and business process services."),
+    "HDFCBANK.NS": ("HDFC Bank Limited", "Financial Services", "Banks - Regional",
+                    "Retail and wholesale banking, treasury and cards."),
+    "ICICIBANK.NS": ("ICICI Bank Limited", "Financial Services", "Banks - Regional",
+                     "Retail, corporate and rural banking and insurance."),
+}
+
+# Queries the chat benchmark sends down the LLM path, with the tool calls the
+# replayed model makes for them.
+LLM_DECISIONS: Dict[str, List[Tuple[str, Dict]]] = {
+    "Compare the income statements of TCS and Infosys": [
+        ("compare_two_companies_financial_statement",
+         {"ticker_symbol_1": "TCS.NS", "ticker_symbol_2": "INFY.NS", "statement_type": "income"}),
+    ],
+    "which companies mention green hydrogen": [("search_documents", {"query": "green hydrogen"})],
+    "Is HDFC Bank undervalued?": [("estimate_fair_value", {"ticker_symbol": "HDFCBANK.NS"})],
+    "How risky is Reliance compared to the market?": [
+        ("calculate_risk_metrics", {"ticker_symbols": ["RELIANCE.NS"]}),
+    ],
+    "Compare the cash flow of TCS, Infosys and Wipro": [
+        ("compare_peer_financial_statements",
+         {"ticker_symbols": ["TCS.NS", "INFY.NS", "WIPRO.NS"], "statement_type": "cashflow"}),
+    ],
+}
+
+
+def _rng(ticker_symbol: str) -> np.random.Generator:
+    return np.random.default_rng(zlib.crc32(ticker_symbol.encode()))
+
+
+def price_history(ticker_symbol: str, years: int = 5) -> pd.DataFrame:
+    """Daily bars on business days up to yesterday, as yfinance returns them for NSE."""
+    rng = _rng(ticker_symbol)
+    yesterday = pd.Timestamp.now(tz="Asia/Kolkata").normalize() - pd.Timedelta(days=1)
+    index = pd.bdate_range(end=yesterday, periods=252 * years, tz="Asia/Kolkata")
+    close = rng.uniform(200, 3000) * np.exp(np.cumsum(rng.normal(0.0004, 0.015, len(index))))
+    spread = close * rng.uniform(0.002, 0.02, len(index))
+    return pd.DataFrame({
+        "Open": close + rng.uniform(-1, 1, len(index)) * spread,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Adj Close": close * 0.98,
+        "Volume": rng.integers(10**5, 10**7, len(index)).astype(float),
+    }, index=index)
+
+
+def statements(ticker_symbol: str, quarterly: bool) -> Dict[str, pd.DataFrame]:
+    """The three statements with every line item the ratios and prompts read, newest period first."""
+    rng = _rng(ticker_symbol + ("Q" if quarterly else "A"))
+    periods = 5 if quarterly else 4
+    columns = pd.date_range(end=pd.Timestamp.now().normalize() - pd.DateOffset(months=2),
+                            periods=periods, freq="QE" if quarterly else "12ME")[::-1]
+    revenue = rng.uniform(5e11, 5e12) / (4 if quarterly else 1) * 1.08 ** -np.arange(periods)
+    shares = rng.uniform(1e9, 7e9)
+    operating_cash_flow = revenue * 0.2
+
+    def line_items(values: Dict[str, np.ndarray], prompt_items: List[str]) -> pd.DataFrame:
+        for item in prompt_items:
+            values.setdefault(item, revenue * rng.uniform(0.01, 0.3))
+        return pd.DataFrame(values, index=columns).T
+
+    income = {
+        "Total Revenue": revenue, "Cost Of Revenue": revenue * 0.55, "Gross Profit": revenue * 0.45,
+        "Operating Income": revenue * 0.22, "EBIT": revenue * 0.22, "EBITDA": revenue * 0.27,
+        "Interest Expense": revenue * 0.01, "Tax Provision": revenue * 0.05, "Net Income": revenue * 0.15,
+        "Diluted EPS": revenue * 0.15 / shares,
+    }
+    balance = {
+        "Total Assets": revenue * 2.0, "Total Debt": revenue * 0.4, "Stockholders Equity": revenue * 1.1,
+        "Cash And Cash Equivalents": revenue * 0.15, "Current Assets": revenue * 0.8,
+        "Current Liabilities": revenue * 0.5, "Ordinary Shares Number": np.full(periods, shares),
+    }
+    cashflow = {
+        "Operating Cash Flow": operating_cash_flow, "Capital Expenditure": -revenue * 0.08,
+        "Free Cash Flow": operating_cash_flow - revenue * 0.08,
+    }
+    return {
+        "income": line_items(income, config.PROMPT_LINE_ITEMS["income"]),
+        "balance": line_items(balance, config.PROMPT_LINE_ITEMS["balance"]),
+        "cashflow": line_items(cashflow, config.PROMPT_LINE_ITEMS["cashflow"]),
+    }
+
+
+def info(ticker_symbol: str, history: pd.DataFrame) -> Dict:
+    name, sector, industry, summary = _PROFILES.get(
+        ticker_symbol, (f"{ticker_symbol} Limited", "Industrials", "Conglomerates", "Diversified operations.")
+    )
+    close = history["Close"].to_numpy()
+    return {
+        "symbol": ticker_symbol, "shortName": name.upper()[:24], "longName": name, "currency": "INR",
+        "currentPrice": round(float(close[-1]), 2), "regularMarketPrice": round(float(close[-1]), 2),
+        "previousClose": round(float(close[-2]), 2), "dayHigh": round(float(history["High"].iloc[-1]), 2),
+        "dayLow": round(float(history["Low"].iloc[-1]), 2),
+        "fiftyTwoWeekHigh": round(float(close[-252:].max()), 2), "fiftyTwoWeekLow": round(float(close[-252:].min()), 2),
+        "trailingPE": 24.5, "forwardPE": 21.0, "sector": sector, "industry": industry,
+        "longBusinessSummary": summary, "fullTimeEmployees": 100000, "website": "https://example.com",
+        "city": "Mumbai", "country": "India",
+    }
+
+
+def news(ticker_symbol: str, articles: int = 10) -> List[Dict]:
+    """Articles in yfinance's current layout (fields under "content"), one every two hours."""
+    name = _PROFILES.get(ticker_symbol, (ticker_symbol,))[0]
+    now = datetime.now(timezone.utc)
+    return [{
+        "id": f"{ticker_symbol}-{i}",
+        "content": {
+            "title": f"{name} story {i}: quarterly update",
+            "summary": f"{name} reports on its operations and outlook.",
+            "pubDate": (now - timedelta(hours=2 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "canonicalUrl": {"url": f"https://news.example.com/{ticker_symbol}/{i}"},
+            "provider": {"displayName": "Example Wire"},
+        },
+    } for i in range(articles)]
+
+
+def chat_completion(content=None, tool_calls=None, model: str = "gpt-4o") -> Dict:
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = [
+            {"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+            for i, (name, arguments) in enumerate(tool_calls)
+        ]
+    return {
+        "id": "chatcmpl-replay", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+        "usage": {"prompt_tokens": 900, "completion_tokens": 40, "total_tokens": 940},
+    }
+
+
+def chat_completion_stream(content: str, model: str = "gpt-4o") -> str:
+    """A streamed completion as server-sent events, word by word, ending with the usage chunk."""
+    def event(choices, usage=None) -> str:
+        chunk = {"id": "chatcmpl-replay", "object": "chat.completion.chunk", "created": int(time.time()),
+                 "model": model, "choices": choices, "usage": usage}
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    words = content.split(" ")
+    events = [event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])]
+    events += [event([{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]) for word in words]
+    events.append(event([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+    events.append(event([], {"prompt_tokens": 900, "completion_tokens": len(words), "total_tokens": 900 + len(words)}))
+    return "".join(events) + "data: [DONE]\n\n"
+
+
+def write_synthetic_fixtures(directory: str, tickers=TICKERS) -> FixtureStore:
+    """Writes yfinance fixtures for the tickers and the risk benchmark, and the OpenAI fixtures, to a directory."""
+    store = FixtureStore(directory)
+    for ticker_symbol in (*tickers, config.RISK_BENCHMARK_TICKER):
+        history = price_history(ticker_symbol)
+        store.save(ticker_symbol, "history", history)
+        store.save(ticker_symbol, "info", info(ticker_symbol, history))
+        store.save(ticker_symbol, "news", news(ticker_symbol))
+        for quarterly in (False, True):
+            for statement_type, frame in statements(ticker_symbol, quarterly).items():
+                attribute = {"income": "income_stmt", "balance": "balance_sheet", "cashflow": "cashflow"}[statement_type]
+                store.save(ticker_symbol, f"quarterly_{attribute}" if quarterly else attribute, frame)
+
+    for query, tool_calls in LLM_DECISIONS.items():
+        request = sdk_httpx.Request("POST", OPENAI_COMPLETIONS_URL, json={
+            "model": "gpt-4o", "messages": [{"role": "user", "content": query}], "tools": [{}],
+        })
+        store.save_response(request, 200, "application/json", json.dumps(chat_completion(tool_calls=tool_calls)).encode())
+
+    # Comparison prompts embed the data, so they are answered by the defaults.
+    analysis = "Both companies grew revenue steadily; the first has the higher margins and lower leverage."
+    os.makedirs(os.path.join(directory, "openai"), exist_ok=True)
+    for name, content_type, body in (
+        ("default.json", "application/json", json.dumps(chat_completion(analysis))),
+        ("default-stream.json", "text/event-stream", chat_completion_stream(analysis)),
+    ):
+        with open(os.path.join(directory, "openai", name), "w", encoding="utf-8") as f:
+            json.dump({"status": 200, "content_type": content_type, "body": body}, f)
+    return store
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pytest
+
+# The application reads its configuration at import time, so the tests point
+# it at throwaway stores and replayed upstreams before anything imports it.
+_directory = tempfile.mkdtemp(prefix="sirius-tests-")
+os.environ.update({
+    "UPSTREAM_MODE": "replay",
+    "UPSTREAM_FIXTURES_DIR": os.path.join(_directory, "fixtures"),
+    "DATABASE_URL": f"sqlite:///{os.path.join(_directory, 'tests.db')}",
+    "PRICE_STORE_DIR": os.path.join(_directory, "price_store"),
+    "SEARCH_INDEX_PATH": os.path.join(_directory, "search_index.db"),
+    "PREFETCH_ENABLED": "false",
+    "UPSTREAM_RATE_LIMIT_PER_SECOND": "1000",
+    "UPSTREAM_RATE_LIMIT_BURST": "1000",
+})
+
+
+@pytest.fixture(scope="session", autouse=True)
+def synthetic_fixtures():
+    from benchmarks.fixtures import write_synthetic_fixtures
+
+    return write_synthetic_fixtures(os.environ["UPSTREAM_FIXTURES_DIR"])
+
+
+@pytest.fixture
+def cold_cache():
+    """Clears the in-process ticker cache, so the next request goes upstream."""
+    from app.services.cache import ticker_cache
+
+    ticker_cache.clear()
+    yield ticker_cache
+    ticker_cache.clear()
+
+
+@pytest.fixture
+def upstream_calls():
+    """Counts the replayed upstream calls made from here on, by fixture name."""
+    from app.services.replay import fixture_store
+
+    before = fixture_store.stats()
+
+    def calls(name: str) -> int:
+        return fixture_store.stats().get(name, 0) - before.get(name, 0)
+
+    return calls
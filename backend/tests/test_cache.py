@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from app.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(max_entries: int = 10, wait_timeout: float = 5.0):
+    clock = FakeClock()
+    return TTLCache({"price": 60, "statement": 3600}, max_entries, clock=clock, wait_timeout=wait_timeout), clock
+
+
+def test_entries_expire_after_their_class_ttl():
+    cache, clock = _cache()
+    cache.set("price", "TCS", 1)
+    cache.set("statement", "TCS", 2)
+    clock.now = 61
+    assert cache.get("price", "TCS") == (False, None)
+    assert cache.get("statement", "TCS") == (True, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, _ = _cache(max_entries=2)
+    cache.set("price", "A", 1)
+    cache.set("price", "B", 2)
+    cache.get("price", "A")
+    cache.set("price", "C", 3)
+    assert cache.get("price", "B") == (False, None)
+    assert cache.get("price", "A") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_unknown_data_class_is_rejected():
+    cache, _ = _cache()
+    with pytest.raises(KeyError):
+        cache.get("weather", "TCS")
+
+
+def test_concurrent_misses_share_one_load():
+    cache, _ = _cache()
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("price", "TCS", loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == ["value"] * 8
+    assert cache.get_or_load("price", "TCS", loader) == "value"
+    assert calls == [1]
+
+
+def test_leader_error_reaches_followers_and_is_not_cached():
+    cache, _ = _cache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_load("price", "TCS", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while cache.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    assert errors == ["upstream down"] * 2
+    assert cache.get_or_load("price", "TCS", lambda: "recovered") == "recovered"
+
+
+def test_followers_stop_waiting_for_a_hung_leader():
+    cache, _ = _cache(wait_timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hung():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    leader = threading.Thread(target=lambda: cache.get_or_load("price", "TCS", hung))
+    leader.start()
+    started.wait(5)
+    with pytest.raises(TimeoutError):
+        cache.get_or_load("price", "TCS", hung)
+    assert cache.stats()["wait_timeouts"] == 1
+    release.set()
+    leader.join()
+    assert cache.get("price", "TCS") == (True, "late")
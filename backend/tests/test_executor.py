@@ -0,0 +1,12 @@
+from app.services.executor import map_blocking
+
+
+def test_map_blocking_keeps_order_and_separates_errors():
+    def func(item):
+        if item == "boom":
+            raise ValueError(item)
+        return None if item is None else item * 2
+
+    outcomes = map_blocking(func, [1, None, "boom", 3])
+    assert [result for result, _ in outcomes] == [2, None, None, 6]
+    assert [type(error) for _, error in outcomes] == [type(None), type(None), ValueError, type(None)]
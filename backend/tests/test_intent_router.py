@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from app.services.intent_router import intent_router
+
+
+@pytest.mark.parametrize("query, tool, tickers", [
+    ("price of reliance", "get_stock_price_data", ["RELIANCE.NS"]),
+    ("TCS share price", "get_stock_price_data", ["TCS.NS"]),
+    ("what is the pe ratio of infosys", "get_price_earning_data", ["INFY.NS"]),
+    ("infy price to earnings", "get_price_earning_data", ["INFY.NS"]),
+    ("roe of hdfc bank", "get_financial_ratios", ["HDFCBANK.NS"]),
+    ("titan margins", "get_financial_ratios", ["TITAN.NS"]),
+    ("latest news on wipro", "get_latest_news", ["WIPRO.NS"]),
+    ("what sector is titan in", "get_company_profile", ["TITAN.NS"]),
+    ("tcs balance sheet", "get_financial_statement", ["TCS.NS"]),
+    # Analysis and valuation questions go to the LLM.
+    ("margin of safety for titan", None, None),
+    ("tcs price target", None, None),
+    ("target price for reliance", None, None),
+    ("is infosys undervalued", None, None),
+    ("intrinsic value of tcs", None, None),
+    ("fair value of hdfc bank share price", None, None),
+    ("dcf of wipro", None, None),
+    ("is titan worth buying at this price", None, None),
+    ("compare tcs and infy pe ratio", None, None),
+    ("why did reliance price fall", None, None),
+    # No ticker, or no single intent.
+    ("what is the price", None, None),
+    ("tcs price and news", None, None),
+])
+def test_routing(query, tool, tickers):
+    calls = intent_router.route(query)
+    if tool is None:
+        assert calls is None
+        return
+    assert [call["function"]["name"] for call in calls] == [tool] * len(tickers)
+    assert [json.loads(call["function"]["arguments"])["ticker_symbol"] for call in calls] == tickers
+
+
+def test_statement_arguments():
+    calls = intent_router.route("quarterly cash flow statement of infosys")
+    assert json.loads(calls[0]["function"]["arguments"]) == {
+        "ticker_symbol": "INFY.NS", "statement_type": "cashflow", "frequency": "quarterly",
+    }
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from app.services.llm_cache import LLMResponseCache, NgramIndex, normalize_query, query_signature
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _decision(name: str, ticker_symbol: str):
+    return [{"id": "call_0", "type": "function", "function": {"name": name, "arguments": f'{{"ticker_symbol": "{ticker_symbol}"}}'}}]
+
+
+@pytest.mark.parametrize("query, normalized", [
+    ("  What's the P/E of TCS?? ", "what s the p/e of tcs"),
+    ("M&M   share price.", "m&m share price"),
+    ("Price of RELIANCE.NS", "price of reliance.ns"),
+])
+def test_normalize_query(query, normalized):
+    assert normalize_query(query) == normalized
+
+
+def test_ngram_index_finds_the_nearest_used_slot():
+    index = NgramIndex(capacity=3)
+    index.put(0, index.embed("price of tcs"))
+    index.put(1, index.embed("latest news on infosys"))
+    slot, similarity = index.nearest(index.embed("price of tcs today"))
+    assert slot == 0 and similarity > 0.8
+    index.remove(0)
+    slot, similarity = index.nearest(index.embed("price of tcs today"))
+    assert slot == 1 and similarity < 0.5
+    index.remove(1)
+    assert index.nearest(index.embed("anything")) == (None, 0.0)
+
+
+def test_embeddings_are_unit_length():
+    index = NgramIndex(capacity=1)
+    assert np.linalg.norm(index.embed("roe of hdfc bank")) == pytest.approx(1.0)
+
+
+def test_signature_tells_apart_tickers_numbers_intents_and_frequency():
+    assert query_signature("price of TCS") == query_signature("price of TCS.NS")
+    assert query_signature("price of TCS") != query_signature("price of INFY")
+    assert query_signature("tcs returns over 3 years") != query_signature("tcs returns over 5 years")
+    assert query_signature("tcs income statement") != query_signature("tcs quarterly income statement")
+
+
+def test_similar_query_reuses_a_decision_only_when_signatures_match():
+    cache = LLMResponseCache(max_entries=4, similarity_threshold=0.8)
+    cache.put_decision("What is the price of TCS?", _decision("get_stock_price_data", "TCS.NS"))
+    assert cache.get_decision("what is the price of tcs") == _decision("get_stock_price_data", "TCS.NS")
+    assert cache.get_decision("What is the price of TCS.NS?") == _decision("get_stock_price_data", "TCS.NS")
+    assert cache.get_decision("What is the price of INFY?") is None
+    stats = cache.stats()
+    assert (stats["decision_exact_hits"], stats["decision_similar_hits"], stats["decision_misses"]) == (1, 1, 1)
+
+
+def test_unlisted_companies_only_reuse_exact_decisions():
+    cache = LLMResponseCache(max_entries=4, similarity_threshold=0.8)
+    cache.put_decision("what is the share price of Adani Power today", _decision("get_stock_price_data", "ADANIPOWER.NS"))
+    assert cache.get_decision("what is the share price of Adani Green today") is None
+    assert cache.get_decision("What is the share price of Adani Power today?") == _decision("get_stock_price_data", "ADANIPOWER.NS")
+
+
+def test_decisions_expire_and_are_evicted_oldest_first():
+    clock = FakeClock()
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+    for ticker_symbol in ("TCS", "INFY", "WIPRO"):
+        cache.put_decision(f"news on {ticker_symbol}", _decision("get_latest_news", f"{ticker_symbol}.NS"))
+    assert cache.stats()["decisions"] == 2
+    assert cache.get_decision("news on tcs") is None
+    clock.now = 61
+    assert cache.get_decision("news on wipro") is None
+    assert cache.stats()["decisions"] == 1
+
+
+def test_cached_values_are_copies():
+    cache = LLMResponseCache(max_entries=2)
+    cache.put_decision("price of tcs", _decision("get_stock_price_data", "TCS.NS"))
+    cache.get_decision("price of tcs")[0]["function"]["name"] = "tampered"
+    assert cache.get_decision("price of tcs")[0]["function"]["name"] == "get_stock_price_data"
+
+
+def test_invalidate_ticker_drops_only_its_responses():
+    cache = LLMResponseCache(max_entries=4)
+    both = LLMResponseCache.response_key("comparison", "hash-tcs", "hash-infy")
+    wipro = LLMResponseCache.response_key("comparison", "hash-wipro")
+    cache.put_response(both, ["TCS.NS", "INFY.NS"], "TCS vs Infosys")
+    cache.put_response(wipro, ["wipro.ns"], "Wipro")
+    assert cache.invalidate_ticker("infy.ns") == 1
+    assert cache.get_response(both) is None
+    assert cache.get_response(wipro) == "Wipro"
+    assert cache.invalidate_ticker("TCS.NS") == 0
+    assert cache.invalidate_ticker("WIPRO.NS") == 1
+    assert cache.stats()["invalidations"] == 2
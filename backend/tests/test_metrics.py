@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import MetricsRegistry, span, stage_errors
+
+
+def test_counter_and_histogram_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.")
+    latency = registry.histogram("test_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    for seconds in (0.05, 0.5, 5.0):
+        latency.observe(seconds, route="/a")
+    assert registry.counter("test_requests_total", "Registered again.") is requests
+    assert registry.render().splitlines() == [
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{route="/a"} 3',
+        "# HELP test_seconds Latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 2',
+        'test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_seconds_sum{route="/a"} 5.55',
+        'test_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_failed_spans_are_counted():
+    try:
+        with span("test", "boom"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert 'sirius_stage_errors_total{name="boom",stage="test"} 1' in stage_errors.render()
+
+
+def test_requests_are_labelled_by_route_template():
+    with TestClient(app) as client:
+        client.get("/api/v1/company/TCS/price")
+        text = client.get("/metrics").text
+    assert 'route="/api/v1/company/{ticker}/price"' in text
+    assert "sirius_cache_lookups_total" in text
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.services.price_store import DATE_FIELD, FIELDS, PriceStore
+
+
+def _bars(start: str, days: int, base: float = 100.0):
+    dates = np.arange(np.datetime64(start), np.datetime64(start) + days)
+    closes = base + np.arange(days, dtype=np.float64)
+    return dates, {"close": closes, "adj_close": closes, "volume": np.full(days, 1e6)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path))
+
+
+def _open_descriptors() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_read_returns_the_requested_range(store):
+    store.append("tcs.ns", *_bars("2024-01-01", 10))
+    series = store.read("TCS.NS", "2024-01-03", "2024-01-05", fields=("close",))
+    assert series.ticker == "TCS.NS"
+    assert series.dates.tolist() == np.arange(np.datetime64("2024-01-03"), np.datetime64("2024-01-06")).tolist()
+    assert series["close"].tolist() == [102.0, 103.0, 104.0]
+    assert np.isnan(store.read("TCS.NS")["open"]).all()
+    assert len(store.read("MISSING.NS")) == 0
+
+
+def test_append_keeps_only_new_days(store):
+    assert store.append("TCS.NS", *_bars("2024-01-01", 5)) == 5
+    dates, columns = _bars("2024-01-04", 4, base=200.0)
+    assert store.append("TCS.NS", dates, columns) == 2
+    assert store.read("TCS.NS")["close"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0, 202.0, 203.0]
+    assert store.last_date("TCS.NS") == np.datetime64("2024-01-07")
+
+
+def test_torn_append_is_hidden_and_repaired(store):
+    store.append("TCS.NS", *_bars("2024-01-01", 5))
+    # A crash after writing one column of the next append.
+    with open(os.path.join(store._directory("TCS.NS"), "close.bin"), "ab") as f:
+        f.write(np.array([999.0]).tobytes())
+    assert len(store.read("TCS.NS")) == 5
+    assert store.append("TCS.NS", *_bars("2024-01-06", 1, base=105.0)) == 1
+    assert store.read("TCS.NS")["close"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0, 105.0]
+    sizes = {os.path.getsize(os.path.join(store._directory("TCS.NS"), f"{field}.bin")) for field in (DATE_FIELD, *FIELDS)}
+    assert sizes == {6 * 8}
+
+
+def test_replace_rewrites_the_history(store):
+    store.append("TCS.NS", *_bars("2024-01-01", 5))
+    assert store.replace("TCS.NS", *_bars("2023-12-30", 3, base=50.0)) == 3
+    assert store.read("TCS.NS")["close"].tolist() == [50.0, 51.0, 52.0]
+    assert store.tickers() == ["TCS.NS"]
+
+
+def test_read_matrix_aligns_tickers_on_shared_dates(store):
+    store.append("A.NS", *_bars("2024-01-01", 3))
+    store.append("B.NS", *_bars("2024-01-02", 3, base=10.0))
+    dates, matrix = store.read_matrix(["A.NS", "B.NS"], "close")
+    assert len(dates) == 4
+    np.testing.assert_array_equal(matrix, [[100.0, 101.0, 102.0, np.nan], [np.nan, 10.0, 11.0, 12.0]])
+
+
+def test_reading_many_tickers_holds_no_descriptors(store):
+    tickers = [f"T{i}.NS" for i in range(300)]
+    for ticker in tickers:
+        store.append(ticker, *_bars("2024-01-01", 20))
+    before = _open_descriptors()
+    _, matrix = store.read_matrix(tickers)
+    for ticker in tickers:
+        store.read(ticker)
+    assert matrix.shape == (300, 20)
+    assert _open_descriptors() <= before + 2
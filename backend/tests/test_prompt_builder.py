@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from app.core import config
+from app.services.prompt_builder import build_comparison_table, estimate_tokens, render_comparison_table
+from app.services.statement_table import StatementTable, format_number
+
+_ITEMS = config.PROMPT_LINE_ITEMS["income"]
+_PERIODS = [f"{year}-03-31" for year in range(2024, 2016, -1)]
+
+
+def _table(ticker_symbol: str, seed: int) -> StatementTable:
+    values = np.random.default_rng(seed).uniform(1e9, 1e12, (len(_ITEMS), len(_PERIODS)))
+    return StatementTable(ticker_symbol, "income", "annual", _PERIODS, _ITEMS, values)
+
+
+@pytest.mark.parametrize("value, text", [
+    (1234567890, "1.23B"), (-2.5e12, "-2.5T"), (987.6, "988"), (float("nan"), "-"), (float("inf"), "-"),
+])
+def test_format_number(value, text):
+    assert format_number(value) == text
+
+
+def test_comparison_table_stays_within_the_budget():
+    tables = [_table("TCS.NS", 1), _table("INFY.NS", 2)]
+    for budget in (200, 400, 800, config.PROMPT_TOKEN_BUDGET):
+        text, tokens = build_comparison_table(tables, "income", max_periods=8, token_budget=budget)
+        assert tokens == estimate_tokens(text) <= budget
+
+
+def test_old_periods_are_dropped_before_line_items():
+    tables = [_table("TCS.NS", 1), _table("INFY.NS", 2)]
+    two_periods = estimate_tokens(render_comparison_table(tables, _ITEMS, 2))
+    text, tokens = build_comparison_table(tables, "income", max_periods=8, token_budget=two_periods)
+    header = text.splitlines()[1]
+    assert "C1 P1" in header and "C1 P2" not in header
+    assert len(text.splitlines()) == 2 + len(_ITEMS)
+
+    text, _ = build_comparison_table(tables, "income", max_periods=8, token_budget=two_periods - 1)
+    assert "C1 P1" in text.splitlines()[1]
+    assert len(text.splitlines()) < 2 + len(_ITEMS)
+    assert text.splitlines()[2].startswith(_ITEMS[0])
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+from app.services import ratios
+from app.services.ratios import RATIO_INPUTS, compute_ratios
+from app.services.statement_table import StatementTable
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _cube(periods: int, **inputs) -> np.ndarray:
+    """A one-ticker cube with each given input held constant over `periods`."""
+    cube = np.full((1, len(RATIO_INPUTS), periods), np.nan)
+    for position, name in enumerate(RATIO_INPUTS):
+        if name in inputs:
+            cube[0, position, :] = inputs[name]
+    return cube
+
+
+def test_quarterly_multiples_use_trailing_twelve_months():
+    balances = {"equity": 400.0, "total_assets": 1000.0, "shares": 10.0}
+    annual = compute_ratios(_cube(4, revenue=800.0, net_income=100.0, eps=10.0, **balances), np.array([150.0]), "annual")
+    quarterly = compute_ratios(_cube(8, revenue=200.0, net_income=25.0, eps=2.5, **balances), np.array([150.0]), "quarterly")
+    for name in ("pe_ratio", "price_to_sales", "earnings_yield"):
+        assert quarterly[name][0] == pytest.approx(annual[name][0])
+    for name in ("roe", "roa"):
+        assert quarterly[name][0, 0] == pytest.approx(annual[name][0, 0])
+    # Margins and per-share earnings stay per quarter; the oldest three
+    # quarters have no full year behind them.
+    assert quarterly["net_margin"][0, 0] == pytest.approx(annual["net_margin"][0, 0])
+    assert quarterly["eps"][0, 0] == 2.5
+    assert np.isnan(quarterly["roe"][0, 5:]).all()
+
+
+def test_quarterly_pe_falls_back_to_net_income_per_share():
+    cube = _cube(4, net_income=25.0, shares=10.0)
+    assert compute_ratios(cube, np.array([100.0]), "quarterly")["pe_ratio"][0] == pytest.approx(10.0)
+
+
+def test_unknown_frequency_is_rejected(client):
+    assert "error" in ratios.get_financial_ratios("TCS.NS", "weekly")
+    assert "error" in ratios.compare_with_industry_peers(["TCS.NS", "INFY.NS"], "weekly")
+    assert client.get("/api/v1/company/TCS/ratios", params={"frequency": "weekly"}).status_code == 422
+    response = client.post("/api/v1/company/ratios/peers", json={"tickers": ["TCS.NS"], "frequency": "weekly"})
+    assert response.status_code == 422
+
+
+def test_quarterly_ratios_route(client):
+    response = client.get("/api/v1/company/TCS/ratios", params={"frequency": "quarterly"})
+    assert response.status_code == 200
+
+
+def test_peer_comparison_is_capped(client, monkeypatch):
+    monkeypatch.setattr(config, "RATIOS_PEER_MAX_TICKERS", 2)
+    tickers = ["TCS.NS", "INFY.NS", "WIPRO.NS"]
+    assert "error" in ratios.compare_with_industry_peers(tickers)
+    assert client.post("/api/v1/company/ratios/peers", json={"tickers": tickers}).status_code == 422
+
+
+def test_sector_wide_peer_comparison(client, monkeypatch):
+    """More than 100 companies go through the engine in one call (and past the LLM prompt cap)."""
+    periods = ["2024-03-31", "2023-03-31", "2022-03-31"]
+
+    def statements(ticker_symbol, frequency):
+        scale = 1 + int(ticker_symbol[3:6])
+        items = {
+            "income": {"Total Revenue": 1000.0, "Net Income": 100.0, "Diluted EPS": 10.0},
+            "balance": {"Stockholders Equity": 500.0, "Total Assets": 2000.0, "Ordinary Shares Number": 10.0},
+            "cashflow": {"Operating Cash Flow": 150.0},
+        }
+        return {
+            kind: StatementTable(ticker_symbol, kind, frequency, periods, list(values), np.outer(list(values.values()), [scale] * 3))
+            for kind, values in items.items()
+        }
+
+    monkeypatch.setattr(ratios, "load_statements", statements)
+    monkeypatch.setattr(ratios, "current_prices", lambda tickers: np.full(len(tickers), 150.0))
+    tickers = [f"SEC{i:03d}.NS" for i in range(150)]
+    assert len(tickers) > config.PEER_COMPARISON_MAX_TICKERS
+    response = client.post("/api/v1/company/ratios/peers", json={"tickers": tickers})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ticker"] == tickers
+    assert body["ratios"]["roe"] == pytest.approx([0.2] * 150)
+    assert body["peer_median"]["net_margin"] == pytest.approx(0.1)
@@ -0,0 +1,166 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core import config
+from app.services import replay
+from app.services.replay import (
+    FixtureStore, RecordingTransport, RecordingYFinance, ReplayMiss, ReplayTransport, ReplayYFinance,
+    decode_value, encode_value, request_key, sdk_httpx, select_period,
+)
+
+COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _history(days: int = 30) -> pd.DataFrame:
+    index = pd.bdate_range("2026-01-01", periods=days, tz="Asia/Kolkata")
+    close = np.linspace(100, 130, days)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Adj Close": close, "Volume": np.full(days, 1e6)}, index=index)
+
+
+def _completion_request(message: str, system: str = "You pick tools.", stream: bool = False):
+    return sdk_httpx.Request("POST", COMPLETIONS_URL, json={
+        "model": "gpt-4o", "stream": stream, "tools": [{"type": "function"}],
+        "messages": [{"role": "system", "content": system}, {"role": "user", "content": message}],
+    })
+
+
+class FakeTicker:
+    def __init__(self, ticker_symbol, session=None):
+        self.info = {"symbol": ticker_symbol, "currentPrice": 101.5}
+        self.income_stmt = pd.DataFrame(
+            {pd.Timestamp("2026-03-31"): [1e9, np.nan], pd.Timestamp("2025-03-31"): [9e8, 1e8]},
+            index=["Total Revenue", "Net Income"],
+        )
+
+    def history(self, **kwargs):
+        return _history()
+
+
+class FakeYFinance:
+    Ticker = FakeTicker
+
+    @staticmethod
+    def download(tickers, **kwargs):
+        return pd.concat({ticker: _history() for ticker in tickers}, axis=1).swaplevel(axis=1)
+
+
+# --- Fixture encoding ---
+def test_frames_round_trip_with_missing_values():
+    frame = FakeTicker("X").income_stmt
+    decoded = decode_value(json.loads(json.dumps(encode_value(frame))))
+    pd.testing.assert_frame_equal(decoded, frame, check_freq=False)
+
+
+def test_history_round_trip_keeps_timezone():
+    frame = _history()
+    decoded = decode_value(json.loads(json.dumps(encode_value(frame))))
+    assert str(decoded.index.tz) == "Asia/Kolkata"
+    np.testing.assert_array_equal(decoded.to_numpy(), frame.to_numpy())
+
+
+def test_non_frames_are_stored_as_is():
+    assert decode_value(encode_value({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_select_period():
+    frame = _history(60)
+    assert len(select_period(frame, "5d")) == 5
+    assert len(select_period(frame, "max")) == 60
+    assert select_period(frame, "1mo").index[0] > frame.index[-1] - pd.DateOffset(months=1)
+    window = select_period(frame, start="2026-01-05", end="2026-01-08")
+    assert [day.day for day in window.index] == [5, 6, 7]
+
+
+# --- yfinance ---
+def test_recorded_yfinance_replays_the_same_data(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    recorder = RecordingYFinance(FakeYFinance, store)
+    ticker = recorder.Ticker("ABC.NS")
+    info, statement, history = ticker.info, ticker.income_stmt, ticker.history(period="max")
+
+    replayed = ReplayYFinance(FixtureStore(str(tmp_path))).Ticker("ABC.NS")
+    assert replayed.info == info
+    pd.testing.assert_frame_equal(replayed.income_stmt, statement, check_freq=False)
+    assert len(replayed.history(period="5d")) == 5
+    assert len(replayed.history(period="max")) == len(history)
+
+
+def test_recorded_downloads_replay_per_ticker(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    RecordingYFinance(FakeYFinance, store).download(["A.NS", "B.NS"], period="5d", group_by="column")
+    frame = ReplayYFinance(store).download(["A.NS", "B.NS", "C.NS"], period="5d", group_by="column")
+    assert sorted(frame["Close"].columns) == ["A.NS", "B.NS"]
+    assert len(frame) == 5
+    assert store.stats()["yfinance.download"] == 1
+
+
+def test_missing_yfinance_fixture_raises(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    with pytest.raises(ReplayMiss):
+        ReplayYFinance(store).Ticker("NONE.NS").info
+    assert store.stats()["misses"] == 1
+
+
+def test_yfinance_latency_is_injected(tmp_path, monkeypatch):
+    store = FixtureStore(str(tmp_path))
+    store.save("ABC.NS", "info", {"symbol": "ABC.NS"})
+    monkeypatch.setattr(config, "REPLAY_YFINANCE_LATENCY_MS", 50.0)
+    started = time.perf_counter()
+    ReplayYFinance(store).Ticker("ABC.NS").info
+    assert time.perf_counter() - started >= 0.05
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    monkeypatch.setattr(config, "UPSTREAM_MODE", "offline")
+    with pytest.raises(ValueError):
+        replay.upstream_yfinance(FakeYFinance)
+
+
+# --- OpenAI ---
+def test_recorded_completion_replays(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    body = {"id": "chatcmpl-1", "choices": [{"message": {"content": "hello"}}]}
+    upstream = sdk_httpx.MockTransport(lambda request: sdk_httpx.Response(200, json=body))
+    with sdk_httpx.Client(transport=RecordingTransport(upstream, store)) as client:
+        assert client.send(_completion_request("hi")).json() == body
+
+    with sdk_httpx.Client(transport=ReplayTransport(FixtureStore(str(tmp_path)))) as client:
+        response = client.send(_completion_request("hi"))
+    assert response.status_code == 200
+    assert response.json() == body
+
+
+def test_throttled_responses_are_not_recorded(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    upstream = sdk_httpx.MockTransport(lambda request: sdk_httpx.Response(429, json={"error": {}}))
+    with sdk_httpx.Client(transport=RecordingTransport(upstream, store)) as client:
+        client.send(_completion_request("hi"))
+    assert not (tmp_path / "openai").exists()
+
+
+def test_request_key_ignores_the_system_prompt():
+    assert request_key(_completion_request("hi", system="v1")) == request_key(_completion_request("hi", system="v2"))
+    assert request_key(_completion_request("hi")) != request_key(_completion_request("hello"))
+    assert request_key(_completion_request("hi")) != request_key(_completion_request("hi", stream=True))
+
+
+def test_unrecorded_completion_is_a_404(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    with sdk_httpx.Client(transport=ReplayTransport(store)) as client:
+        response = client.send(_completion_request("never recorded"))
+    assert response.status_code == 404
+    assert store.stats()["misses"] == 1
+
+
+def test_unrecorded_completion_gets_the_default(tmp_path):
+    (tmp_path / "openai").mkdir()
+    (tmp_path / "openai" / "default.json").write_text(
+        json.dumps({"status": 200, "content_type": "application/json", "body": '{"default": true}'})
+    )
+    with sdk_httpx.Client(transport=ReplayTransport(FixtureStore(str(tmp_path)))) as client:
+        assert client.send(_completion_request("anything")).json() == {"default": True}
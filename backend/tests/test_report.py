@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+from app.services import report
+
+
+def test_slow_sections_are_pending_at_the_deadline(monkeypatch):
+    release = threading.Event()
+
+    def slow(ticker_symbol):
+        release.wait(5)
+        return {"late": True}
+
+    monkeypatch.setattr(report, "REPORT_SECTIONS", {
+        "fast": (lambda ticker_symbol: {"ticker": ticker_symbol}, ()),
+        "failing": (lambda ticker_symbol: {"error": "upstream down"}, ()),
+        "slow": (slow, ()),
+    })
+    try:
+        result = asyncio.run(report.build_company_report("TCS.NS", deadline=0.2))
+    finally:
+        release.set()
+    assert result["pending"] == ["slow"] and not result["complete"]
+    assert result["sections"]["fast"]["status"] == "ok"
+    assert result["sections"]["fast"]["data"] == {"ticker": "TCS.NS"}
+    assert result["sections"]["failing"]["status"] == "error"
+    assert result["sections"]["failing"]["error"] == "upstream down"
+    assert result["sections"]["slow"] == {"status": "pending"}
+    assert result["elapsed_ms"] < 2000
+
+
+def test_report_is_complete_when_every_section_finishes(monkeypatch):
+    monkeypatch.setattr(report, "REPORT_SECTIONS", {"fast": (lambda ticker_symbol: [], ())})
+    result = asyncio.run(report.build_company_report("TCS.NS", deadline=5))
+    assert result["complete"] and result["pending"] == []
@@ -0,0 +1,65 @@
+import os
+import resource
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+from app.services import risk, scraper
+from app.services.price_store import PriceStore
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def market(tmp_path, monkeypatch):
+    """A price store holding RISK_MAX_TICKERS synthetic tickers and the benchmark, served without upstream calls."""
+    store = PriceStore(str(tmp_path))
+    rng = np.random.default_rng(7)
+    dates = np.arange(np.datetime64("today", "D") - 120, np.datetime64("today", "D"))
+    tickers = [f"SYN{i:04d}.NS" for i in range(config.RISK_MAX_TICKERS)]
+    for ticker in tickers + [config.RISK_BENCHMARK_TICKER]:
+        closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+        store.append(ticker, dates, {"close": closes, "adj_close": closes})
+    monkeypatch.setattr(scraper, "price_store", store)
+    monkeypatch.setattr(risk, "price_store", store)
+    monkeypatch.setattr(scraper, "_fetch_history", lambda ticker_symbol: None)
+    return tickers
+
+
+@pytest.fixture
+def descriptor_limit():
+    """Lowers the soft open-file limit to 1024 for the test, as on a default Linux shell."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(1024, hard), hard))
+    yield
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_batch_risk_at_the_ticker_cap(client, market, descriptor_limit):
+    before = len(os.listdir("/proc/self/fd"))
+    response = client.post("/api/v1/company/risk", json={"tickers": market, "period_years": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["ticker"]) == config.RISK_MAX_TICKERS
+    assert all(value is not None for value in body["metrics"]["volatility"])
+    assert len(os.listdir("/proc/self/fd")) <= before + 5
+
+
+def test_batch_performance_at_the_ticker_cap(client, market, descriptor_limit):
+    response = client.post("/api/v1/company/performance", json={"tickers": market})
+    assert response.status_code == 200
+    assert len(response.json()["ticker"]) == config.RISK_MAX_TICKERS
+
+
+@pytest.mark.parametrize("route", ["risk", "performance"])
+def test_batches_over_the_cap_are_rejected(client, route):
+    tickers = [f"SYN{i:04d}.NS" for i in range(config.RISK_MAX_TICKERS + 1)]
+    response = client.post(f"/api/v1/company/{route}", json={"tickers": tickers})
+    assert response.status_code == 422
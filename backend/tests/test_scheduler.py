@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from app.core import config
+from app.services import scraper, transport
+from app.services.cache import ticker_cache
+from app.services.ratelimit import TokenBucket
+from app.services.replay import sdk_httpx
+from app.services.scheduler import PrefetchScheduler, RequestTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_scores_decay_with_the_half_life():
+    clock = FakeClock()
+    tracker = RequestTracker(half_life_seconds=60, clock=clock)
+    for _ in range(4):
+        tracker.record("OLD.NS")
+    clock.now = 180  # Three half-lives: OLD.NS decays from 4 to 0.5.
+    tracker.record("NEW.NS")
+    assert tracker.top(2) == ["NEW.NS", "OLD.NS"]
+
+
+def test_pruning_drops_the_coldest_half():
+    clock = FakeClock()
+    tracker = RequestTracker(half_life_seconds=60, max_tracked=4, clock=clock)
+    for i, ticker_symbol in enumerate(["A", "B", "C", "D"]):
+        for _ in range(i + 2):
+            tracker.record(ticker_symbol, ("info", ticker_symbol))
+    tracker.record("E", ("info", "E"))
+    assert set(tracker.top(10)) == {"B", "C", "D"}
+    assert tracker.requested("A") == set()
+    assert tracker.requested("D") == {("info", "D")}
+
+
+def test_requested_entries_are_tracked_per_ticker():
+    tracker = RequestTracker(half_life_seconds=60)
+    tracker.record("TCS.NS", ("info", "TCS.NS"))
+    tracker.record("TCS.NS", ("info", "TCS.NS"))
+    tracker.record("TCS.NS", ("news", "TCS.NS"))
+    assert tracker.requested("TCS.NS") == {("info", "TCS.NS"), ("news", "TCS.NS")}
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Stubs the prefetch entries of every ticker; returns the keys refreshed."""
+    keys = []
+
+    def entries(ticker_symbol):
+        def loader(key):
+            return lambda: keys.append(key)
+        return [(data_class, key, loader(key)) for data_class, key in (
+            ("price", ("info", ticker_symbol)), ("news", ("news", ticker_symbol)),
+            ("statement", ("statement", ticker_symbol, "income", "annual")),
+        )]
+
+    monkeypatch.setattr(scraper, "prefetch_entries", entries)
+    ticker_cache.clear()
+    yield keys
+    ticker_cache.clear()
+
+
+def test_prefetch_refreshes_only_requested_entries(refreshed, monkeypatch):
+    monkeypatch.setattr(config, "PREFETCH_TRACKED_TICKERS", [])
+    tracker = RequestTracker(half_life_seconds=60)
+    tracker.record("TCS.NS", ("info", "TCS.NS"))
+    scheduler = PrefetchScheduler(tracker, top_n=5)
+    asyncio.run(scheduler.run_once())
+    assert refreshed == [("info", "TCS.NS")]
+    assert scheduler.stats["skipped_unrequested"] == 2
+
+
+def test_tracked_tickers_prefetch_every_entry(refreshed, monkeypatch):
+    monkeypatch.setattr(config, "PREFETCH_TRACKED_TICKERS", ["INFY.NS"])
+    scheduler = PrefetchScheduler(RequestTracker(half_life_seconds=60), top_n=5)
+    asyncio.run(scheduler.run_once())
+    assert len(refreshed) == 3
+
+
+def test_fresh_entries_are_not_refreshed(refreshed, monkeypatch):
+    monkeypatch.setattr(config, "PREFETCH_TRACKED_TICKERS", [])
+    tracker = RequestTracker(half_life_seconds=60)
+    tracker.record("TCS.NS", ("info", "TCS.NS"))
+    ticker_cache.set("price", ("info", "TCS.NS"), {})
+    scheduler = PrefetchScheduler(tracker, top_n=5)
+    asyncio.run(scheduler.run_once())
+    assert refreshed == []
+    assert scheduler.stats["skipped_fresh"] == 1
+
+
+def test_token_wait_is_bounded():
+    bucket = TokenBucket(rate=0.01, capacity=1)
+    assert bucket.acquire(timeout=0.01)
+    assert not bucket.acquire(timeout=0.05)
+
+
+def test_upstream_calls_fail_when_the_limiter_is_backed_up(monkeypatch):
+    monkeypatch.setattr(scraper, "upstream_limiter", TokenBucket(rate=0.01, capacity=0))
+    monkeypatch.setattr(config, "UPSTREAM_RATE_LIMIT_WAIT_SECONDS", 0.05)
+    with pytest.raises(TimeoutError):
+        scraper._upstream_ticker("TCS.NS")
+
+
+def test_async_token_wait_is_bounded():
+    bucket = TokenBucket(rate=0.01, capacity=1)
+    assert asyncio.run(bucket.acquire_async(timeout=0.01))
+    assert not asyncio.run(bucket.acquire_async(timeout=0.05))
+
+
+def test_async_llm_requests_fail_when_the_limiter_is_backed_up(monkeypatch):
+    class BackedUp:
+        def bucket(self, host):
+            return TokenBucket(rate=0.01, capacity=0)
+
+    monkeypatch.setattr(transport, "host_limits", BackedUp())
+    monkeypatch.setattr(config, "UPSTREAM_RATE_LIMIT_WAIT_SECONDS", 0.05)
+    request = sdk_httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    with pytest.raises(TimeoutError):
+        asyncio.run(transport._throttle_async(request))
+
+
+def test_openai_pool_limits_target_the_sdk_client():
+    assert isinstance(transport._openai_limits(), sdk_httpx.Limits)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.search_index import SearchIndex, match_expression
+
+
+@pytest.mark.parametrize("query, expression", [
+    ("which companies mention green hydrogen", '"green" AND "hydrogen"'),
+    ('"solar modules" exports', '"solar modules" AND "exports"'),
+    ("hydrogen NEAR(x) -y", '"hydrogen" AND "NEAR" AND "x" AND "y"'),
+    ("what is the", None),
+])
+def test_match_expression_quotes_every_part(query, expression):
+    assert match_expression(query) == expression
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.index_profile("ADANIGREEN.NS", {"longName": "Adani Green Energy", "sector": "Utilities", "longBusinessSummary": "Builds solar and wind parks."})
+    index.index_profile("RELIANCE.NS", {"longName": "Reliance Industries", "sector": "Energy", "longBusinessSummary": "Refining, retail, and a green hydrogen giga factory."})
+    index.index_profile("TCS.NS", {"longName": "Tata Consultancy Services", "sector": "Technology", "longBusinessSummary": "IT services and consulting."})
+    # BM25 gives terms found in over half of the documents no weight.
+    for i in range(5):
+        index.index_profile(f"OTHER{i}.NS", {"longName": f"Other Company {i}", "sector": "Industrials"})
+    return index
+
+
+def test_search_ranks_by_bm25_with_title_weight(index):
+    results = index.search("green")
+    # Adani Green has the term in its title, which outweighs a body match.
+    assert [result["tickers"] for result in results] == [["ADANIGREEN.NS"], ["RELIANCE.NS"]]
+    assert results[0]["score"] > results[1]["score"]
+    assert "[" in results[1]["snippet"]
+
+
+def test_search_falls_back_to_any_term(index):
+    assert {result["tickers"][0] for result in index.search("hydrogen consulting")} == {"RELIANCE.NS", "TCS.NS"}
+    assert index.search("hydrogen consulting", ticker_symbol="TCS.NS")[0]["tickers"] == ["TCS.NS"]
+
+
+def test_unchanged_documents_are_not_rewritten(index):
+    info = {"longName": "Tata Consultancy Services", "sector": "Technology", "longBusinessSummary": "IT services and consulting."}
+    assert not index.index_profile("TCS.NS", info)
+    assert index.index_profile("TCS.NS", {**info, "longBusinessSummary": "IT services, consulting and AI."})
+    assert index.search("AI")[0]["tickers"] == ["TCS.NS"]
+
+
+def test_syndicated_news_folds_into_one_document(index):
+    article = {
+        "content_hash": "abc", "title": "Banks rally on rate cut", "summary": "Lenders gained.",
+        "publisher": "Wire", "url": "https://example.com/a", "published_at": datetime(2024, 5, 1),
+    }
+    assert index.index_news([("HDFCBANK.NS", article), ("ICICIBANK.NS", {**article, "url": "https://example.com/b"})]) == 1
+    results = index.search("rate cut", kind="news")
+    assert results[0]["tickers"] == ["HDFCBANK.NS", "ICICIBANK.NS"]
+    assert index.count() == {"profile": 8, "news": 1}
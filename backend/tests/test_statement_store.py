@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from app.services import statement_store
+
+
+def _statement(values_by_period):
+    columns = [pd.Timestamp(period) for period in values_by_period]
+    return pd.DataFrame(
+        {column: values for column, values in zip(columns, values_by_period.values())},
+        index=["Total Revenue", "Net Income"],
+    )
+
+
+def test_upsert_writes_only_new_or_changed_periods():
+    ticker_symbol = "STORE1.NS"
+    first = _statement({"2024-03-31": [100.0, 10.0], "2023-03-31": [90.0, 9.0]})
+    assert statement_store.upsert_statement(ticker_symbol, "income", "annual", first) == {"inserted": 2, "updated": 0, "unchanged": 0}
+    assert statement_store.upsert_statement(ticker_symbol, "income", "annual", first) == {"inserted": 0, "updated": 0, "unchanged": 2}
+
+    restated = _statement({"2025-03-31": [120.0, 12.0], "2024-03-31": [101.0, 10.0]})
+    assert statement_store.upsert_statement(ticker_symbol, "income", "annual", restated) == {"inserted": 1, "updated": 1, "unchanged": 0}
+
+
+def test_read_returns_newest_period_first_with_missing_values():
+    ticker_symbol = "STORE2.NS"
+    statement_store.upsert_statement(
+        ticker_symbol, "income", "annual", _statement({"2023-03-31": [90.0, np.nan], "2024-03-31": [100.0, 10.0]})
+    )
+    table = statement_store.read_statement(ticker_symbol, "income", "annual")
+    assert table.periods == ("2024-03-31", "2023-03-31")
+    assert table.get("Total Revenue", "2024-03-31") == 100.0
+    assert table.get("Net Income", "2023-03-31") is None
+    assert statement_store.read_statement(ticker_symbol, "income", "quarterly") is None
+
+
+def test_staleness_follows_the_last_refresh():
+    ticker_symbol = "STORE3.NS"
+    assert statement_store.is_stale(ticker_symbol, "balance", "annual", 3600)
+    statement_store.upsert_statement(ticker_symbol, "balance", "annual", _statement({"2024-03-31": [1.0, 2.0]}))
+    assert not statement_store.is_stale(ticker_symbol, "balance", "annual", 3600)
+    assert statement_store.is_stale(ticker_symbol, "balance", "annual", -1)
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.services.statement_table import StatementTable
+
+PERIODS = ["2026-03-31", "2025-03-31", "2024-03-31"]
+ITEMS = ["Total Revenue", "Net Income", "Diluted EPS"]
+
+
+def _table(values=None) -> StatementTable:
+    if values is None:
+        values = np.arange(9, dtype=float).reshape(3, 3)
+    return StatementTable("TCS.NS", "income", "annual", PERIODS, ITEMS, values)
+
+
+def test_non_finite_values_serialize_as_null():
+    table = _table(np.array([[1.0, np.inf, -np.inf], [np.nan, 2.0, 3.0], [4.0, 5.0, 6.0]]))
+    payload = json.loads(table.to_json())
+    assert payload["values"][0] == [1.0, None, None]
+    assert payload["values"][1] == [None, 2.0, 3.0]
+    assert table.to_payload()["values"] == payload["values"]
+    assert table.get("Total Revenue", "2025-03-31") is None
+
+
+def test_to_json_matches_to_payload():
+    table = _table()
+    assert json.loads(table.to_json()) == table.to_payload()
+
+
+def test_contiguous_selection_is_a_view():
+    table = _table()
+    selected = table.select(periods=PERIODS[:2])
+    assert selected.periods == tuple(PERIODS[:2])
+    assert np.shares_memory(selected.values, table.values)
+
+
+def test_scattered_selection_is_a_copy_in_requested_order():
+    table = _table()
+    selected = table.select(periods=[PERIODS[2], PERIODS[0]], line_items=["Diluted EPS", "Total Revenue", "Unknown"])
+    assert selected.line_items == ("Diluted EPS", "Total Revenue")
+    assert selected.values.tolist() == [[8.0, 6.0], [2.0, 0.0]]
+    assert not np.shares_memory(selected.values, table.values)
+
+
+def test_reindex_periods_fills_missing_columns():
+    table = _table().reindex_periods(["2027-03-31", "2026-03-31"])
+    assert table.periods == ("2027-03-31", "2026-03-31")
+    assert np.isnan(table.values[:, 0]).all()
+    assert table.values[:, 1].tolist() == [0.0, 3.0, 6.0]
+
+
+def test_from_dataframe_uses_iso_dates():
+    frame = pd.DataFrame({pd.Timestamp("2026-03-31"): [1.0, None]}, index=["Total Revenue", "Net Income"])
+    table = StatementTable.from_dataframe("TCS.NS", "income", "annual", frame)
+    assert table.periods == ("2026-03-31",)
+    assert table.to_dict() == {"2026-03-31": {"Total Revenue": 1.0, "Net Income": None}}
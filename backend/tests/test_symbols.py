@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+from app.services.symbols import symbol_master
+
+
+@pytest.mark.parametrize("text, ticker", [
+    ("RELIANCE.NS", "RELIANCE.NS"),
+    ("tcs", "TCS.NS"),
+    ("Tata Consultancy Services Ltd", "TCS.NS"),
+    ("titan", "TITAN.NS"),
+    ("tata consultancy servics", "TCS.NS"),
+    ("^NSEI", "^NSEI"),
+    ("SBIN.BO", "SBIN.BO"),
+    # Real symbols missing from the master are not fuzzily matched to a listed one.
+    ("HDFCAMC", "HDFCAMC.NS"),
+    ("ICICIGI", "ICICIGI.NS"),
+    ("ADANIPOWER", "ADANIPOWER.NS"),
+    ("TATA", "TATA.NS"),
+    # Whatever their case.
+    ("hdfcamc", "HDFCAMC.NS"),
+    ("IciciGI", "ICICIGI.NS"),
+    ("adanipower", "ADANIPOWER.NS"),
+    ("tata", "TATA.NS"),
+])
+def test_resolve(text, ticker):
+    assert symbol_master.resolve(text, strict=False) == ticker
+
+
+@pytest.mark.parametrize("text", ["HDFCAMC", "hdfcamc", "ICICIGI", "ADANIPOWER", "TATA", "UNLISTED.NS", "no such company at all"])
+def test_strict_mode_does_not_guess(text):
+    assert symbol_master.resolve(text, strict=True) is None
+
+
+def test_strict_mode_answers_404_for_unlisted_symbols(monkeypatch):
+    monkeypatch.setattr(config, "SYMBOL_STRICT_MODE", True)
+    with TestClient(app) as client:
+        assert client.get("/api/v1/company/HDFCAMC/price").status_code == 404
+        assert client.get("/api/v1/company/hdfcamc/price").status_code == 404
+
+
+def test_lower_case_path_ticker_is_not_fuzzily_matched(monkeypatch):
+    monkeypatch.setattr(config, "SYMBOL_STRICT_MODE", False)
+    with TestClient(app) as client:
+        response = client.get("/api/v1/company/hdfcamc/price")
+    assert "HDFCBANK" not in response.text
@@ -0,0 +1,117 @@
+"""
+Upstream call counts of the real routes, replayed offline: each test states
+how many yfinance or OpenAI calls a request pattern may make, so a change
+that breaks caching or request coalescing fails here.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import config
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _concurrently(method: str, url: str, count: int, json=None):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://tests") as client:
+            return await asyncio.gather(*(client.request(method, url, json=json) for _ in range(count)))
+
+    return asyncio.run(send())
+
+
+def test_warm_price_makes_no_upstream_call(client, cold_cache, upstream_calls):
+    assert client.get("/api/v1/company/RELIANCE/price").status_code == 200
+    assert upstream_calls("yfinance.info") == 1
+    for _ in range(5):
+        response = client.get("/api/v1/company/RELIANCE/price")
+        assert response.json()["data"]["symbol"] == "RELIANCE.NS"
+    assert upstream_calls("yfinance.info") == 1
+
+
+def test_concurrent_cold_prices_share_one_fetch(cold_cache, upstream_calls, monkeypatch):
+    monkeypatch.setattr(config, "REPLAY_YFINANCE_LATENCY_MS", 100.0)
+    responses = _concurrently("GET", "/api/v1/company/TCS/price", 16)
+    assert [response.status_code for response in responses] == [200] * 16
+    assert upstream_calls("yfinance.info") == 1
+
+
+def test_concurrent_cold_batches_share_one_download(cold_cache, upstream_calls, monkeypatch):
+    monkeypatch.setattr(config, "REPLAY_YFINANCE_LATENCY_MS", 100.0)
+    responses = _concurrently("POST", "/api/v1/company/prices", 16, json={"tickers": ["INFY.NS", "WIPRO.NS"]})
+    assert all(response.json()["data"]["status"] == ["ok", "ok"] for response in responses)
+    assert upstream_calls("yfinance.download") == 1
+
+
+def test_report_loads_each_upstream_once(client, cold_cache, upstream_calls):
+    report = client.get("/api/v1/company/HDFCBANK/report").json()
+    assert report["complete"]
+    assert {section["status"] for section in report["sections"].values()} == {"ok"}
+    # Price and profile share the info blob; ratios share the annual statements.
+    assert upstream_calls("yfinance.info") == 1
+    assert upstream_calls("yfinance.income_stmt") <= 1
+    assert upstream_calls("yfinance.news") == 1
+
+
+def test_stored_statements_survive_a_cache_clear(client, cold_cache, upstream_calls):
+    client.get("/api/v1/company/ICICIBANK/statements/balance")
+    cold_cache.clear()
+    response = client.get("/api/v1/company/ICICIBANK/statements/balance")
+    assert response.json()["ticker"] == "ICICIBANK.NS"
+    assert upstream_calls("yfinance.balance_sheet") == 1
+
+
+def test_fast_path_chat_makes_no_llm_call(client, upstream_calls):
+    response = client.post("/api/v1/chat/", json={"query": "price of WIPRO"})
+    assert response.json()["response"]["symbol"] == "WIPRO.NS"
+    assert upstream_calls("openai.completion") == 0
+
+
+def test_llm_decision_is_replayed_then_cached(client, upstream_calls):
+    query = "How risky is Reliance compared to the market?"
+    first = client.post("/api/v1/chat/", json={"query": query})
+    assert first.status_code == 200
+    assert first.json()["response"]["ticker"] == ["RELIANCE.NS"]
+    assert upstream_calls("openai.completion") == 1
+
+    assert client.post("/api/v1/chat/", json={"query": query}).json() == first.json()
+    assert upstream_calls("openai.completion") == 1
+
+
+def test_metrics_count_llm_upstream_calls(client):
+    client.post("/api/v1/chat/", json={"query": "Is HDFC Bank undervalued?"})
+    assert 'sirius_upstream_http_requests_total{host="api.openai.com",status="200"}' in client.get("/metrics").text
+
+
+def test_concurrent_cold_llm_decisions_share_one_call(upstream_calls, monkeypatch):
+    monkeypatch.setattr(config, "REPLAY_OPENAI_LATENCY_MS", 100.0)
+    responses = _concurrently("POST", "/api/v1/chat/", 10, json={"query": "How volatile has TCS been lately?"})
+    assert [response.status_code for response in responses] == [200] * 10
+    assert upstream_calls("openai.completion") == 1
+
+
+def _events(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_chat_stream_emits_route_result_and_done(client):
+    response = client.post("/api/v1/chat/stream", json={"query": "price of INFY"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [name for name, _ in events] == ["route", "tool_result", "done"]
+    assert events[0][1]["path"] == "fast_path"
+    assert events[0][1]["tool_calls"][0]["name"] == "get_stock_price_data"
+    assert events[1][1]["result"]["symbol"] == "INFY.NS"
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.core import config
+from app.services import ratios, valuation
+from app.services.valuation import PERCENTILES, dcf_per_share, value_company
+
+
+def _explicit_dcf(base_fcf, discount, growth, terminal_growth, years, net_debt, shares):
+    """The same two-stage DCF, year by year."""
+    present = sum(base_fcf * (1 + growth) ** t / (1 + discount) ** t for t in range(1, years + 1))
+    last = base_fcf * (1 + growth) ** years
+    terminal = last * (1 + terminal_growth) / (discount - terminal_growth) / (1 + discount) ** years
+    return max((present + terminal - net_debt) / shares, 0.0)
+
+
+@pytest.mark.parametrize("discount, growth, terminal_growth", [
+    (0.12, 0.10, 0.04), (0.10, 0.20, 0.05), (0.14, -0.05, 0.02),
+    # growth == discount: the geometric series ratio is 1.
+    (0.12, 0.12, 0.04),
+])
+def test_dcf_matches_the_explicit_sum(discount, growth, terminal_growth):
+    value = dcf_per_share(1e9, np.array([discount]), np.array([growth]), np.array([terminal_growth]), 5, 2e9, 1e7)
+    assert value[0] == pytest.approx(_explicit_dcf(1e9, discount, growth, terminal_growth, 5, 2e9, 1e7))
+
+
+def test_dcf_is_continuous_around_a_ratio_of_one():
+    growth = np.array([0.12 - 1e-7, 0.12, 0.12 + 1e-7])
+    values = dcf_per_share(1e9, np.full(3, 0.12), growth, np.full(3, 0.04), 10, 0.0, 1e7)
+    assert np.isfinite(values).all()
+    assert values == pytest.approx(values[1], rel=1e-5)
+
+
+def test_dcf_is_floored_at_zero():
+    assert dcf_per_share(1.0, np.array([0.12]), np.array([0.0]), np.array([0.04]), 5, 1e12, 1.0)[0] == 0.0
+
+
+def _inputs(price=100.0):
+    return {"base_free_cash_flow": 1e9, "historical_growth": 0.08, "net_debt": 0.0, "shares": 1e8, "current_price": price}
+
+
+def test_monte_carlo_percentiles_and_histogram():
+    result = value_company(_inputs(), scenarios=20_000)
+    monte_carlo = result["monte_carlo"]
+    percentiles = [monte_carlo["percentiles"][f"p{p}"] for p in PERCENTILES]
+    assert percentiles == sorted(percentiles)
+    assert percentiles[0] < result["fair_value"] < percentiles[-1]
+    histogram = monte_carlo["histogram"]
+    assert len(histogram["edges"]) == config.VALUATION_HISTOGRAM_BINS + 1
+    assert sum(histogram["counts"]) == 20_000
+    assert 0 <= monte_carlo["probability_undervalued"] <= 1
+    # The same seed gives the same distribution.
+    assert value_company(_inputs(), scenarios=20_000)["monte_carlo"] == monte_carlo
+
+
+def test_unpriced_company_has_no_upside():
+    result = value_company(_inputs(price=float("nan")), scenarios=1_000)
+    assert result["upside"] is None and result["monte_carlo"]["probability_undervalued"] is None
+
+
+def test_fair_value_reports_a_failed_price_lookup(monkeypatch):
+    dcf = {"ticker": "TCS.NS", "current_price": None, "monte_carlo": {"percentiles": {"p25": 90.0, "p50": 100.0, "p75": 110.0}}}
+    monkeypatch.setattr(valuation, "calculate_dcf_valuation", lambda ticker_symbol: dcf)
+
+    def unavailable(ticker_symbols):
+        raise RuntimeError("quotes unavailable")
+
+    monkeypatch.setattr(ratios, "current_prices", unavailable)
+    result = valuation.estimate_fair_value("TCS.NS")
+    assert "quotes unavailable" in result["error"]